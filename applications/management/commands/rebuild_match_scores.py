@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from applications.matching import score_applications
+from applications.models import Application
+from candidates.models import Candidate, Resume
+from candidates.terms import encode_terms
+
+BATCH_SIZE = 500
+
+class Command(BaseCommand):
+    help = 'Re-encode the hashed terms of candidates and resumes and recompute every application match score'
+    
+    def handle(self, *args, **options):
+        for model, source, target in ((Candidate, 'skills', 'skill_terms'), (Resume, 'extracted_text', 'text_terms')):
+            batch, encoded = [], 0
+            for instance in model.objects.only('pk', source).iterator(chunk_size=BATCH_SIZE):
+                setattr(instance, target, encode_terms(getattr(instance, source)))
+                batch.append(instance)
+                if len(batch) == BATCH_SIZE:
+                    model.objects.bulk_update(batch, [target])
+                    encoded += len(batch)
+                    batch = []
+            model.objects.bulk_update(batch, [target])
+            encoded += len(batch)
+            self.stdout.write(f"Encoded the terms of {encoded} {model._meta.verbose_name_plural}")
+        
+        scored = score_applications(Application.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Scored {scored} applications"))
@@ -0,0 +1,117 @@
+from itertools import groupby, islice
+from operator import itemgetter
+
+import numpy as np
+
+from candidates.terms import TERM_DTYPE, decode_terms, encode_terms
+
+MATCH_SORT = 'match'
+# Job fields the score depends on; changing them rescores the job's applications
+MATCH_JOB_FIELDS = ('title', 'requirements', 'experience_level')
+# Candidate and resume fields the score depends on
+MATCH_CANDIDATE_FIELDS = ('skill_terms', 'experience_years')
+MATCH_RESUME_FIELDS = ('text_terms',)
+# Applications scored per batch
+SCORE_BATCH = 2000
+# Share of the score from the job terms covered by the candidate's skills,
+# by their resume text and from how well their experience fits the level
+SKILLS_WEIGHT = 0.45
+RESUME_WEIGHT = 0.35
+EXPERIENCE_WEIGHT = 0.2
+# Years of experience expected per Job.experience_level (no upper bound when None)
+EXPERIENCE_YEARS = {
+    'entry': (0, 2),
+    'mid': (2, 5),
+    'senior': (5, 10),
+    'lead': (8, 15),
+    'executive': (12, None),
+}
+# Score lost per year above the expected range
+OVERQUALIFIED_DECAY = 0.1
+
+# Job terms are bucketed by the low 16 bits of their hash to prefilter applicant terms
+BUCKET_BITS = 16
+
+def pack_terms(encoded):
+    """
+    Concatenated terms of several documents, given as stored term bytes,
+    and the offset each document ends at
+    """
+    encoded = [terms or b'' for terms in encoded]
+    ends = np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)) // TERM_DTYPE.itemsize)
+    return np.frombuffer(b''.join(encoded), dtype=TERM_DTYPE), ends
+
+class MatchScorer:
+    """
+    Scores applicants against one job from the hashed terms of its
+    requirements (or title when there are none) and its experience level.
+    Applicants are scored as a batch over their concatenated stored terms:
+    a bucket table of the job's terms rules out almost every applicant term
+    in one vectorized lookup, and only the remaining ones are compared.
+    """
+    def __init__(self, job):
+        self.job_terms = decode_terms(encode_terms(job.requirements or job.title))
+        self.buckets = np.zeros(1 << BUCKET_BITS, dtype=bool)
+        self.buckets[self.job_terms & ((1 << BUCKET_BITS) - 1)] = True
+        self.min_years, self.max_years = EXPERIENCE_YEARS.get(job.experience_level, (0, None))
+
+    def coverage(self, encoded):
+        """
+        Share of the job's terms found in each document
+        """
+        terms, ends = pack_terms(encoded)
+        if not len(self.job_terms) or not len(terms):
+            return np.zeros(len(ends))
+        # The low 16 bits of each little-endian term, without a masked copy
+        candidates = np.flatnonzero(self.buckets[terms.view('<u2')[::2]])
+        positions = np.searchsorted(self.job_terms, terms[candidates]).clip(max=len(self.job_terms) - 1)
+        hits = candidates[self.job_terms[positions] == terms[candidates]]
+        documents = np.searchsorted(ends, hits, side='right')
+        return np.bincount(documents, minlength=len(ends)) / len(self.job_terms)
+
+    def experience_fit(self, years):
+        """
+        1 inside the expected range, the share reached below it, decaying above it
+        """
+        years = np.maximum(np.asarray(years, dtype=np.float64), 0)
+        fit = np.ones(len(years))
+        if self.min_years:
+            fit = np.minimum(years / self.min_years, 1)
+        if self.max_years is not None:
+            over = np.maximum(years - self.max_years, 0)
+            fit = fit / (1 + OVERQUALIFIED_DECAY * over)
+        return fit
+
+    def score(self, years, skill_terms, resume_terms):
+        """
+        Scores between 0 and 1 for applicants given as parallel sequences of
+        experience years and stored skill and resume term bytes
+        """
+        return (SKILLS_WEIGHT * self.coverage(skill_terms)
+                + RESUME_WEIGHT * self.coverage(resume_terms)
+                + EXPERIENCE_WEIGHT * self.experience_fit(years))
+
+def score_applications(queryset):
+    """
+    Recompute and store Application.match_score for an Application queryset,
+    one job at a time; returns the number of applications scored
+    """
+    from jobs.models import Job
+    from .models import Application
+
+    rows = queryset.order_by('job_id').values_list(
+        'id', 'job_id', 'candidate__experience_years', 'candidate__skill_terms', 'resume__text_terms'
+    )
+    scored = 0
+    for job_id, job_rows in groupby(rows.iterator(chunk_size=SCORE_BATCH), key=itemgetter(1)):
+        job = Job.objects.only(*MATCH_JOB_FIELDS).get(pk=job_id)
+        scorer = MatchScorer(job)
+        for batch in iter(lambda: list(islice(job_rows, SCORE_BATCH)), []):
+            ids, _, years, skill_terms, resume_terms = zip(*batch)
+            scores = scorer.score(years, skill_terms, resume_terms)
+            Application.objects.bulk_update(
+                [Application(pk=pk, match_score=float(score)) for pk, score in zip(ids, scores)],
+                ['match_score'], batch_size=500,
+            )
+            scored += len(ids)
+    return scored
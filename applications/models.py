@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from candidates.models import Candidate, Resume
 from jobs.models import Job
+from jobs.trending import APPLICATION_WEIGHT, record_trending_events
 
 class Application(models.Model):
     STATUS_CHOICES = (
@@ -14,6 +17,9 @@ class Application(models.Model):
         ('withdrawn', 'Withdrawn'),
     )
     
+    # Statuses excluded from Job.applications_count
+    UNCOUNTED_STATUSES = ('withdrawn',)
+    
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='applications')
     resume = models.ForeignKey(Resume, on_delete=models.SET_NULL, null=True, related_name='applications')
@@ -21,6 +27,9 @@ class Application(models.Model):
     cover_letter = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     employer_notes = models.TextField(blank=True)
+    # Fit against the job's requirements and level (see matching.py), kept
+    # up to date as the job, candidate and resume change
+    match_score = models.FloatField(default=0, editable=False)
     
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -33,17 +42,41 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=['status', '-applied_at']),
             models.Index(fields=['job', 'status']),
+            models.Index(fields=['job', '-match_score']),
         ]
     
     def __str__(self):
         return f"{self.candidate.full_name} - {self.job.title}"
     
     def save(self, *args, **kwargs):
+        old_status = old_job_id = None
+        created = self._state.adding
         if self.pk:  # If updating
-            old_status = Application.objects.get(pk=self.pk).status
+            old_status, old_job_id = Application.objects.values_list('status', 'job_id').get(pk=self.pk)
             if old_status != self.status and self.status != 'pending':
                 self.reviewed_at = timezone.now()
-        super().save(*args, **kwargs)
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            # Keep Job.applications_count in step with counted applications,
+            # moving the count when the application changes job
+            was_counted = old_status is not None and old_status not in self.UNCOUNTED_STATUSES
+            is_counted = self.status not in self.UNCOUNTED_STATUSES
+            moved = old_job_id is not None and old_job_id != self.job_id
+            if was_counted and (moved or not is_counted):
+                self.adjust_job_count(old_job_id, -1)
+            if is_counted and (moved or not was_counted):
+                self.adjust_job_count(self.job_id, 1)
+                record_trending_events({self.job_id: APPLICATION_WEIGHT})
+            if created or moved:
+                from .matching import score_applications
+                score_applications(Application.objects.filter(pk=self.pk))
+    
+    @staticmethod
+    def adjust_job_count(job_id, delta):
+        # Never below zero, even if the counter drifted before a decrement
+        Job.objects.filter(pk=job_id).update(applications_count=Greatest(F('applications_count') + delta, 0))
 
 class ApplicationStatusHistory(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_history')
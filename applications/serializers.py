@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import Application, ApplicationStatusHistory
-from candidates.serializers import CandidateListSerializer, ResumeSerializer
+from candidates.serializers import CandidateListSerializer, ResumeSerializer, candidate_full_name
+from jobboard.compiled_serializers import CompiledListSerializer
+from jobboard.sparse_fields import SparseFieldsMixin
 from jobs.serializers import JobListSerializer
 
 class ApplicationStatusHistorySerializer(serializers.ModelSerializer):
@@ -10,7 +12,7 @@ class ApplicationStatusHistorySerializer(serializers.ModelSerializer):
         model = ApplicationStatusHistory
         fields = '__all__'
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     candidate = CandidateListSerializer(read_only=True)
     job = JobListSerializer(read_only=True)
     resume = ResumeSerializer(read_only=True)
@@ -60,7 +62,7 @@ class ApplicationUpdateStatusSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"Invalid status. Choose from: {', '.join(valid_statuses)}")
         return value
 
-class ApplicationListSerializer(serializers.ModelSerializer):
+class ApplicationListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     candidate_name = serializers.CharField(source='candidate.full_name', read_only=True)
     candidate_email = serializers.EmailField(source='candidate.user.email', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
@@ -69,4 +71,10 @@ class ApplicationListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ('id', 'candidate_name', 'candidate_email', 'job_title', 
-                'company_name', 'status', 'applied_at', 'reviewed_at')
\ No newline at end of file
+                'company_name', 'status', 'applied_at', 'reviewed_at')
+
+class CompiledApplicationListSerializer(CompiledListSerializer):
+    serializer_class = ApplicationListSerializer
+    computed = {
+        'candidate_name': (('candidate__first_name', 'candidate__last_name'), candidate_full_name),
+    }
@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from candidates.models import Candidate, Resume
+from jobs.models import Job
+from .matching import MATCH_CANDIDATE_FIELDS, MATCH_JOB_FIELDS, MATCH_RESUME_FIELDS, score_applications
+from .models import Application
+
+@receiver(post_delete, sender=Application)
+def decrement_job_applications_count(sender, instance, **kwargs):
+    """
+    Deleted applications (including cascades from candidate removal) stop
+    counting towards Job.applications_count
+    """
+    if instance.status not in Application.UNCOUNTED_STATUSES:
+        Application.adjust_job_count(instance.job_id, -1)
+
+def touches(update_fields, fields):
+    return update_fields is None or not set(fields).isdisjoint(update_fields)
+
+@receiver(pre_save, sender=Job)
+def remember_match_fields(sender, instance, update_fields=None, **kwargs):
+    """
+    Stored values of the fields match scores depend on, compared after the save
+    """
+    instance._match_fields = None
+    if instance.pk and touches(update_fields, MATCH_JOB_FIELDS):
+        instance._match_fields = Job.objects.filter(pk=instance.pk).values_list(*MATCH_JOB_FIELDS).first()
+
+@receiver(post_save, sender=Job)
+def rescore_job_applications(sender, instance, created=False, **kwargs):
+    """
+    Rescore a job's applications in the background once a change to its
+    requirements, title or level is committed
+    """
+    stored = getattr(instance, '_match_fields', None)
+    if created or stored is None or stored == tuple(getattr(instance, field) for field in MATCH_JOB_FIELDS):
+        return
+    from .tasks import rescore_job_applications as task
+    job_id = instance.pk
+    transaction.on_commit(lambda: task.delay(job_id))
+
+@receiver(post_save, sender=Candidate)
+def rescore_candidate_applications(sender, instance, created=False, update_fields=None, **kwargs):
+    if not created and touches(update_fields, MATCH_CANDIDATE_FIELDS):
+        score_applications(Application.objects.filter(candidate=instance))
+
+@receiver(post_save, sender=Resume)
+def rescore_resume_applications(sender, instance, created=False, update_fields=None, **kwargs):
+    if not created and touches(update_fields, MATCH_RESUME_FIELDS):
+        score_applications(Application.objects.filter(resume=instance))
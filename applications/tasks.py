@@ -0,0 +1,11 @@
+from celery import shared_task
+from .matching import score_applications
+
+@shared_task
+def rescore_job_applications(job_id):
+    """
+    Recompute the match scores of a job's applications after it changed
+    """
+    from .models import Application
+
+    return score_applications(Application.objects.filter(job_id=job_id))
@@ -1,3 +1,6 @@
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -6,6 +9,7 @@ from employers.models import Employer
 from candidates.models import Candidate, Resume
 from jobs.models import Job, JobCategory
 from .models import Application
+from .tasks import rescore_job_applications
 
 User = get_user_model()
 
@@ -89,4 +93,102 @@ class ApplicationTestCase(TestCase):
         }
         
         response = self.client.post('/api/applications/apply/', data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_job_applications_count(self):
+        """Test Job.applications_count follows applies, withdrawals and deletes"""
+        self.client.post('/api/applications/apply/', {'job': self.job.id}, format='json')
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+        
+        application = Application.objects.get(job=self.job, candidate=self.candidate)
+        self.client.post(f'/api/applications/{application.id}/withdraw/')
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 0)
+        
+        application.status = 'pending'
+        application.save()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+        
+        application.delete()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 0)
+        
+        application = Application.objects.create(job=self.job, candidate=self.candidate)
+        other_job = Job.objects.create(employer=self.job.employer, title='Other Job', description='Other',
+                                       requirements='', category=self.job.category, job_type='full-time',
+                                       location='Remote', is_active=True)
+        application.job = other_job
+        application.save()
+        self.job.refresh_from_db()
+        other_job.refresh_from_db()
+        self.assertEqual((self.job.applications_count, other_job.applications_count), (0, 1))
+        # A drifted counter does not go below zero
+        Job.objects.filter(pk=other_job.pk).update(applications_count=0)
+        application.delete()
+        other_job.refresh_from_db()
+        self.assertEqual(other_job.applications_count, 0)
+        
+        Application.objects.create(job=self.job, candidate=self.candidate)
+        Job.objects.filter(pk=self.job.pk).update(applications_count=7)
+        call_command('reconcile_applications_count', stdout=StringIO())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+    
+    def test_sort_job_applications_by_match(self):
+        """Test sort=match ranks applicants by skills, resume text and experience against the job"""
+        Job.objects.filter(pk=self.job.pk).update(
+            requirements='Python, Django and PostgreSQL; Docker is a plus', experience_level='senior'
+        )
+        self.candidate.skills = 'Java, Spring'
+        self.candidate.experience_years = 1
+        self.candidate.save()
+        applicants = [Application.objects.create(job=self.job, candidate=self.candidate)]
+        for number, (skills, years, resume_text) in enumerate((
+            ('Python, Django, PostgreSQL', 6, 'Built Docker images for Django services'),
+            ('Python', 6, ''),
+        )):
+            user = User.objects.create_user(email=f'applicant{number}@test.com', username=f'applicant{number}',
+                                            password='testpass123', user_type='candidate')
+            candidate = Candidate.objects.create(user=user, first_name='Applicant', last_name=str(number),
+                                                 skills=skills, experience_years=years)
+            resume = Resume.objects.create(candidate=candidate, title='Resume', file='resumes/resume.pdf',
+                                           extracted_text=resume_text)
+            applicants.append(Application.objects.create(job=self.job, candidate=candidate, resume=resume))
+        
+        response = self.client.post('/api/auth/login/', {'email': 'employer@test.com', 'password': 'testpass123'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        response = self.client.get(f'/api/applications/job/{self.job.id}/?sort=match')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([result['id'] for result in results],
+                         [applicants[1].id, applicants[2].id, applicants[0].id])
+        self.assertGreater(results[0]['match_score'], results[1]['match_score'])
+        self.assertGreater(results[1]['match_score'], results[2]['match_score'])
+        self.assertLessEqual(results[0]['match_score'], 1)
+        
+        # Scores follow changes to the candidate, the resume text and the job
+        applicants[2].resume.extracted_text = 'Python, Django and PostgreSQL in Docker'
+        applicants[2].resume.save(update_fields=['extracted_text'])
+        candidate = applicants[2].candidate
+        candidate.skills = 'Python, Django, PostgreSQL, Docker'
+        candidate.save()
+        response = self.client.get(f'/api/applications/job/{self.job.id}/?sort=match')
+        self.assertEqual([result['id'] for result in response.data['results']],
+                         [applicants[2].id, applicants[1].id, applicants[0].id])
+        
+        self.job.refresh_from_db()
+        self.job.requirements = 'Java and Spring'
+        self.job.experience_level = 'entry'
+        with mock.patch('applications.tasks.rescore_job_applications.delay',
+                        side_effect=rescore_job_applications) as delay, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.job.save()
+        delay.assert_called_once_with(self.job.pk)
+        response = self.client.get(f'/api/applications/job/{self.job.id}/?sort=match')
+        self.assertEqual(response.data['results'][0]['id'], applicants[0].id)
+        
+        Application.objects.update(match_score=0)
+        call_command('rebuild_match_scores', stdout=StringIO())
+        self.assertEqual(Application.objects.order_by('-match_score').first(), applicants[0])
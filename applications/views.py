@@ -2,17 +2,21 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from .matching import MATCH_SORT
 from .models import Application, ApplicationStatusHistory
 from .serializers import (
     ApplicationSerializer,
     ApplicationCreateSerializer,
     ApplicationUpdateStatusSerializer,
-    ApplicationListSerializer
+    ApplicationListSerializer,
+    CompiledApplicationListSerializer
 )
 from candidates.models import Candidate
 from candidates.permissions import IsCandidateOwner
 from employers.models import Employer
 from employers.permissions import IsEmployerOwner
+from jobboard.compiled_serializers import CompiledListMixin
+from jobboard.sparse_fields import SparseQuerysetMixin
 from jobs.models import Job
 from notifications.utils import send_application_notification
 
@@ -31,7 +35,7 @@ class ApplicationCreateView(generics.CreateAPIView):
         # Send notification to employer
         send_application_notification(application, 'new')
 
-class ApplicationDetailView(generics.RetrieveAPIView):
+class ApplicationDetailView(SparseQuerysetMixin, generics.RetrieveAPIView):
     """
     Get application details
     GET /api/applications/{id}/
@@ -77,12 +81,13 @@ class ApplicationUpdateStatusView(generics.UpdateAPIView):
         # Send notification to candidate
         send_application_notification(application, 'status_update')
 
-class CandidateApplicationListView(generics.ListAPIView):
+class CandidateApplicationListView(CompiledListMixin, generics.ListAPIView):
     """
     List candidate's applications
     GET /api/applications/my-applications/
     """
     serializer_class = ApplicationListSerializer
+    compiled_serializer_class = CompiledApplicationListSerializer
     permission_classes = (permissions.IsAuthenticated, IsCandidateOwner)
     
     def get_queryset(self):
@@ -91,12 +96,13 @@ class CandidateApplicationListView(generics.ListAPIView):
             'job', 'job__employer', 'resume'
         )
 
-class EmployerApplicationListView(generics.ListAPIView):
+class EmployerApplicationListView(CompiledListMixin, generics.ListAPIView):
     """
     List applications for employer's jobs
     GET /api/applications/received/
     """
     serializer_class = ApplicationListSerializer
+    compiled_serializer_class = CompiledApplicationListSerializer
     permission_classes = (permissions.IsAuthenticated, IsEmployerOwner)
     filterset_fields = ['status', 'job']
     ordering = ['-applied_at']
@@ -107,21 +113,39 @@ class EmployerApplicationListView(generics.ListAPIView):
             'candidate', 'candidate__user', 'job', 'resume'
         )
 
-class JobApplicationsView(generics.ListAPIView):
+class JobApplicationsView(SparseQuerysetMixin, generics.ListAPIView):
     """
     List applications for a specific job (employer only)
     GET /api/applications/job/{job_id}/
+    Pass sort=match to rank candidates by their match score against the job
     """
     serializer_class = ApplicationSerializer
     permission_classes = (permissions.IsAuthenticated, IsEmployerOwner)
+    sparse_columns = ('match_score',)
     
     def get_queryset(self):
         job_id = self.kwargs['job_id']
         employer = get_object_or_404(Employer, user=self.request.user)
-        job = get_object_or_404(Job, id=job_id, employer=employer)
-        return Application.objects.filter(job=job).select_related(
+        self.job = get_object_or_404(Job, id=job_id, employer=employer)
+        return Application.objects.filter(job=self.job).select_related(
             'candidate', 'resume'
         )
+    
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('sort') != MATCH_SORT:
+            return super().list(request, *args, **kwargs)
+        
+        # Scores are stored on the applications, so the database sorts and pages them
+        queryset = self.filter_queryset(self.get_queryset()).order_by('-match_score', '-id')
+        page = self.paginate_queryset(queryset)
+        applications = page if page is not None else list(queryset)
+        
+        results = self.get_serializer(applications, many=True).data
+        for result, application in zip(results, applications):
+            result['match_score'] = round(application.match_score, 4)
+        if page is not None:
+            return self.get_paginated_response(results)
+        return Response(results)
 
 class WithdrawApplicationView(APIView):
     """
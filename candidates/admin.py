@@ -1,17 +1,17 @@
 from django.contrib import admin
-from .models import Candidate, Resume
+from .models import Candidate, Resume, ResumeBlob
 
 class ResumeInline(admin.TabularInline):
     model = Resume
     extra = 0
-    readonly_fields = ('uploaded_at', 'file_size')
+    readonly_fields = ('uploaded_at', 'file_size', 'blob', 'extraction_status')
 
 @admin.register(Candidate)
 class CandidateAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'user', 'location', 'experience_years', 'created_at')
     list_filter = ('experience_years', 'availability', 'created_at')
     search_fields = ('first_name', 'last_name', 'user__email', 'skills', 'location')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('place', 'created_at', 'updated_at')
     inlines = [ResumeInline]
     
     fieldsets = (
@@ -22,7 +22,7 @@ class CandidateAdmin(admin.ModelAdmin):
             'fields': ('bio', 'skills', 'experience_years', 'education')
         }),
         ('Location & Salary', {
-            'fields': ('location', 'expected_salary_min', 'expected_salary_max', 'availability')
+            'fields': ('location', 'place', 'expected_salary_min', 'expected_salary_max', 'availability')
         }),
         ('Social Links', {
             'fields': ('linkedin_url', 'github_url', 'portfolio_url')
@@ -35,7 +35,15 @@ class CandidateAdmin(admin.ModelAdmin):
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
-    list_display = ('title', 'candidate', 'is_primary', 'file_size', 'uploaded_at')
-    list_filter = ('is_primary', 'uploaded_at')
+    list_display = ('title', 'candidate', 'is_primary', 'file_size', 'extraction_status', 'uploaded_at')
+    list_filter = ('is_primary', 'extraction_status', 'uploaded_at')
     search_fields = ('title', 'candidate__first_name', 'candidate__last_name')
-    readonly_fields = ('uploaded_at', 'file_size')
\ No newline at end of file
+    readonly_fields = ('uploaded_at', 'file_size', 'blob', 'extraction_status', 'extraction_error', 'extracted_at')
+
+@admin.register(ResumeBlob)
+class ResumeBlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'size', 'ref_count', 'extraction_status', 'created_at')
+    list_filter = ('extraction_status',)
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'file', 'size', 'ref_count', 'extracted_text', 'extraction_status',
+                       'extracted_at', 'created_at')
\ No newline at end of file
@@ -0,0 +1,92 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import IntegrityError, transaction
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Upload handler computing the SHA-256 of each file while it streams in.
+    It passes every chunk on unchanged, so the next handlers still build
+    the uploaded file; digests maps field names to hex digests.
+    """
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digests = {}
+        self.hasher = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.digests[self.field_name] = self.hasher.hexdigest()
+        return None
+
+def install_hashing_handler(request):
+    """
+    Hash uploads of a request whose body has not been parsed yet
+    """
+    handler = HashingUploadHandler(request)
+    request.upload_handlers.insert(0, handler)
+    return handler
+
+def file_digest(upload, handler=None, field_name='file'):
+    """
+    SHA-256 of an uploaded file, from the streaming handler when it saw it
+    """
+    if handler is not None and field_name in handler.digests:
+        return handler.digests[field_name]
+    hasher = hashlib.sha256()
+    for chunk in upload.chunks():
+        hasher.update(chunk)
+    upload.seek(0)
+    return hasher.hexdigest()
+
+def acquire_blob(upload, digest):
+    """
+    (ResumeBlob holding the upload's bytes with one more reference, whether
+    it was created). Bytes already stored are not written again; the row is
+    locked while its count goes up, so a concurrent release cannot delete it.
+    """
+    from .models import ResumeBlob
+
+    while True:
+        with transaction.atomic():
+            blob = ResumeBlob.objects.select_for_update().filter(sha256=digest).first()
+            if blob is not None:
+                blob.ref_count += 1
+                blob.save(update_fields=['ref_count'])
+                return blob, False
+        blob = ResumeBlob(sha256=digest, size=upload.size, ref_count=1)
+        try:
+            with transaction.atomic():
+                blob.file.save(upload.name, upload, save=False)
+                blob.save()
+        except IntegrityError:
+            # A concurrent upload of the same bytes created the blob first
+            blob.file.delete(save=False)
+            upload.seek(0)
+            continue
+        return blob, True
+
+def release_blob(blob_id):
+    """
+    Drop one reference to a blob, deleting the row and its file once unused
+    """
+    from .models import ResumeBlob
+
+    with transaction.atomic():
+        blob = ResumeBlob.objects.select_for_update().filter(pk=blob_id).first()
+        if blob is None:
+            return
+        if blob.ref_count > 1:
+            blob.ref_count -= 1
+            blob.save(update_fields=['ref_count'])
+            return
+        blob.delete()
+    file_name, storage = blob.file.name, blob.file.storage
+    transaction.on_commit(lambda: storage.delete(file_name))
@@ -0,0 +1,226 @@
+import os
+import zipfile
+from xml.etree import ElementTree
+
+import PyPDF2
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.utils import timezone
+
+from .terms import encode_terms
+
+PDF_EXTENSIONS = ('.pdf',)
+WORD_EXTENSIONS = ('.doc', '.docx')
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+WORD_PARAGRAPH = f'{WORD_NAMESPACE}p'
+WORD_TEXT = f'{WORD_NAMESPACE}t'
+WORD_TAB = f'{WORD_NAMESPACE}tab'
+WORD_BREAKS = (f'{WORD_NAMESPACE}br', f'{WORD_NAMESPACE}cr')
+# Paragraphs of a Word document are yielded in pages of about this many characters
+WORD_PAGE_CHARS = 3000
+
+class ExtractionError(Exception):
+    pass
+
+def max_pages():
+    return getattr(settings, 'RESUME_EXTRACTION_MAX_PAGES', 20)
+
+def max_chars():
+    return getattr(settings, 'RESUME_EXTRACTION_MAX_CHARS', 100000)
+
+def iter_pdf_pages(stream, page_limit):
+    """
+    Text of each PDF page, parsing one page at a time
+    """
+    reader = PyPDF2.PdfReader(stream)
+    for number in range(min(len(reader.pages), page_limit)):
+        yield reader.pages[number].extract_text() or ''
+
+def word_paragraph_text(paragraph):
+    parts = []
+    for element in paragraph.iter():
+        if element.tag == WORD_TEXT:
+            parts.append(element.text or '')
+        elif element.tag == WORD_TAB:
+            parts.append('\t')
+        elif element.tag in WORD_BREAKS:
+            parts.append('\n')
+    return ''.join(parts)
+
+def iter_word_pages(stream, page_limit):
+    """
+    Paragraph text of a DOCX file grouped into pages of WORD_PAGE_CHARS.
+    word/document.xml is parsed incrementally and each top-level block is
+    dropped once read, so the document tree is never held in memory.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+        document = archive.open('word/document.xml')
+    except (zipfile.BadZipFile, KeyError):
+        raise ExtractionError('Not a readable DOCX file.')
+    stack, open_paragraphs = [], 0
+    page, size, pages = [], 0, 0
+    with archive, document:
+        for event, element in ElementTree.iterparse(document, events=('start', 'end')):
+            if event == 'start':
+                stack.append(element)
+                open_paragraphs += element.tag == WORD_PARAGRAPH
+                continue
+            stack.pop()
+            if element.tag == WORD_PARAGRAPH:
+                open_paragraphs -= 1
+                # Paragraphs inside text boxes are read with the paragraph holding them
+                if not open_paragraphs:
+                    text = word_paragraph_text(element) + '\n'
+                    page.append(text)
+                    size += len(text)
+            if len(stack) == 2:
+                # A top-level paragraph or table of the body has been read
+                stack[-1].clear()
+            if size >= WORD_PAGE_CHARS:
+                yield ''.join(page)
+                page, size = [], 0
+                pages += 1
+                if pages >= page_limit:
+                    return
+    if page:
+        yield ''.join(page)
+
+def iter_pages(stream, name, page_limit=None):
+    extension = os.path.splitext(name)[1].lower()
+    page_limit = max_pages() if page_limit is None else page_limit
+    if extension in PDF_EXTENSIONS:
+        return iter_pdf_pages(stream, page_limit)
+    if extension in WORD_EXTENSIONS:
+        return iter_word_pages(stream, page_limit)
+    raise ExtractionError(f"Unsupported resume format '{extension or name}'.")
+
+def extract_text(stream, name, page_limit=None, char_limit=None):
+    """
+    Text of a PDF or Word resume, read page by page until max_pages()
+    pages or max_chars() characters have been captured
+    """
+    char_limit = max_chars() if char_limit is None else char_limit
+    chunks, size = [], 0
+    for text in iter_pages(stream, name, page_limit):
+        chunks.append(text[:char_limit - size])
+        size += len(chunks[-1])
+        if size >= char_limit:
+            break
+    return ''.join(chunks)
+
+def extract_stored_file(name):
+    """
+    (text, error, hashed terms) of a file in default storage; picklable for
+    worker processes
+    """
+    from django.core.files.storage import default_storage
+    
+    try:
+        with default_storage.open(name, 'rb') as stream:
+            text = extract_text(stream, name)
+    except Exception as error:
+        return '', str(error) or error.__class__.__name__, b''
+    return text, '', encode_terms(text)
+
+def mark_failed(resume, error):
+    """
+    Fail the resume's extraction, along with the blob and any resumes
+    waiting on it; a later upload of the same bytes tries again
+    """
+    from .models import ResumeBlob
+
+    resume.extraction_status = 'failed'
+    resume.extraction_error = str(error) or error.__class__.__name__
+    resume.extracted_at = timezone.now()
+    resume.save(update_fields=['extraction_status', 'extraction_error', 'extracted_at'])
+    if resume.blob_id:
+        ResumeBlob.objects.filter(pk=resume.blob_id).update(extraction_status='failed')
+        share_outcome(resume)
+
+def share_outcome(resume):
+    """
+    Give resumes uploaded with the same bytes while this one was being
+    extracted the same outcome
+    """
+    from .models import Resume
+
+    waiting = Resume.objects.select_related('blob').filter(
+        blob_id=resume.blob_id, extraction_status='pending'
+    ).exclude(pk=resume.pk)
+    for other in waiting:
+        if resume.extraction_status == 'completed':
+            use_cached_text(other, other.blob)
+            other.save(update_fields=['extracted_text', 'extraction_status', 'extraction_error', 'extracted_at'])
+        else:
+            other.extraction_status = 'failed'
+            other.extraction_error = resume.extraction_error
+            other.extracted_at = resume.extracted_at
+            other.save(update_fields=['extraction_status', 'extraction_error', 'extracted_at'])
+
+def catch_up_with_blob(resume_id):
+    """
+    Settle a committed resume whose bytes were already being extracted for
+    another upload: copy the text if that finished in the meantime, retry if
+    it failed, and otherwise leave it to share_outcome
+    """
+    from .models import Resume
+    from .tasks import extract_resume_text
+
+    resume = Resume.objects.select_related('blob').filter(pk=resume_id, extraction_status='pending').first()
+    if resume is None or resume.blob is None:
+        return
+    if use_cached_text(resume, resume.blob):
+        resume.save(update_fields=['extracted_text', 'extraction_status', 'extraction_error', 'extracted_at'])
+    elif resume.blob.extraction_status == 'failed':
+        extract_resume_text.delay(resume.pk)
+
+def use_cached_text(resume, blob):
+    """
+    Copy the text already extracted from the resume's bytes, if any
+    """
+    if blob is None or blob.extraction_status != 'completed':
+        return False
+    resume.extracted_text = blob.extracted_text
+    resume.extraction_status = 'completed'
+    resume.extraction_error = ''
+    resume.extracted_at = blob.extracted_at
+    return True
+
+def run_extraction(resume):
+    """
+    Extract a stored resume's text, recording the outcome on the row. Text
+    is cached on the resume's blob, so identical files are parsed once.
+    """
+    from .models import ResumeBlob
+    
+    if use_cached_text(resume, resume.blob):
+        resume.save(update_fields=['extracted_text', 'extraction_status', 'extraction_error', 'extracted_at'])
+        return True
+    
+    resume.extraction_status = 'processing'
+    resume.save(update_fields=['extraction_status'])
+    if resume.blob_id:
+        # Later uploads of the same bytes wait for this extraction
+        ResumeBlob.objects.filter(pk=resume.blob_id).update(extraction_status='processing')
+    try:
+        with resume.file.open('rb') as stream:
+            text = extract_text(stream, resume.file.name)
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as error:
+        mark_failed(resume, error)
+        return False
+    
+    resume.extracted_text = text
+    resume.extraction_status = 'completed'
+    resume.extraction_error = ''
+    resume.extracted_at = timezone.now()
+    resume.save(update_fields=['extracted_text', 'extraction_status', 'extraction_error', 'extracted_at'])
+    if resume.blob_id:
+        ResumeBlob.objects.filter(pk=resume.blob_id).update(
+            extracted_text=text, extraction_status='completed', extracted_at=resume.extracted_at
+        )
+        share_outcome(resume)
+    return True
@@ -0,0 +1,124 @@
+import multiprocessing
+import random
+import resource
+import time
+from io import BytesIO
+
+import docx
+import PyPDF2
+from django.core.management.base import BaseCommand
+
+from candidates.extraction import extract_text, max_chars, max_pages
+
+WORDS = ('python', 'django', 'postgres', 'celery', 'docker', 'kubernetes', 'react', 'team', 'led',
+         'built', 'scalable', 'services', 'years', 'experience', 'api', 'design', 'testing', 'cloud')
+LINES_PER_PAGE = 45
+WORDS_PER_LINE = 12
+# Effectively unlimited, to time every page of the document
+UNBOUNDED = 10 ** 9
+
+def synthetic_lines(count, seed):
+    generator = random.Random(seed)
+    return [' '.join(generator.choice(WORDS) for _ in range(WORDS_PER_LINE)) for _ in range(count)]
+
+def synthetic_pdf(pages):
+    """
+    Minimal PDF with LINES_PER_PAGE lines of Helvetica text per page
+    """
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for number in range(pages):
+        lines = synthetic_lines(LINES_PER_PAGE, number)
+        content = b'BT /F1 10 Tf 12 TL 50 780 Td ' + b' '.join(f'({line}) Tj T*'.encode() for line in lines) + b' ET'
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        page_ids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % page_id for page_id in page_ids), pages)
+
+    output = BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = output.tell()
+    output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    output.write(b''.join(b'%010d 00000 n \n' % offset for offset in offsets))
+    output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return output.getvalue()
+
+def synthetic_docx(pages):
+    document = docx.Document()
+    for number in range(pages):
+        for line in synthetic_lines(LINES_PER_PAGE, number):
+            document.add_paragraph(line)
+        document.add_page_break()
+    output = BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+def legacy_extract(stream, name):
+    """
+    The inline extraction resume uploads used to run: every page, appended with +=
+    """
+    text = ''
+    if name.endswith('.pdf'):
+        for page in PyPDF2.PdfReader(stream).pages:
+            text += page.extract_text()
+    else:
+        for paragraph in docx.Document(stream).paragraphs:
+            text += paragraph.text + '\n'
+    return text
+
+def streaming_extract(stream, name):
+    return extract_text(stream, name, page_limit=UNBOUNDED, char_limit=UNBOUNDED)
+
+def budgeted_extract(stream, name):
+    return extract_text(stream, name)
+
+METHODS = (('legacy', legacy_extract), ('streaming', streaming_extract), ('budgeted', budgeted_extract))
+
+def measure(method, data, name, repeat):
+    """
+    Run in a fresh worker process: (best seconds, characters, growth of the peak RSS in KB)
+    """
+    function = dict(METHODS)[method]
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best, text = None, ''
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = function(BytesIO(data), name)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(text), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+class Command(BaseCommand):
+    help = 'Time resume text extraction per page and its peak memory on synthetic PDF and DOCX files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+', default=[5, 50, 200],
+                            help='Page counts of the generated documents (default 5 50 200)')
+        parser.add_argument('--formats', nargs='+', choices=('pdf', 'docx'), default=['pdf', 'docx'])
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the best is reported')
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        builders = {'pdf': synthetic_pdf, 'docx': synthetic_docx}
+        # Each case runs in its own process so the peak RSS of one does not hide the next
+        context = multiprocessing.get_context('fork')
+        self.stdout.write(f"Budget: {max_pages()} pages, {max_chars()} characters")
+
+        for file_format in options['formats']:
+            for pages in options['pages']:
+                data = builders[file_format](pages)
+                name = f'resume.{file_format}'
+                for method, _ in METHODS:
+                    with context.Pool(1, maxtasksperchild=1) as pool:
+                        seconds, characters, rss_growth = pool.apply(measure, (method, data, name, repeat))
+                    self.stdout.write(
+                        f"{file_format} {pages:>4} pages {len(data) / 1024:>8.0f} KB  {method:<9} "
+                        f"{seconds * 1000:>9.1f} ms  {seconds * 1000 / pages:>7.2f} ms/page  "
+                        f"{characters:>9} chars  peak RSS +{rss_growth / 1024:.1f} MB"
+                    )
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from applications.matching import score_applications
+from applications.models import Application
+from candidates.extraction import extract_stored_file
+from candidates.models import Resume, ResumeBlob
+
+RESULT_FIELDS = ['extracted_text', 'text_terms', 'extraction_status', 'extraction_error', 'extracted_at']
+
+def default_checkpoint():
+    return Path(settings.BASE_DIR) / 'var' / 'resume_reextract.json'
+
+def load_checkpoint(path):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+def save_checkpoint(path, state):
+    """
+    Write the checkpoint next to its final path and swap it in atomically
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.json')
+    with os.fdopen(handle, 'w') as temp_file:
+        json.dump(state, temp_file)
+    os.replace(temp_path, path)
+
+class Command(BaseCommand):
+    help = 'Re-extract the text of stored resumes in parallel, resuming from a checkpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Resumes read and written per batch')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Extraction processes (default: one per core)')
+        parser.add_argument('--checkpoint', help='Progress file (default var/resume_reextract.json)')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start from the first resume')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        checkpoint = Path(options['checkpoint'] or default_checkpoint())
+        state = None if options['restart'] else load_checkpoint(checkpoint)
+        if state is None:
+            state = {'last_id': 0, 'processed': 0, 'failed': 0}
+        elif state['last_id']:
+            self.stdout.write(f"Resuming after resume {state['last_id']} ({state['processed']} already processed)")
+
+        remaining = Resume.objects.filter(pk__gt=state['last_id']).count()
+        started, processed = time.monotonic(), 0
+        with ProcessPoolExecutor(max_workers=max(1, options['workers']), initializer=django.setup) as executor:
+            while True:
+                resumes = list(
+                    Resume.objects.filter(pk__gt=state['last_id']).order_by('pk')
+                    .only('pk', 'file', 'blob')[:chunk_size]
+                )
+                if not resumes:
+                    break
+                failed = self.process_chunk(resumes, executor)
+
+                state['last_id'] = resumes[-1].pk
+                state['processed'] += len(resumes)
+                state['failed'] += failed
+                save_checkpoint(checkpoint, state)
+
+                processed += len(resumes)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{processed}/{remaining} resumes ({state['failed']} failed), up to id {state['last_id']}, "
+                    f"{processed / elapsed if elapsed else 0:.1f} resumes/s"
+                )
+
+        # The run is complete, so the next one starts from the first resume again
+        checkpoint.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-extracted {processed} resumes in {time.monotonic() - started:.1f}s; "
+            f"{state['processed']} processed and {state['failed']} failed in total"
+        ))
+
+    def process_chunk(self, resumes, executor):
+        """
+        Extract each distinct file of the chunk once and write the results back in bulk
+        """
+        names = list(dict.fromkeys(resume.file.name for resume in resumes))
+        results = dict(zip(names, executor.map(extract_stored_file, names)))
+        extracted_at = timezone.now()
+
+        blobs, failed = {}, 0
+        for resume in resumes:
+            text, error, terms = results[resume.file.name]
+            resume.extracted_text = text
+            resume.text_terms = terms
+            resume.extraction_status = 'failed' if error else 'completed'
+            resume.extraction_error = error
+            resume.extracted_at = extracted_at
+            failed += bool(error)
+            if resume.blob_id and not error:
+                blobs[resume.blob_id] = ResumeBlob(
+                    pk=resume.blob_id, extracted_text=text, extraction_status='completed', extracted_at=extracted_at
+                )
+
+        with transaction.atomic():
+            Resume.objects.bulk_update(resumes, RESULT_FIELDS)
+            ResumeBlob.objects.bulk_update(blobs.values(), ['extracted_text', 'extraction_status', 'extracted_at'])
+            # Bulk updates skip the signal that rescores applications on new resume text
+            score_applications(Application.objects.filter(resume__in=resumes))
+        return failed
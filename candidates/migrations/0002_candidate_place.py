@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def resolve_candidate_places(apps, schema_editor):
+    from locations.gazetteer import resolve_place
+    Candidate = apps.get_model('candidates', 'Candidate')
+    PlaceName = apps.get_model('locations', 'PlaceName')
+    for location in Candidate.objects.exclude(location='').order_by().values_list('location', flat=True).distinct():
+        place = resolve_place(location, PlaceName.objects)
+        if place is not None:
+            Candidate.objects.filter(location=location).update(place=place.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_places'),
+        ('candidates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='place',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidates', to='locations.place'),
+        ),
+        migrations.RunPython(resolve_candidate_places, migrations.RunPython.noop),
+    ]
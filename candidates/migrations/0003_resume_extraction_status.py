@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:03
+
+from django.db import migrations, models
+
+
+def mark_existing_extracted(apps, schema_editor):
+    # Resumes uploaded before this migration were extracted inline
+    Resume = apps.get_model('candidates', 'Resume')
+    Resume.objects.update(extraction_status='completed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0002_candidate_place'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='extracted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extraction_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extraction_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_extracted, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0004_resume_blobs'),
+    ]
+
+    # Terms of existing rows are filled by manage.py rebuild_match_scores
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='skill_terms',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='text_terms',
+            field=models.BinaryField(default=b''),
+        ),
+    ]
@@ -1,5 +1,10 @@
+import os
+
 from django.db import models
 from django.conf import settings
+from locations.gazetteer import sync_place
+from locations.models import Place
+from .terms import encode_terms
 
 def profile_picture_path(instance, filename):
     return f'profile_pictures/{instance.user.id}/{filename}'
@@ -7,6 +12,10 @@ def profile_picture_path(instance, filename):
 def resume_path(instance, filename):
     return f'resumes/{instance.candidate.user.id}/{filename}'
 
+def resume_blob_path(instance, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f'resumes/blobs/{instance.sha256[:2]}/{instance.sha256}{extension}'
+
 class Candidate(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='candidate_profile')
     first_name = models.CharField(max_length=100)
@@ -15,7 +24,11 @@ class Candidate(models.Model):
     profile_picture = models.ImageField(upload_to=profile_picture_path, blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True)
     location = models.CharField(max_length=255, blank=True)
+    # Gazetteer place resolved from location on save
+    place = models.ForeignKey(Place, on_delete=models.SET_NULL, null=True, blank=True, related_name='candidates')
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
+    # Hashed terms of skills for match scoring, kept in step on save
+    skill_terms = models.BinaryField(default=b'', editable=False)
     experience_years = models.IntegerField(default=0)
     education = models.TextField(blank=True)
     linkedin_url = models.URLField(blank=True)
@@ -34,6 +47,22 @@ class Candidate(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'location' in field_names:
+            instance._resolved_location = instance.location
+        return instance
+    
+    def save(self, *args, **kwargs):
+        update_fields = sync_place(self, kwargs.get('update_fields'))
+        if update_fields is None or 'skills' in update_fields:
+            self.skill_terms = encode_terms(self.skills)
+            if update_fields is not None:
+                update_fields = {*update_fields, 'skill_terms'}
+        kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -42,11 +71,49 @@ class Candidate(models.Model):
     def skills_list(self):
         return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
 
+EXTRACTION_STATUS_CHOICES = (
+    ('pending', 'Pending'),
+    ('processing', 'Processing'),
+    ('completed', 'Completed'),
+    ('failed', 'Failed'),
+)
+
+class ResumeBlob(models.Model):
+    """
+    Resume file contents stored once per SHA-256, shared by every Resume
+    uploading the same bytes, with the text extracted from them
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=resume_blob_path)
+    size = models.PositiveIntegerField(default=0)
+    # Resumes pointing at this blob; the file is deleted when it drops to zero
+    ref_count = models.PositiveIntegerField(default=0)
+    extracted_text = models.TextField(blank=True)
+    extraction_status = models.CharField(max_length=20, choices=EXTRACTION_STATUS_CHOICES, default='pending')
+    extracted_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'resume_blobs'
+    
+    def __str__(self):
+        return self.sha256
+
 class Resume(models.Model):
+    EXTRACTION_STATUS_CHOICES = EXTRACTION_STATUS_CHOICES
+    
     candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='resumes')
     title = models.CharField(max_length=255)
+    # New uploads point file at their blob's stored file; older resumes have no blob
     file = models.FileField(upload_to=resume_path)
+    blob = models.ForeignKey(ResumeBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='resumes')
     extracted_text = models.TextField(blank=True)
+    # Hashed terms of extracted_text for match scoring, kept in step on save
+    text_terms = models.BinaryField(default=b'', editable=False)
+    # Text is extracted by a Celery task after upload
+    extraction_status = models.CharField(max_length=20, choices=EXTRACTION_STATUS_CHOICES, default='pending')
+    extraction_error = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
     is_primary = models.BooleanField(default=False)
     file_size = models.IntegerField(default=0)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -62,4 +129,9 @@ class Resume(models.Model):
         if self.is_primary:
             # Set all other resumes for this candidate to non-primary
             Resume.objects.filter(candidate=self.candidate, is_primary=True).update(is_primary=False)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'extracted_text' in update_fields:
+            self.text_terms = encode_terms(self.extracted_text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'text_terms'}
         super().save(*args, **kwargs)
\ No newline at end of file
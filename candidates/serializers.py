@@ -1,12 +1,15 @@
 from rest_framework import serializers
+from jobboard.compiled_serializers import CompiledListSerializer
+from jobboard.sparse_fields import SparseFieldsMixin
 from .models import Candidate, Resume
 from accounts.serializers import UserSerializer
 
 class ResumeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resume
-        fields = '__all__'
-        read_only_fields = ('candidate', 'extracted_text', 'file_size', 'uploaded_at')
+        exclude = ('text_terms',)
+        read_only_fields = ('candidate', 'blob', 'extracted_text', 'extraction_status', 'extraction_error',
+                            'extracted_at', 'file_size', 'uploaded_at')
     
     def validate_file(self, value):
         if value.size > 5 * 1024 * 1024:  # 5MB limit
@@ -19,15 +22,18 @@ class ResumeSerializer(serializers.ModelSerializer):
         
         return value
 
-class CandidateSerializer(serializers.ModelSerializer):
+class CandidateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     resumes = ResumeSerializer(many=True, read_only=True)
     skills_list = serializers.ListField(read_only=True)
+    source_columns = {
+        'skills_list': ('skills',),
+    }
     
     class Meta:
         model = Candidate
-        fields = '__all__'
-        read_only_fields = ('user', 'created_at', 'updated_at')
+        exclude = ('skill_terms',)
+        read_only_fields = ('user', 'place', 'created_at', 'updated_at')
     
     def validate_profile_picture(self, value):
         if value:
@@ -43,12 +49,24 @@ class CandidateSerializer(serializers.ModelSerializer):
 class CandidateCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Candidate
-        exclude = ('user', 'created_at', 'updated_at')
+        exclude = ('user', 'place', 'created_at', 'updated_at')
 
-class CandidateListSerializer(serializers.ModelSerializer):
+class CandidateListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     full_name = serializers.CharField(read_only=True)
+    source_columns = {
+        'full_name': ('first_name', 'last_name'),
+    }
     
     class Meta:
         model = Candidate
         fields = ('id', 'full_name', 'profile_picture', 'location', 
-                'experience_years', 'availability')
\ No newline at end of file
+                'experience_years', 'availability')
+
+def candidate_full_name(first_name, last_name):
+    return f"{first_name} {last_name}"
+
+class CompiledCandidateListSerializer(CompiledListSerializer):
+    serializer_class = CandidateListSerializer
+    computed = {
+        'full_name': (('first_name', 'last_name'), candidate_full_name),
+    }
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .blobs import release_blob
+from .models import Resume
+
+@receiver(post_delete, sender=Resume)
+def release_resume_blob(sender, instance, **kwargs):
+    """
+    Drop the deleted resume's (including cascaded deletes) reference to its stored file
+    """
+    if instance.blob_id:
+        release_blob(instance.blob_id)
@@ -0,0 +1,22 @@
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from .extraction import mark_failed, run_extraction
+
+EXTRACTION_TIME_LIMIT = getattr(settings, 'RESUME_EXTRACTION_TIME_LIMIT', 60)
+
+@shared_task(soft_time_limit=EXTRACTION_TIME_LIMIT, time_limit=EXTRACTION_TIME_LIMIT + 15)
+def extract_resume_text(resume_id):
+    """
+    Extract the text of an uploaded resume, failing it once the soft time limit is hit
+    """
+    from .models import Resume
+
+    resume = Resume.objects.select_related('blob').filter(pk=resume_id, extraction_status='pending').first()
+    if resume is None:
+        return None
+    try:
+        return run_extraction(resume)
+    except SoftTimeLimitExceeded:
+        mark_failed(resume, f'Extraction timed out after {EXTRACTION_TIME_LIMIT} seconds.')
+        return False
@@ -0,0 +1,24 @@
+import zlib
+from itertools import islice
+
+import numpy as np
+
+from jobs.search_index import tokenize
+
+# Distinct terms kept per document, in order of first appearance
+MAX_TERMS = 5000
+TERM_DTYPE = np.dtype('<u4')
+
+def term_hash(term):
+    return zlib.crc32(term.encode())
+
+def encode_terms(*texts):
+    """
+    Sorted distinct CRC32 hashes of the texts' index terms, packed as bytes
+    for storage next to the text they summarize
+    """
+    hashes = dict.fromkeys(term_hash(term) for text in texts for term in tokenize(text))
+    return np.array(sorted(islice(hashes, MAX_TERMS)), dtype=TERM_DTYPE).tobytes()
+
+def decode_terms(data):
+    return np.frombuffer(data or b'', dtype=TERM_DTYPE)
@@ -1,3 +1,191 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+import docx
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from .extraction import extract_text
+from .management.commands.benchmark_resume_extraction import (
+    LINES_PER_PAGE, synthetic_docx, synthetic_lines, synthetic_pdf
+)
+from .models import Candidate, Resume, ResumeBlob
+from .tasks import extract_resume_text
 
-# Create your tests here.
+User = get_user_model()
+
+DOCX_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+class ResumeTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(
+            email='candidate@test.com',
+            username='candidate',
+            password='testpass123',
+            user_type='candidate'
+        )
+        self.candidate = Candidate.objects.create(user=self.user, first_name='Ada', last_name='Lovelace')
+        self.client = APIClient()
+        self.docx_contents = {}
+        self.client.force_authenticate(self.user)
+
+    def docx_upload(self, text):
+        # python-docx stamps the save time, so reuse the bytes to keep duplicates identical
+        if text not in self.docx_contents:
+            document = docx.Document()
+            document.add_paragraph(text)
+            content = BytesIO()
+            document.save(content)
+            self.docx_contents[text] = content.getvalue()
+        return SimpleUploadedFile('resume.docx', self.docx_contents[text], content_type=DOCX_TYPE)
+
+    def test_resume_extraction_runs_in_background(self):
+        """Test uploads return before extraction and the task records the outcome"""
+        with mock.patch('candidates.views.extract_resume_text.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/api/candidates/resumes/upload/', {
+                    'title': 'Main resume',
+                    'file': self.docx_upload('Python and Django developer'),
+                }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['extraction_status'], 'pending')
+        self.assertEqual(response.data['extracted_text'], '')
+        delay.assert_called_once_with(response.data['id'])
+
+        self.assertTrue(extract_resume_text(response.data['id']))
+        resume = Resume.objects.get(pk=response.data['id'])
+        self.assertEqual(resume.extraction_status, 'completed')
+        self.assertIn('Python and Django developer', resume.extracted_text)
+        self.assertIsNotNone(resume.extracted_at)
+        # Only pending resumes are picked up
+        self.assertIsNone(extract_resume_text(resume.pk))
+
+        broken = Resume.objects.create(
+            candidate=self.candidate,
+            title='Broken',
+            file=SimpleUploadedFile('broken.pdf', b'not a pdf', content_type='application/pdf')
+        )
+        self.assertFalse(extract_resume_text(broken.pk))
+        broken.refresh_from_db()
+        self.assertEqual(broken.extraction_status, 'failed')
+        self.assertTrue(broken.extraction_error)
+
+    def test_duplicate_resumes_share_blob(self):
+        """Test identical uploads are stored and parsed once, and freed with the last reference"""
+        with mock.patch('candidates.views.extract_resume_text.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                first = self.client.post('/api/candidates/resumes/upload/', {
+                    'title': 'First', 'file': self.docx_upload('Same resume'),
+                }, format='multipart').data
+            extract_resume_text(first['id'])
+            with self.captureOnCommitCallbacks(execute=True):
+                second = self.client.post('/api/candidates/resumes/upload/', {
+                    'title': 'Second', 'file': self.docx_upload('Same resume'),
+                }, format='multipart').data
+        delay.assert_called_once_with(first['id'])
+        self.assertEqual(second['extraction_status'], 'completed')
+        self.assertIn('Same resume', second['extracted_text'])
+
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(first['blob'], blob.pk)
+        self.assertEqual(second['blob'], blob.pk)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'resumes', 'blobs', blob.sha256[:2])),
+                         [f'{blob.sha256}.docx'])
+
+        self.assertEqual(self.client.delete(f"/api/candidates/resumes/{first['id']}/").status_code,
+                         status.HTTP_204_NO_CONTENT)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/candidates/resumes/{second['id']}/")
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertFalse(os.path.exists(blob.file.path))
+
+    def test_duplicate_upload_waits_for_extraction(self):
+        """Test an upload of bytes still being extracted is not queued again and gets the same outcome"""
+        def upload(title, file):
+            with self.captureOnCommitCallbacks(execute=True):
+                return self.client.post('/api/candidates/resumes/upload/', {'title': title, 'file': file},
+                                        format='multipart').data
+
+        with mock.patch('candidates.views.extract_resume_text.delay') as delay:
+            first = upload('First', self.docx_upload('Queued resume'))
+            second = upload('Second', self.docx_upload('Queued resume'))
+            delay.assert_called_once_with(first['id'])
+            self.assertTrue(extract_resume_text(first['id']))
+            self.assertEqual(Resume.objects.get(pk=second['id']).extraction_status, 'completed')
+            self.assertIn('Queued resume', Resume.objects.get(pk=second['id']).extracted_text)
+
+            broken = SimpleUploadedFile('broken.pdf', b'not a pdf', content_type='application/pdf')
+            third = upload('Third', broken)
+            broken.seek(0)
+            fourth = upload('Fourth', broken)
+            self.assertFalse(extract_resume_text(third['id']))
+            self.assertEqual(Resume.objects.get(pk=fourth['id']).extraction_status, 'failed')
+            # A failed blob is extracted again for the next upload
+            fifth = upload('Fifth', SimpleUploadedFile('broken.pdf', b'not a pdf', content_type='application/pdf'))
+        self.assertEqual(delay.call_count, 3)
+        delay.assert_called_with(fifth['id'])
+
+    def test_extraction_budget(self):
+        """Test extraction stops at the page and character budgets"""
+        pdf = synthetic_pdf(6)
+        full_text = extract_text(BytesIO(pdf), 'resume.pdf')
+        two_pages = extract_text(BytesIO(pdf), 'resume.pdf', page_limit=2)
+        self.assertTrue(full_text.startswith(two_pages))
+        self.assertLess(len(two_pages), len(full_text))
+        self.assertEqual(extract_text(BytesIO(pdf), 'resume.pdf', char_limit=500), full_text[:500])
+
+        text = extract_text(BytesIO(synthetic_docx(3)), 'resume.docx')
+        expected = [line for number in range(3) for line in synthetic_lines(LINES_PER_PAGE, number)]
+        self.assertEqual([line for line in text.splitlines() if line.strip()], expected)
+
+        out = StringIO()
+        call_command('benchmark_resume_extraction', pages=[2], repeat=1, stdout=out)
+        self.assertEqual(out.getvalue().count('ms/page'), 6)
+
+    def test_reextract_resumes_command(self):
+        """Test the backfill re-extracts every resume in chunks and resumes from its checkpoint"""
+        resumes = [
+            Resume.objects.create(
+                candidate=self.candidate,
+                title=f'Resume {number}',
+                file=self.docx_upload(f'Resume number {number}'),
+                extraction_status='failed'
+            )
+            for number in range(3)
+        ]
+        checkpoint = os.path.join(self.media_root, 'checkpoint.json')
+
+        out = StringIO()
+        call_command('reextract_resumes', chunk_size=2, workers=1, checkpoint=checkpoint, stdout=out)
+        self.assertIn('Re-extracted 3 resumes', out.getvalue())
+        for number, resume in enumerate(resumes):
+            resume.refresh_from_db()
+            self.assertEqual(resume.extraction_status, 'completed')
+            self.assertIn(f'Resume number {number}', resume.extracted_text)
+        # A finished run removes its checkpoint
+        self.assertFalse(os.path.exists(checkpoint))
+
+        # An interrupted run picks up after the last completed chunk
+        with open(checkpoint, 'w') as handle:
+            json.dump({'last_id': resumes[0].pk, 'processed': 1, 'failed': 0}, handle)
+        out = StringIO()
+        call_command('reextract_resumes', workers=1, checkpoint=checkpoint, stdout=out)
+        self.assertIn(f'Resuming after resume {resumes[0].pk}', out.getvalue())
+        self.assertIn('Re-extracted 2 resumes', out.getvalue())
+        self.assertIn('3 processed and 0 failed in total', out.getvalue())
+        self.assertFalse(os.path.exists(checkpoint))
@@ -2,31 +2,37 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from .models import Candidate, Resume
 from .serializers import (
     CandidateSerializer, 
     CandidateListSerializer, 
-    ResumeSerializer
+    ResumeSerializer,
+    CompiledCandidateListSerializer
 )
+from .blobs import acquire_blob, file_digest, install_hashing_handler, release_blob
+from .extraction import catch_up_with_blob
 from .permissions import IsCandidateOwner
+from .tasks import extract_resume_text
 from applications.models import Application
-from applications.serializers import ApplicationListSerializer
-import PyPDF2
-import docx
+from applications.serializers import ApplicationListSerializer, CompiledApplicationListSerializer
+from jobboard.compiled_serializers import CompiledListMixin
+from jobboard.sparse_fields import SparseQuerysetMixin
 
-class CandidateListView(generics.ListAPIView):
+class CandidateListView(CompiledListMixin, generics.ListAPIView):
     """
     List all candidates
     GET /api/candidates/
     """
     queryset = Candidate.objects.all()
     serializer_class = CandidateListSerializer
+    compiled_serializer_class = CompiledCandidateListSerializer
     permission_classes = (permissions.AllowAny,)
     search_fields = ['first_name', 'last_name', 'skills', 'location']
     filterset_fields = ['experience_years', 'availability']
 
-class CandidateDetailView(generics.RetrieveAPIView):
+class CandidateDetailView(SparseQuerysetMixin, generics.RetrieveAPIView):
     """
     Get candidate details
     GET /api/candidates/{id}/
@@ -47,7 +53,43 @@ class CandidateProfileView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return get_object_or_404(Candidate, user=self.request.user)
 
-class ResumeUploadView(generics.CreateAPIView):
+class HashedUploadMixin:
+    """
+    Hash the uploaded resume while it streams in and store it as a shared blob
+    """
+    def initialize_request(self, request, *args, **kwargs):
+        self.hashing_handler = install_hashing_handler(request)
+        return super().initialize_request(request, *args, **kwargs)
+    
+    def save_resume(self, serializer, **kwargs):
+        """
+        Save with the file stored once per content; text already extracted
+        from the same bytes is reused instead of queueing extraction
+        """
+        upload = serializer.validated_data['file']
+        blob, created = acquire_blob(upload, file_digest(upload, self.hashing_handler))
+        fields = {
+            'blob': blob,
+            'file': blob.file.name,
+            'file_size': blob.size,
+            'extracted_text': '',
+            'extraction_status': 'pending',
+            'extraction_error': '',
+            'extracted_at': None,
+        }
+        if blob.extraction_status == 'completed':
+            fields.update(extracted_text=blob.extracted_text, extraction_status='completed',
+                          extracted_at=blob.extracted_at)
+        resume = serializer.save(**fields, **kwargs)
+        if resume.extraction_status == 'pending':
+            if created or blob.extraction_status == 'failed':
+                transaction.on_commit(lambda: extract_resume_text.delay(resume.pk))
+            else:
+                # The same bytes are already queued or being extracted for another upload
+                transaction.on_commit(lambda: catch_up_with_blob(resume.pk))
+        return resume
+
+class ResumeUploadView(HashedUploadMixin, generics.CreateAPIView):
     """
     Upload a new resume
     POST /api/candidates/resumes/upload/
@@ -58,35 +100,9 @@ class ResumeUploadView(generics.CreateAPIView):
     
     def perform_create(self, serializer):
         candidate = get_object_or_404(Candidate, user=self.request.user)
-        resume_file = self.request.FILES.get('file')
         
-        # Extract text from resume
-        extracted_text = self.extract_text_from_file(resume_file)
-        
-        serializer.save(
-            candidate=candidate,
-            file_size=resume_file.size,
-            extracted_text=extracted_text
-        )
-    
-    def extract_text_from_file(self, file):
-        """Extract text from PDF or DOCX file"""
-        text = ""
-        try:
-            if file.content_type == 'application/pdf':
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-            
-            elif file.content_type in ['application/msword', 
-                                       'application/vnd.openxmlformats-officedocument.wordprocessingml.document']:
-                doc = docx.Document(file)
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
-        except Exception as e:
-            print(f"Error extracting text: {str(e)}")
-        
-        return text
+        # Text is extracted in the background; extraction_status tracks it
+        self.save_resume(serializer, candidate=candidate)
 
 class ResumeListView(generics.ListAPIView):
     """
@@ -100,7 +116,7 @@ class ResumeListView(generics.ListAPIView):
         candidate = get_object_or_404(Candidate, user=self.request.user)
         return Resume.objects.filter(candidate=candidate)
 
-class ResumeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ResumeDetailView(HashedUploadMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Get, update, or delete a resume
     GET/PUT/DELETE /api/candidates/resumes/{id}/
@@ -111,13 +127,23 @@ class ResumeDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         candidate = get_object_or_404(Candidate, user=self.request.user)
         return Resume.objects.filter(candidate=candidate)
+    
+    def perform_update(self, serializer):
+        if 'file' not in serializer.validated_data:
+            serializer.save()
+            return
+        old_blob_id = serializer.instance.blob_id
+        self.save_resume(serializer)
+        if old_blob_id:
+            release_blob(old_blob_id)
 
-class CandidateApplicationsView(generics.ListAPIView):
+class CandidateApplicationsView(CompiledListMixin, generics.ListAPIView):
     """
     List candidate's applications
     GET /api/candidates/applications/
     """
     serializer_class = ApplicationListSerializer
+    compiled_serializer_class = CompiledApplicationListSerializer
     permission_classes = (permissions.IsAuthenticated, IsCandidateOwner)
     
     def get_queryset(self):
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Count, Q
 from django.conf import settings
 from django.core.validators import URLValidator
 
@@ -20,6 +21,9 @@ class Employer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # (total, active) set by attach_job_counts so the properties skip their COUNT queries
+    _job_counts = None
+    
     class Meta:
         db_table = 'employers'
         ordering = ['-created_at']
@@ -29,8 +33,29 @@ class Employer(models.Model):
     
     @property
     def total_jobs(self):
+        if self._job_counts is not None:
+            return self._job_counts[0]
         return self.jobs.count()
     
     @property
     def active_jobs(self):
-        return self.jobs.filter(is_active=True).count()
\ No newline at end of file
+        if self._job_counts is not None:
+            return self._job_counts[1]
+        return self.jobs.filter(is_active=True).count()
+    
+    @staticmethod
+    def attach_job_counts(employers):
+        """
+        Load total_jobs and active_jobs of several employers with one grouped query
+        """
+        from jobs.models import Job
+        
+        employers = list(employers)
+        counts = {
+            row['employer']: (row['total'], row['active'])
+            for row in Job.objects.filter(employer__in={employer.pk for employer in employers})
+            .order_by().values('employer')
+            .annotate(total=Count('id'), active=Count('id', filter=Q(is_active=True)))
+        }
+        for employer in employers:
+            employer._job_counts = counts.get(employer.pk, (0, 0))
\ No newline at end of file
@@ -1,4 +1,6 @@
+from django.db.models import Count, Q
 from rest_framework import serializers
+from jobboard.compiled_serializers import CompiledListSerializer
 from .models import Employer
 from accounts.serializers import UserSerializer
 
@@ -35,4 +37,12 @@ class EmployerListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employer
         fields = ('id', 'company_name', 'logo', 'location', 'industry', 
-            'total_jobs', 'active_jobs', 'is_verified')
\ No newline at end of file
+            'total_jobs', 'active_jobs', 'is_verified')
+
+class CompiledEmployerListSerializer(CompiledListSerializer):
+    serializer_class = EmployerListSerializer
+    # Aggregated in the list query instead of two COUNT queries per employer
+    annotations = {
+        'total_jobs': Count('jobs'),
+        'active_jobs': Count('jobs', filter=Q(jobs__is_active=True)),
+    }
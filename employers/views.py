@@ -3,19 +3,20 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from .models import Employer
-from .serializers import EmployerSerializer, EmployerListSerializer
+from .serializers import EmployerSerializer, EmployerListSerializer, CompiledEmployerListSerializer
 from .permissions import IsEmployerOwner
 from jobs.models import Job
-from django.db.models import Count
-from jobs.serializers import JobListSerializer
+from jobs.serializers import JobListSerializer, CompiledJobListSerializer
+from jobboard.compiled_serializers import CompiledListMixin
 
-class EmployerListView(generics.ListAPIView):
+class EmployerListView(CompiledListMixin, generics.ListAPIView):
     """
     List all employers
     GET /api/employers/
     """
     queryset = Employer.objects.all()
     serializer_class = EmployerListSerializer
+    compiled_serializer_class = CompiledEmployerListSerializer
     permission_classes = (permissions.AllowAny,)
     filterset_fields = ['industry', 'company_size', 'is_verified']
     search_fields = ['company_name', 'description', 'location']
@@ -40,20 +41,18 @@ class EmployerProfileView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return get_object_or_404(Employer, user=self.request.user)
 
-class EmployerJobsView(generics.ListAPIView):
+class EmployerJobsView(CompiledListMixin, generics.ListAPIView):
     """
     List jobs posted by the employer
     GET /api/employers/my-jobs/
     """
     serializer_class = JobListSerializer
+    compiled_serializer_class = CompiledJobListSerializer
     permission_classes = (permissions.IsAuthenticated, IsEmployerOwner)
     
     def get_queryset(self):
         employer = get_object_or_404(Employer, user=self.request.user)
-        return Job.objects.filter(employer=employer).annotate(
-            applications_count=Count('applications')  # Add annotation
-
-        )
+        return Job.objects.filter(employer=employer).select_related('category')
 class EmployerStatsView(APIView):
     """
     Get employer statistics
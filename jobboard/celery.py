@@ -14,6 +14,31 @@ app.conf.beat_schedule = {
         'task': 'notifications.tasks.cleanup_old_notifications',
         'schedule': crontab(hour=2, minute=0),  # Run daily at 2 AM
     },
+    'flush-job-views': {
+        'task': 'jobs.tasks.flush_job_views',
+        'schedule': 60.0,  # Run every minute
+    },
+    'rebuild-job-facets': {
+        'task': 'jobs.tasks.rebuild_job_facets',
+        'schedule': crontab(minute=30),  # Run hourly
+    },
+    'expire-jobs': {
+        'task': 'jobs.tasks.expire_jobs',
+        'schedule': crontab(minute=5),  # Run hourly
+    },
+    'update-job-similarity': {
+        'task': 'jobs.tasks.rebuild_job_similarity',
+        'schedule': 300.0,  # Run every 5 minutes
+    },
+    'rebuild-job-similarity': {
+        'task': 'jobs.tasks.rebuild_job_similarity',
+        'schedule': crontab(hour=3, minute=15),  # Full rebuild daily, pruning unused terms
+        'kwargs': {'full': True},
+    },
+    'rebase-trending-jobs': {
+        'task': 'jobs.tasks.rebase_trending_jobs',
+        'schedule': crontab(minute=45),  # Run hourly
+    },
 }
 
 @app.task(bind=True)
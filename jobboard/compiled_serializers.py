@@ -0,0 +1,152 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from rest_framework.response import Response
+
+from .sparse_fields import context_selection, select_names
+
+# How a compiled field turns its columns into output
+VALUE, FILE, COMPUTED = 'value', 'file', 'computed'
+
+class CompiledListSerializer:
+    """
+    Read-only fast path for a list ModelSerializer. The serializer's fields
+    are inspected once and turned into .values_list() columns plus one
+    converter each, so rows are built from tuples by column index instead
+    of walking model instances and dotted sources. Output matches
+    serializer_class key for key, including fields DRF omits when a
+    nullable relation on their source path is empty.
+
+    Fields whose source is not a model column are declared in annotations
+    (name -> ORM expression) or computed (name -> (lookups, function)).
+    A ?fields= / ?exclude= selection compiles a narrower plan that selects
+    only the columns its fields read.
+    """
+    serializer_class = None
+    annotations = {}
+    computed = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        selection = context_selection(self.context)
+        self.names = None
+        if selection[0] is not None or selection[1]:
+            self.names = tuple(select_names([step[0] for step in self.plan()[1]], selection))
+
+    @classmethod
+    def plan(cls, names=None):
+        """
+        (columns, steps) for the given field names (all when None), compiled once per selection
+        """
+        if '_plans' not in cls.__dict__:
+            cls._plans = {}
+        if names not in cls._plans:
+            cls._plans[names] = cls.compile(names)
+        return cls._plans[names]
+
+    @classmethod
+    def compile(cls, names=None):
+        serializer = cls.serializer_class()
+        model = serializer.Meta.model
+        columns = ['pk']
+
+        def column(lookup):
+            if lookup not in columns:
+                columns.append(lookup)
+            return columns.index(lookup)
+
+        steps = []
+        for name, field in serializer.fields.items():
+            if field.write_only or (names is not None and name not in names):
+                continue
+            if name in cls.computed:
+                lookups, function = cls.computed[name]
+                steps.append((name, COMPUTED, (), tuple(column(lookup) for lookup in lookups), function))
+            elif name in cls.annotations:
+                steps.append((name, VALUE, (), column(name), field.to_representation))
+            else:
+                guards, model_field = cls.resolve(model, field.source_attrs, name)
+                guards = tuple(column(lookup) for lookup in guards)
+                if isinstance(model_field, models.FileField):
+                    steps.append((name, FILE, guards, column('__'.join(field.source_attrs)), model_field.storage))
+                elif model_field.is_relation:
+                    # Related fields render the primary key values_list already returns
+                    steps.append((name, VALUE, guards, column('__'.join(field.source_attrs)), None))
+                else:
+                    steps.append((name, VALUE, guards, column('__'.join(field.source_attrs)), field.to_representation))
+        return tuple(columns), steps
+
+    @staticmethod
+    def resolve(model, attrs, name):
+        """
+        Model field at the end of a source path, and the lookups of the
+        nullable relations crossed on the way
+        """
+        guards = []
+        for position, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f"'{name}' is not sourced from a model field; declare it in annotations or computed."
+                )
+            if position < len(attrs) - 1:
+                if model_field.null:
+                    guards.append('__'.join(attrs[:position + 1]))
+                model = model_field.related_model
+        return guards, model_field
+
+    def queryset(self, queryset, extra=()):
+        """
+        Rows for serialize(): named tuples of the compiled columns, plus any
+        extra columns a paginator needs
+        """
+        columns, _ = self.plan(self.names)
+        annotations = {name: expression for name, expression in self.annotations.items() if name in columns}
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        extra = [lookup for lookup in extra if lookup not in columns]
+        return queryset.values_list(*columns, *extra, named=True)
+
+    def serialize(self, rows):
+        _, steps = self.plan(self.names)
+        request = self.context.get('request')
+        results = []
+        for row in rows:
+            data = {}
+            for name, kind, guards, source, convert in steps:
+                if guards and any(row[guard] is None for guard in guards):
+                    # DRF skips read-only fields whose source crosses an empty relation
+                    continue
+                if kind == COMPUTED:
+                    data[name] = convert(*[row[index] for index in source])
+                    continue
+                value = row[source]
+                if kind == FILE:
+                    if not value:
+                        data[name] = None
+                        continue
+                    url = convert.url(value)
+                    data[name] = request.build_absolute_uri(url) if request is not None else url
+                elif value is None or convert is None:
+                    data[name] = value
+                else:
+                    data[name] = convert(value)
+            results.append(data)
+        return results
+
+class CompiledListMixin:
+    """
+    ListAPIView mixin that renders the list with compiled_serializer_class
+    """
+    compiled_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.compiled_serializer_class(context=self.get_serializer_context())
+        queryset = self.filter_queryset(self.get_queryset())
+        key_columns = getattr(self.paginator, 'key_columns', None)
+        rows = compiled.queryset(queryset, extra=key_columns(queryset) if key_columns else ())
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page))
+        return Response(compiled.serialize(rows))
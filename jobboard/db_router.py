@@ -0,0 +1,123 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Signed cookie naming the client that wrote, so any worker can honour it
+STICKY_COOKIE = 'db_primary'
+STICKY_SALT = 'jobboard.db_router.sticky'
+# Marker for writes without a known client (registration, login), honoured
+# whoever the client turns out to be on its next requests
+ANONYMOUS_WRITER = 'anonymous'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Replica alias reads may use in the current request or block, None for the primary
+_read_alias = ContextVar('read_alias', default=None)
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+@contextmanager
+def replica_reads(alias=None):
+    """
+    Send reads inside the block to a replica (one picked at random by
+    default). Without replicas configured this is a no-op.
+    """
+    replicas = replica_aliases()
+    token = _read_alias.set(alias or (random.choice(replicas) if replicas else None))
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+class ReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to the replica chosen for the
+    current request, or the primary when none was chosen or a transaction
+    is open on the primary (so a block never reads its own writes stale).
+    """
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data, so objects read anywhere may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary through replication
+        return db == DEFAULT_DB_ALIAS
+
+def client_key(request):
+    """
+    Who a request is from, for sticky reads: the user id of a valid JWT
+    access token, else the session's user id. Computed without querying
+    the database.
+    """
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+    from rest_framework_simplejwt.settings import api_settings
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            token = authentication.get_validated_token(raw_token)
+            return f"user:{token[api_settings.USER_ID_CLAIM]}"
+        except (InvalidToken, TokenError, KeyError):
+            return None
+    session = getattr(request, 'session', None)
+    if session is not None and session.get('_auth_user_id'):
+        return f"user:{session['_auth_user_id']}"
+    return None
+
+def sticky_seconds():
+    return getattr(settings, 'DATABASE_STICKY_SECONDS', 15)
+
+def reads_primary(request, key):
+    """
+    Whether the request carries a sticky cookie, still fresh, set for this
+    client or by an anonymous write
+    """
+    marker = request.get_signed_cookie(STICKY_COOKIE, default=None, salt=STICKY_SALT, max_age=sticky_seconds())
+    return marker is not None and marker in (key, ANONYMOUS_WRITER)
+
+class ReplicaReadMiddleware:
+    """
+    Route reads of safe requests to a read replica. A client that has just
+    written keeps reading from the primary for DATABASE_STICKY_SECONDS so it
+    sees its own changes; paths in DATABASE_REPLICA_ALWAYS_PATHS (reports)
+    tolerate lag and use a replica regardless. The marker travels in a
+    signed cookie rather than the cache, so it holds whichever process
+    serves the next request.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+
+        key = client_key(request)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if response.status_code < 400:
+                response.set_signed_cookie(
+                    STICKY_COOKIE, key or ANONYMOUS_WRITER, salt=STICKY_SALT, max_age=sticky_seconds(),
+                    httponly=True, samesite='Lax', secure=request.is_secure(),
+                )
+            return response
+
+        always = request.path.startswith(tuple(getattr(settings, 'DATABASE_REPLICA_ALWAYS_PATHS', ())))
+        if not always and reads_primary(request, key):
+            return self.get_response(request)
+        with replica_reads():
+            return self.get_response(request)
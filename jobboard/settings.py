@@ -1,7 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     
     # Local apps
     'accounts',
+    'locations',
     'employers',
     'candidates',
     'jobs',
@@ -49,6 +50,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'jobboard.db_router.ReplicaReadMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -92,6 +94,26 @@ DATABASES = {
     }
 }
 
+# Read replicas for safe (GET/HEAD/OPTIONS) requests: comma-separated database
+# files for SQLite (e.g. DB_REPLICAS=replica.sqlite3 locally) or hosts otherwise.
+# Replicas are never migrated: a SQLite replica is a copy of the primary made
+# after each migrate, e.g. sqlite3 db.sqlite3 ".backup replica.sqlite3"
+DATABASE_REPLICAS = []
+for number, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    alias = 'replica' if number == 1 else f'replica{number}'
+    location = 'NAME' if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3' else 'HOST'
+    DATABASES[alias] = {**DATABASES['default'], location: replica, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+# Without replicas, 'replica' is the primary under another name, read only when
+# listed in DATABASE_REPLICAS (as the routing tests do)
+DATABASES.setdefault('replica', {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}})
+
+DATABASE_ROUTERS = ['jobboard.db_router.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write (kept in a signed cookie)
+DATABASE_STICKY_SECONDS = config('DATABASE_STICKY_SECONDS', default=15, cast=int)
+# Read-only paths that tolerate replica lag even right after a write
+DATABASE_REPLICA_ALWAYS_PATHS = ['/api/reports/']
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -181,10 +203,73 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Cache (use a shared backend such as Redis in production so buffered
+# counters and cached searches are visible to every process)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# Buffer job views in the cache and flush them from Celery beat instead of
+# writing on every request. Needs the Redis cache backend, whose INCR and sets
+# keep the buffer atomic across processes, and is on by default with it.
+JOB_VIEWS_WRITE_BEHIND = config(
+    'JOB_VIEWS_WRITE_BEHIND',
+    default=CACHES['default']['BACKEND'] == 'django.core.cache.backends.redis.RedisCache',
+    cast=bool,
+)
+
+# Job search result cache: seconds an entry stays fresh, plus the grace period
+# during which a stale entry is served while one request refreshes it (0 disables).
+# Requires a shared cache backend, since invalidations must reach every process.
+JOB_SEARCH_CACHE_TIMEOUT = config('JOB_SEARCH_CACHE_TIMEOUT', default=0, cast=int)
+JOB_SEARCH_CACHE_GRACE = config('JOB_SEARCH_CACHE_GRACE', default=60, cast=int)
+
+# Stored TF-IDF matrix behind /api/jobs/<slug>/similar/, saved in the default
+# file storage, which the web processes and the Celery worker must share
+JOB_SIMILARITY_INDEX_NAME = config('JOB_SIMILARITY_INDEX_NAME', default='indexes/job_similarity.npz')
+
+# Seconds between checks for a newer stored similarity matrix
+JOB_SIMILARITY_RELOAD_INTERVAL = config('JOB_SIMILARITY_RELOAD_INTERVAL', default=60, cast=int)
+
+# Half-life of a view or application in the /api/jobs/trending/ leaderboard
+JOB_TRENDING_HALF_LIFE_HOURS = config('JOB_TRENDING_HALF_LIFE_HOURS', default=24, cast=float)
+
+# Bulk job imports larger than this (in bytes) are processed by Celery
+JOB_IMPORT_SYNC_MAX_BYTES = config('JOB_IMPORT_SYNC_MAX_BYTES', default=1024 * 1024, cast=int)
+
+# Currency salary filters and sorts compare in, via the ExchangeRate table
+BASE_SALARY_CURRENCY = config('BASE_SALARY_CURRENCY', default='USD')
+
+# Seconds between full background rebuilds of each process's autocomplete index
+JOB_AUTOCOMPLETE_REBUILD_INTERVAL = config('JOB_AUTOCOMPLETE_REBUILD_INTERVAL', default=600, cast=int)
+# Seconds between background refreshes picking up deletions and view or
+# application counts from other processes, even when no job was saved
+JOB_AUTOCOMPLETE_REFRESH_INTERVAL = config('JOB_AUTOCOMPLETE_REFRESH_INTERVAL', default=60, cast=int)
+
+# Job search backend: 'auto' (native full-text for the database), 'inverted',
+# 'sqlite_fts5', 'postgres' or a dotted path to a BaseSearchBackend subclass
+JOB_SEARCH_BACKEND = config('JOB_SEARCH_BACKEND', default='auto')
+JOB_SEARCH_PG_CONFIG = config('JOB_SEARCH_PG_CONFIG', default='english')
+
+# Relevance sort (order_by/sort_by=relevance): the BM25 text score is
+# multiplied by (1 + featured boost) for featured jobs and by a recency
+# boost that halves every JOB_SEARCH_RECENCY_HALF_LIFE_DAYS
+JOB_SEARCH_FEATURED_BOOST = config('JOB_SEARCH_FEATURED_BOOST', default=0.5, cast=float)
+JOB_SEARCH_RECENCY_BOOST = config('JOB_SEARCH_RECENCY_BOOST', default=0.5, cast=float)
+JOB_SEARCH_RECENCY_HALF_LIFE_DAYS = config('JOB_SEARCH_RECENCY_HALF_LIFE_DAYS', default=14, cast=float)
+
 # File Upload Settings
 MAX_UPLOAD_SIZE = 5242880  # 5MB
 ALLOWED_RESUME_TYPES = ['application/pdf', 'application/msword', 
                         'application/vnd.openxmlformats-officedocument.wordprocessingml.document']
 ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/jpg']
 
+# Resume text extraction (Celery): pages and characters read at most, and the task's soft time limit in seconds
+RESUME_EXTRACTION_MAX_PAGES = config('RESUME_EXTRACTION_MAX_PAGES', default=20, cast=int)
+RESUME_EXTRACTION_MAX_CHARS = config('RESUME_EXTRACTION_MAX_CHARS', default=100000, cast=int)
+RESUME_EXTRACTION_TIME_LIMIT = config('RESUME_EXTRACTION_TIME_LIMIT', default=60, cast=int)
+
 AUTH_USER_MODEL = 'accounts.User'
\ No newline at end of file
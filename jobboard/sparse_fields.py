@@ -0,0 +1,108 @@
+from django.core.exceptions import FieldDoesNotExist
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+# Context key carrying a (fields, exclude) selection for serializers rendered without a request
+SELECTION_CONTEXT = 'sparse_fields'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+def parse_names(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+def requested_fields(request):
+    """
+    (fields, exclude) from ?fields=a,b&exclude=c on a read request; fields
+    is None when every field is wanted
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+    params = getattr(request, 'query_params', request.GET)
+    fields = parse_names(params.get(FIELDS_PARAM))
+    return (set(fields) if fields else None), set(parse_names(params.get(EXCLUDE_PARAM)))
+
+def sparse_context(request):
+    """
+    Serializer context applying the request's field selection, for views
+    that render without passing the request itself
+    """
+    return {SELECTION_CONTEXT: requested_fields(request)}
+
+def select_names(names, selection):
+    fields, exclude = selection
+    return [name for name in names if (fields is None or name in fields) and name not in exclude]
+
+def context_selection(context):
+    return context.get(SELECTION_CONTEXT) or requested_fields(context.get('request'))
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin dropping the fields a read request left out with
+    ?fields= or ?exclude=. Unknown names are ignored. Fields not backed by
+    a model column list the columns they read in source_columns so the
+    view can defer everything else.
+    """
+    source_columns = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selection = context_selection(self.context)
+        if selection[0] is not None or selection[1]:
+            keep = set(select_names(self.fields.keys(), selection))
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+    def model_columns(self):
+        """
+        Names of the model fields rendering needs, or None when unknown
+        """
+        model = self.Meta.model
+        columns = set()
+        for name, field in self.fields.items():
+            if name in self.source_columns:
+                columns.update(self.source_columns[name])
+                continue
+            if field.source == '*':
+                return None
+            try:
+                columns.add(model._meta.get_field(field.source_attrs[0]).name)
+            except FieldDoesNotExist:
+                return None
+        return columns
+
+def sparse_queryset(queryset, serializer_class, request=None, context=None, always=()):
+    """
+    Defer the large columns of the root model that the selected fields do
+    not read. Keys, relations, sort columns and always are loaded anyway.
+    """
+    context = context if context is not None else {'request': request}
+    fields, exclude = context_selection(context)
+    if fields is None and not exclude:
+        return queryset
+    columns = serializer_class(context=context).model_columns()
+    if columns is None:
+        return queryset
+    columns.update(always)
+    columns.update(
+        name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str)
+    )
+    deferred = [
+        field.name for field in queryset.model._meta.concrete_fields
+        if field.name not in columns and not field.primary_key and not field.is_relation
+    ]
+    return queryset.defer(*deferred) if deferred else queryset
+
+class SparseQuerysetMixin:
+    """
+    Generic view mixin applying sparse_queryset for the view's serializer;
+    sparse_columns lists the columns the view itself reads
+    """
+    sparse_columns = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, SparseFieldsMixin):
+            return queryset
+        return sparse_queryset(queryset, serializer_class, context=self.get_serializer_context(),
+                               always=self.sparse_columns)
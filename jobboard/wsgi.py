@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobboard.settings')
 
 application = get_wsgi_application()
+
+# Build the autocomplete index in the background as the server starts
+from jobs.autocomplete import autocomplete  # noqa: E402
+
+autocomplete.start_rebuild()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Job, JobCategory
+from .models import ExchangeRate, Job, JobCategory, JobImport, SavedSearch
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
@@ -13,7 +13,8 @@ class JobAdmin(admin.ModelAdmin):
                     'views_count', 'applications_count', 'created_at')
     list_filter = ('is_active', 'is_featured', 'job_type', 'experience_level', 'category', 'created_at')
     search_fields = ('title', 'description', 'employer__company_name', 'location')
-    readonly_fields = ('slug', 'views_count', 'published_at', 'created_at', 'updated_at', 'applications_count')
+    readonly_fields = ('slug', 'views_count', 'published_at', 'created_at', 'updated_at', 'applications_count', 'place',
+                       'salary_min_base', 'salary_max_base')
     prepopulated_fields = {'slug': ('title',)}
     
     fieldsets = (
@@ -24,10 +25,10 @@ class JobAdmin(admin.ModelAdmin):
             'fields': ('description', 'requirements', 'responsibilities')
         }),
         ('Compensation', {
-            'fields': ('salary_min', 'salary_max', 'salary_currency')
+            'fields': ('salary_min', 'salary_max', 'salary_currency', 'salary_min_base', 'salary_max_base')
         }),
         ('Location & Remote', {
-            'fields': ('location', 'is_remote')
+            'fields': ('location', 'place', 'is_remote')
         }),
         ('Application Details', {
             'fields': ('application_deadline', 'positions_available')
@@ -41,13 +42,27 @@ class JobAdmin(admin.ModelAdmin):
         }),
     )
     
-    def applications_count(self, obj):
-        return obj.applications.count()
-    applications_count.short_description = 'Applications'
-    
     def get_queryset(self, request):
-        """Optimize queryset with annotations"""
+        """Optimize queryset with related objects"""
         qs = super().get_queryset(request)
-        return qs.select_related('employer', 'category').annotate(
-            applications_count=Count('applications')
-        )
\ No newline at end of file
+        return qs.select_related('employer', 'category')
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ('currency', 'rate', 'updated_at')
+    search_fields = ('currency',)
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ('user', 'name', 'keyword', 'location', 'is_active', 'last_matched_at', 'created_at')
+    list_filter = ('is_active', 'remote_only', 'featured_only')
+    search_fields = ('name', 'keyword', 'user__email')
+    readonly_fields = ('place', 'group_count', 'last_matched_at', 'created_at', 'updated_at')
+
+
+@admin.register(JobImport)
+class JobImportAdmin(admin.ModelAdmin):
+    list_display = ('employer', 'format', 'status', 'total_rows', 'created_count', 'error_count', 'created_at')
+    list_filter = ('status', 'format')
+    readonly_fields = ('total_rows', 'created_count', 'error_count', 'errors', 'created_at', 'completed_at')
@@ -1,9 +1,19 @@
-from django.db.models import Q, Count, Avg
+from django.db.models import Q
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
+from locations.spatial import parse_radius
+from .expiry import open_jobs_filter
+from .facets import compute_facets, precomputed_facets
+from .filters import location_filter
 from .models import Job
+from .pagination import JobKeysetPagination, get_job_paginator, include_count, sort_column
+from .ranking import RELEVANCE_SORT, rank_by_relevance
+from .salaries import base_salary_bound
+from .search_backends import get_search_backend
+from .search_cache import cached_search
 from .serializers import JobListSerializer
+from jobboard.sparse_fields import sparse_context, sparse_queryset
 
 class AdvancedJobSearchView(APIView):
     """
@@ -13,25 +23,35 @@ class AdvancedJobSearchView(APIView):
     permission_classes = (permissions.AllowAny,)
     
     def get(self, request):
-        queryset = Job.objects.filter(is_active=True).select_related('employer', 'category')
+        jobs, data = cached_search(request, lambda: self.search(request))
+        data['results'] = JobListSerializer(jobs, many=True, context=sparse_context(request)).data
+        return Response(data)
+    
+    def search(self, request):
+        """Return the page of jobs and the paginated response (with aggregations) without results"""
+        queryset = Job.objects.filter(open_jobs_filter()).select_related('employer', 'category')
+        # Filters outside the facet table dimensions force aggregating the jobs table
+        heavy_filters = False
         
-        # Text search across multiple fields
+        # Text search across title, description, requirements, company and category
         search_query = request.query_params.get('q', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(requirements__icontains=search_query) |
-                Q(employer__company_name__icontains=search_query) |
-                Q(category__name__icontains=search_query)
-            )
+            queryset = get_search_backend().filter_queryset(queryset, search_query)
+            heavy_filters = True
         
-        # Location filter with multiple locations
+        # Location filter with multiple locations, optionally widened to a radius in km.
+        # Facet cells hold the place and the text of unresolved jobs, so only
+        # locations that resolve to no place need the jobs table.
         locations = request.query_params.getlist('locations[]')
+        location_query = None
         if locations:
+            radius_km = parse_radius(request.query_params.get('radius_km'))
             location_query = Q()
             for location in locations:
-                location_query |= Q(location__icontains=location)
+                query, matched = location_filter(location, radius_km)
+                location_query |= query
+                if matched is None:
+                    heavy_filters = True
             queryset = queryset.filter(location_query)
         
         # Multiple categories
@@ -49,19 +69,22 @@ class AdvancedJobSearchView(APIView):
         if experience_levels:
             queryset = queryset.filter(experience_level__in=experience_levels)
         
-        # Salary range
+        # Salary range, compared in the base currency unless currency is given
+        currency = request.query_params.get('currency')
         min_salary = request.query_params.get('min_salary')
         max_salary = request.query_params.get('max_salary')
         
         if min_salary:
             queryset = queryset.filter(
-                Q(salary_min__gte=min_salary) | Q(salary_min__isnull=True)
+                Q(salary_min_base__gte=base_salary_bound(min_salary, currency)) | Q(salary_min_base__isnull=True)
             )
+            heavy_filters = True
         
         if max_salary:
             queryset = queryset.filter(
-                Q(salary_max__lte=max_salary) | Q(salary_max__isnull=True)
+                Q(salary_max_base__lte=base_salary_bound(max_salary, currency)) | Q(salary_max_base__isnull=True)
             )
+            heavy_filters = True
         
         # Remote jobs only
         remote_only = request.query_params.get('remote_only', '').lower() == 'true'
@@ -81,14 +104,31 @@ class AdvancedJobSearchView(APIView):
             days = int(posted_within)
             date_from = timezone.now() - timedelta(days=days)
             queryset = queryset.filter(created_at__gte=date_from)
+            heavy_filters = True
         
         # Company filter
         companies = request.query_params.getlist('companies[]')
         if companies:
             queryset = queryset.filter(employer__id__in=companies)
-        
-        # Annotate with applications count
-        queryset = queryset.annotate(applications_count=Count('applications'))
+            heavy_filters = True
+        
+        paginator = get_job_paginator(request)
+        
+        # Aggregations and the total in one grouped query (or a facet table read).
+        # Keyset clients skip them unless they ask for counts.
+        if isinstance(paginator, JobKeysetPagination) and not include_count(request, default=False):
+            aggregations = None
+        elif heavy_filters:
+            aggregations = compute_facets(queryset)
+        else:
+            aggregations = precomputed_facets(
+                categories=categories,
+                job_types=job_types,
+                experience_levels=experience_levels,
+                location_query=location_query,
+                remote_only=remote_only,
+                featured_only=featured_only,
+            )
         
         # Sorting
         sort_by = request.query_params.get('sort_by', '-created_at')
@@ -102,42 +142,22 @@ class AdvancedJobSearchView(APIView):
             'applications_count', '-applications_count'
         ]
         
-        if sort_by in valid_sort_fields:
-            queryset = queryset.order_by(sort_by)
+        if sort_by == RELEVANCE_SORT and search_query:
+            queryset = rank_by_relevance(queryset, search_query)
+        elif sort_by in valid_sort_fields:
+            queryset = queryset.order_by(sort_column(sort_by))
+        else:
+            queryset = queryset.order_by('-created_at')
         
-        # Pagination
-        from rest_framework.pagination import PageNumberPagination
-        paginator = PageNumberPagination()
-        paginator.page_size = int(request.query_params.get('page_size', 20))
-        result_page = paginator.paginate_queryset(queryset, request)
+        queryset = sparse_queryset(queryset, JobListSerializer, context=sparse_context(request))
         
-        serializer = JobListSerializer(result_page, many=True)
+        # Pagination reuses the aggregated total instead of running COUNT(*)
+        result_page = paginator.paginate_queryset(
+            queryset, request, count=aggregations['total_results'] if aggregations else None
+        )
         
-        # Add aggregation data
-        response_data = paginator.get_paginated_response(serializer.data).data
-        response_data['aggregations'] = {
-            'total_results': queryset.count(),
-            'categories': self.get_category_facets(queryset),
-            'job_types': self.get_job_type_facets(queryset),
-            'locations': self.get_location_facets(queryset),
-        }
+        response_data = paginator.get_paginated_response(None).data
+        if aggregations is not None:
+            response_data['aggregations'] = aggregations
         
-        return Response(response_data)
-    
-    def get_category_facets(self, queryset):
-        """Get job counts by category"""
-        return list(queryset.values('category__name', 'category__slug')
-                .annotate(count=Count('id'))
-                .order_by('-count')[:10])
-    
-    def get_job_type_facets(self, queryset):
-        """Get job counts by type"""
-        return list(queryset.values('job_type')
-                .annotate(count=Count('id'))
-                .order_by('-count'))
-    
-    def get_location_facets(self, queryset):
-        """Get job counts by location"""
-        return list(queryset.values('location')
-                .annotate(count=Count('id'))
-                .order_by('-count')[:10])
\ No newline at end of file
+        return result_page, response_data
@@ -0,0 +1,139 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from locations.spatial import places_within
+from .search_backends import query_terms
+from .search_index import get_job_documents, tokenize
+
+NOTIFICATION_TYPE = 'job_alert'
+BATCH_SIZE = 500
+
+def saved_search_groups(search):
+    """
+    Criteria of a saved search as {group: terms}. Every keyword term is its
+    own group (all must appear), and the last one matches as a prefix, as in
+    search; list criteria are one group each (any may match). Structured
+    criteria use prefixed terms that cannot collide with words, e.g.
+    'job_type:contract'. A location outside the gazetteer matches the words
+    of the job's location text.
+    """
+    groups = {}
+    terms = query_terms(search.keyword)
+    for position, term in enumerate(terms):
+        groups[f'keyword:{position}'] = {f'prefix:{term}' if position == len(terms) - 1 else term}
+    if search.categories:
+        groups['category'] = {f'category:{slug}' for slug in search.categories}
+    if search.job_types:
+        groups['job_type'] = {f'job_type:{job_type}' for job_type in search.job_types}
+    if search.experience_levels:
+        groups['experience_level'] = {f'experience_level:{level}' for level in search.experience_levels}
+    if search.place_id:
+        if search.radius_km:
+            place_ids = places_within(search.place.latitude, search.place.longitude, search.radius_km)
+        else:
+            place_ids = [search.place_id]
+        groups['place'] = {f'place:{place_id}' for place_id in place_ids}
+    elif search.location:
+        for position, term in enumerate(dict.fromkeys(tokenize(search.location))):
+            groups[f'location:{position}'] = {f'location:{term}'}
+    if search.remote_only:
+        groups['remote'] = {'remote:true'}
+    if search.featured_only:
+        groups['featured'] = {'featured:true'}
+    return groups
+
+def index_saved_search(search):
+    """
+    Replace a saved search's reverse index entries
+    """
+    from .models import SavedSearch, SavedSearchTerm
+
+    groups = saved_search_groups(search)
+    with transaction.atomic():
+        SavedSearchTerm.objects.filter(saved_search=search).delete()
+        SavedSearchTerm.objects.bulk_create([
+            SavedSearchTerm(saved_search=search, group=group, term=term)
+            for group, terms in groups.items() for term in terms
+        ], batch_size=BATCH_SIZE)
+        SavedSearch.objects.filter(pk=search.pk).update(group_count=len(groups))
+    search.group_count = len(groups)
+
+def job_terms(job):
+    """
+    Terms a published job offers to the reverse index
+    """
+    terms = set()
+    for text in get_job_documents(job).values():
+        terms.update(tokenize(text))
+    terms.update({f'prefix:{term[:length]}' for term in terms for length in range(1, len(term) + 1)})
+    terms.update(f'location:{term}' for term in tokenize(job.location))
+    terms.add(f'job_type:{job.job_type}')
+    terms.add(f'experience_level:{job.experience_level}')
+    if job.category_id:
+        terms.add(f'category:{job.category.slug}')
+    if job.place_id:
+        terms.add(f'place:{job.place_id}')
+    if job.is_remote:
+        terms.add('remote:true')
+    if job.is_featured:
+        terms.add('featured:true')
+    return terms
+
+def matching_saved_searches(job):
+    """
+    Active saved searches a job satisfies, found in one query: searches
+    whose every criteria group has a term in the job's term set, then
+    narrowed by the salary bounds. Keywords match whole terms, except the
+    last, which matches any job term it starts.
+    """
+    from .models import SavedSearch, SavedSearchTerm
+
+    satisfied = (
+        SavedSearchTerm.objects.filter(term__in=job_terms(job))
+        .values('saved_search', 'saved_search__group_count')
+        .annotate(groups=Count('group', distinct=True))
+        .filter(groups=F('saved_search__group_count'))
+        .values('saved_search')
+    )
+    searches = SavedSearch.objects.filter(id__in=satisfied, is_active=True, group_count__gt=0)
+    if job.salary_min_base is not None:
+        searches = searches.filter(Q(min_salary__isnull=True) | Q(min_salary__lte=job.salary_min_base))
+    if job.salary_max_base is not None:
+        searches = searches.filter(Q(max_salary__isnull=True) | Q(max_salary__gte=job.salary_max_base))
+    return searches.exclude(user_id=job.employer.user_id)
+
+def notify_saved_searches(job):
+    """
+    Create one job alert notification per user with a matching saved
+    search, in bulk. Returns the number of notifications created.
+    """
+    from notifications.models import Notification
+    from .models import SavedSearch
+
+    link = f"/jobs/{job.slug}"
+    search_ids, user_ids = [], set()
+    for search_id, user_id in matching_saved_searches(job).values_list('id', 'user_id').iterator():
+        search_ids.append(search_id)
+        user_ids.add(user_id)
+    if not search_ids:
+        return 0
+
+    # A job published again (after being deactivated) does not alert twice
+    already_notified = set(Notification.objects.filter(
+        notification_type=NOTIFICATION_TYPE, link=link, recipient_id__in=user_ids
+    ).values_list('recipient_id', flat=True))
+
+    title = f"New job matching your search: {job.title}"
+    message = f"{job.employer.company_name} posted '{job.title}' in {job.location}."
+    notifications = [
+        Notification(recipient_id=user_id, notification_type=NOTIFICATION_TYPE,
+                     title=title, message=message, link=link)
+        for user_id in sorted(user_ids - already_notified)
+    ]
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+        now = timezone.now()
+        for start in range(0, len(search_ids), BATCH_SIZE):
+            SavedSearch.objects.filter(id__in=search_ids[start:start + BATCH_SIZE]).update(last_matched_at=now)
+    return len(notifications)
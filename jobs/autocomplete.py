@@ -0,0 +1,388 @@
+import heapq
+import math
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .search_index import normalize
+
+VERSION_KEY = 'job_autocomplete:version'
+# Re-read jobs updated slightly before the watermark to absorb commit delays
+REFRESH_OVERLAP = timedelta(seconds=5)
+# Prefixes matching more keys than this have their top suggestions precomputed
+WIDE_PREFIX = 256
+# Suggestions precomputed per wide prefix and kind (the autocomplete view's max limit)
+TOP_K = 20
+WORD_START_RE = re.compile(r'\S+')
+
+def normalize_key(text):
+    return ' '.join(normalize(text).split())
+
+def title_weight(views_count, applications_count):
+    return 1.0 + math.log1p(views_count) + 2 * math.log1p(applications_count)
+
+def job_contributions(title, company, category, location, views_count, applications_count):
+    """
+    Suggestions an active job adds to the index, with their popularity weight
+    """
+    contributions = [('title', title, title_weight(views_count, applications_count))]
+    if company:
+        contributions.append(('company', company, 1.0))
+    if category:
+        contributions.append(('category', category, 1.0))
+    if location:
+        contributions.append(('location', location, 1.0))
+    return contributions
+
+class PrefixIndex:
+    """
+    In-memory typeahead index. Every suggestion is stored once per word start
+    in a sorted array of normalized keys, so the keys matching a prefix are
+    one slice found by two bisects. Prefixes with wide slices keep their top
+    suggestions per kind, built once and patched as weights change, so a
+    lookup ranks either those lists or a narrow slice.
+    """
+    def __init__(self):
+        self.keys = []
+        self.weights = {}
+        self.contributions = {}
+        self.top = {}
+
+    @classmethod
+    def build(cls, jobs):
+        """
+        Index (job_id, contributions) pairs, sorting the keys once
+        """
+        index = cls()
+        for job_id, contributions in jobs:
+            if not contributions:
+                continue
+            index.contributions[job_id] = contributions
+            for kind, label, weight in contributions:
+                index.weights[(kind, label)] = index.weights.get((kind, label), 0.0) + weight
+        index.keys = sorted(key for kind, label in index.weights for key in index._entry_keys(kind, label))
+        index._precompute()
+        return index
+
+    def _entry_keys(self, kind, label):
+        text = normalize_key(label)
+        return [(text[match.start():], kind, label) for match in WORD_START_RE.finditer(text)]
+
+    def _rank(self, entry):
+        return self.weights[entry], entry[1]
+
+    def _best(self, entries, limit=TOP_K):
+        return heapq.nlargest(limit, entries, key=self._rank)
+
+    def _slice(self, prefix, low=0, high=None):
+        high = len(self.keys) if high is None else high
+        return (bisect_left(self.keys, (prefix,), low, high),
+                bisect_left(self.keys, (prefix + '\uffff',), low, high))
+
+    def _candidates(self, depth, low, high, build=False):
+        """
+        Entries by kind that can rank first for keys[low:high], which share
+        their first depth characters: the top lists of wide child prefixes
+        (computed first when building) and every entry of the narrow ones
+        """
+        candidates = defaultdict(set)
+        position = low
+        while position < high:
+            text, kind, label = self.keys[position]
+            if len(text) <= depth:
+                candidates[kind].add((kind, label))
+                position += 1
+                continue
+            prefix = text[:depth + 1]
+            end = self._slice(prefix, position, high)[1]
+            if build and end - position > WIDE_PREFIX:
+                self.top[prefix] = self._top_by_kind(depth + 1, position, end, build=True)
+            if prefix in self.top:
+                for kind, entries in self.top[prefix].items():
+                    candidates[kind].update(entries)
+            else:
+                for _, kind, label in self.keys[position:end]:
+                    candidates[kind].add((kind, label))
+            position = end
+        return candidates
+
+    def _top_by_kind(self, depth, low, high, build=False):
+        return {kind: self._best(entries) for kind, entries in self._candidates(depth, low, high, build).items()}
+
+    def _precompute(self):
+        """
+        Keep the top suggestions of every prefix wider than WIDE_PREFIX,
+        merged bottom-up from the longer prefixes so each key is ranked once
+        """
+        self.top = {}
+        self._candidates(0, 0, len(self.keys), build=True)
+
+    def _wide_prefixes(self, entry):
+        """
+        Precomputed prefixes of an entry's keys; every shorter prefix of a
+        wide prefix is wide too, so each key stops at its first miss
+        """
+        seen = set()
+        for text, _, _ in self._entry_keys(*entry):
+            for end in range(1, len(text) + 1):
+                prefix = text[:end]
+                if prefix not in self.top:
+                    break
+                if prefix not in seen:
+                    seen.add(prefix)
+                    yield prefix
+
+    def _update_top(self, entry, grew):
+        """
+        Patch the precomputed suggestions after an entry's weight changed.
+        A rise can only move the entry up; a drop out of a list means the
+        next best entry is unknown, so that list is merged again from its
+        child prefixes, longest prefixes first.
+        """
+        kind = entry[0]
+        for prefix in sorted(self._wide_prefixes(entry), key=len, reverse=True):
+            lists = self.top[prefix]
+            entries = lists.get(kind, [])
+            if grew:
+                if entry not in entries:
+                    if len(entries) >= TOP_K and self._rank(entry) <= self._rank(entries[-1]):
+                        continue
+                    entries.append(entry)
+                lists[kind] = self._best(entries)
+            elif entry in entries:
+                low, high = self._slice(prefix)
+                lists[kind] = self._best(self._candidates(len(prefix), low, high)[kind])
+
+    def _adjust(self, entry, delta):
+        weight = self.weights.get(entry, 0.0) + delta
+        if weight <= 1e-9:
+            if self.weights.pop(entry, None) is None:
+                return
+            for key in self._entry_keys(*entry):
+                position = bisect_left(self.keys, key)
+                if position < len(self.keys) and self.keys[position] == key:
+                    del self.keys[position]
+            self._update_top(entry, grew=False)
+            return
+        if entry not in self.weights:
+            for key in self._entry_keys(*entry):
+                insort(self.keys, key)
+        self.weights[entry] = weight
+        self._update_top(entry, grew=delta > 0)
+
+    def remove_job(self, job_id):
+        self.update_job(job_id, [])
+
+    def update_job(self, job_id, contributions):
+        """
+        Replace a job's suggestions; an empty list removes the job. Only
+        entries whose weight changes touch the keys and precomputed lists.
+        """
+        changes = defaultdict(float)
+        for kind, label, weight in self.contributions.pop(job_id, ()):
+            changes[(kind, label)] -= weight
+        if contributions:
+            self.contributions[job_id] = contributions
+            for kind, label, weight in contributions:
+                changes[(kind, label)] += weight
+        for entry, delta in changes.items():
+            if abs(delta) > 1e-9:
+                self._adjust(entry, delta)
+
+    def suggest(self, prefix, limit=10, kinds=None):
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+
+        lists = self.top.get(prefix)
+        if lists is not None and limit <= TOP_K:
+            matches = [entry for kind, entries in lists.items() if not kinds or kind in kinds for entry in entries]
+        else:
+            low, high = self._slice(prefix)
+            matches = {
+                (kind, label) for _, kind, label in self.keys[low:high]
+                if not kinds or kind in kinds
+            }
+        return [
+            {'text': label, 'type': kind, 'score': round(self.weights[(kind, label)], 3)}
+            for kind, label in self._best(matches, limit)
+        ]
+
+class AutocompleteService:
+    """
+    Process-wide index kept fresh without querying the database per request.
+    A version key in the shared cache tells each process when jobs changed,
+    and a refresh then loads the jobs updated since the last one; it also
+    runs every JOB_AUTOCOMPLETE_REFRESH_INTERVAL to pick up counts changed by
+    bulk updates. Refreshes and full rebuilds (at startup and every
+    JOB_AUTOCOMPLETE_REBUILD_INTERVAL) run in a background thread while
+    requests keep using the current index.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.index = None
+        self.version = None
+        self.watermark = None
+        self.built_at = 0
+        self.refreshed_at = 0
+        self.worker = None
+
+    def job_rows(self, queryset):
+        return queryset.values_list(
+            'id', 'is_active', 'title', 'employer__company_name', 'category__name',
+            'location', 'views_count', 'applications_count', 'updated_at'
+        )
+
+    def apply_rows(self, index, rows):
+        watermark = self.watermark
+        for job_id, is_active, *fields, updated_at in rows:
+            index.update_job(job_id, job_contributions(*fields) if is_active else [])
+            if watermark is None or updated_at > watermark:
+                watermark = updated_at
+        self.watermark = watermark
+
+    def rebuild(self):
+        """
+        Build a new index from the active jobs and swap it in. Changes made
+        meanwhile bumped the version, so the next refresh re-reads them.
+        """
+        from .models import Job
+
+        version = cache.get(VERSION_KEY)
+        jobs, watermark = [], None
+        for job_id, _, *fields, updated_at in self.job_rows(Job.objects.filter(is_active=True)).iterator():
+            jobs.append((job_id, job_contributions(*fields)))
+            if watermark is None or updated_at > watermark:
+                watermark = updated_at
+        index = PrefixIndex.build(jobs)
+        with self.lock:
+            self.index = index
+            self.version = version
+            self.watermark = watermark
+            self.built_at = self.refreshed_at = time.monotonic()
+
+    def refresh(self):
+        """
+        Catch up with changes from other processes: re-read jobs updated
+        since the watermark, drop jobs deleted elsewhere and re-weight titles
+        whose view or application counts moved through bulk updates, which
+        leave updated_at alone. Queries run outside the lock; a job this
+        process changed in the meantime keeps its newer suggestions.
+        """
+        from .models import Job
+
+        with self.lock:
+            index = self.index
+            known = dict(index.contributions)
+            watermark = self.watermark
+        version = cache.get(VERSION_KEY)
+        counts = {
+            job_id: (views_count, applications_count)
+            for job_id, views_count, applications_count in Job.objects.filter(is_active=True)
+            .values_list('id', 'views_count', 'applications_count').iterator()
+        }
+        changed = Job.objects.all()
+        if watermark is not None:
+            changed = changed.filter(updated_at__gte=watermark - REFRESH_OVERLAP)
+        changed = list(self.job_rows(changed))
+
+        updates = {}
+        for job_id, contributions in known.items():
+            if job_id not in counts:
+                updates[job_id] = []
+                continue
+            weight = title_weight(*counts[job_id])
+            if any(kind == 'title' and abs(old - weight) > 1e-9 for kind, _, old in contributions):
+                updates[job_id] = [
+                    (kind, label, weight if kind == 'title' else old) for kind, label, old in contributions
+                ]
+
+        with self.lock:
+            if self.index is not index:
+                return
+            for job_id, contributions in updates.items():
+                if index.contributions.get(job_id) is known[job_id]:
+                    index.update_job(job_id, contributions)
+            self.apply_rows(index, changed)
+            self.version = version
+            self.refreshed_at = time.monotonic()
+
+    def _run(self, target):
+        try:
+            target()
+        finally:
+            connection.close()
+
+    def start_background(self, target, name):
+        """
+        Run a rebuild or refresh in a background thread unless one is already running
+        """
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive():
+                return
+            self.worker = threading.Thread(target=self._run, args=(target,), name=name, daemon=True)
+            self.worker.start()
+
+    def start_rebuild(self):
+        self.start_background(self.rebuild, 'job-autocomplete-rebuild')
+
+    def start_refresh(self):
+        self.start_background(self.refresh, 'job-autocomplete-refresh')
+
+    def get_index(self):
+        """
+        The current index, without touching the database: a rebuild or
+        refresh it needs is started in the background and picked up by
+        later requests. Until the first build finishes it is empty.
+        """
+        now = time.monotonic()
+        if self.index is None or now - self.built_at > getattr(settings, 'JOB_AUTOCOMPLETE_REBUILD_INTERVAL', 600):
+            self.start_rebuild()
+        elif (cache.get(VERSION_KEY) != self.version
+              or now - self.refreshed_at > getattr(settings, 'JOB_AUTOCOMPLETE_REFRESH_INTERVAL', 60)):
+            self.start_refresh()
+        return self.index if self.index is not None else PrefixIndex()
+
+    def job_changed(self, job):
+        """
+        Apply a saved job to this process's index and tell the others
+        """
+        with self.lock:
+            if self.index is not None:
+                contributions = []
+                if job.is_active:
+                    contributions = job_contributions(
+                        job.title,
+                        job.employer.company_name if job.employer_id else '',
+                        job.category.name if job.category_id else '',
+                        job.location, job.views_count, job.applications_count,
+                    )
+                self.index.update_job(job.pk, contributions)
+        self.bump_version()
+
+    def job_deleted(self, job_id):
+        with self.lock:
+            if self.index is not None:
+                self.index.remove_job(job_id)
+        self.bump_version()
+
+    def bump_version(self):
+        cache.add(VERSION_KEY, 0, None)
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
+
+    def suggest(self, prefix, limit=10, kinds=None):
+        index = self.get_index()
+        with self.lock:
+            return index.suggest(prefix, limit=limit, kinds=kinds)
+
+autocomplete = AutocompleteService()
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .view_counter import REDIS_CACHE_BACKEND
+
+# Cache backends whose entries are private to one process
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Features relying on the cache being shared by every worker
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    errors = []
+    if backend in PROCESS_LOCAL_CACHES and getattr(settings, 'JOB_SEARCH_CACHE_TIMEOUT', 0):
+        errors.append(Warning(
+            'JOB_SEARCH_CACHE_TIMEOUT is set but the default cache is local to each process.',
+            hint='Invalidations from other workers and Celery never reach it, so stale results are '
+                 'served until they time out. Configure a shared CACHE_BACKEND or set the timeout to 0.',
+            id='jobs.W001',
+        ))
+    if backend != REDIS_CACHE_BACKEND and getattr(settings, 'JOB_VIEWS_WRITE_BEHIND', False):
+        errors.append(Warning(
+            'JOB_VIEWS_WRITE_BEHIND is on but the default cache is not Redis.',
+            hint='The set of buffered jobs then lives in each process, so views buffered by web workers '
+                 f'are invisible to the Celery flush. Set CACHE_BACKEND to {REDIS_CACHE_BACKEND}.',
+            id='jobs.W002',
+        ))
+    return errors
@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .autocomplete import autocomplete
+from .facets import FACET_FIELDS, facet_key, release_facet_cells
+from .search_cache import invalidate_search_cache
+from .trending import drop_trending_scores
+
+NOTIFICATION_TYPE = 'job_expired'
+BATCH_SIZE = 500
+
+def open_jobs_filter(today=None):
+    """
+    Active jobs still accepting applications, matching Job.is_expired. Served
+    by the (is_active, application_deadline) index, so jobs expired since the
+    last sweep never reach serialization.
+    """
+    today = today or timezone.now().date()
+    return Q(is_active=True) & (Q(application_deadline__isnull=True) | Q(application_deadline__gte=today))
+
+def expire_jobs(today=None, batch_size=BATCH_SIZE):
+    """
+    Deactivate active jobs whose application deadline has passed, one
+    chunk of ids per transaction, and notify their employers in bulk.
+    Returns the number of jobs expired.
+    """
+    from notifications.models import Notification
+    from .models import Job
+
+    today = today or timezone.now().date()
+    expired = Job.objects.filter(is_active=True, application_deadline__lt=today).order_by('pk')
+    fields = ('id', 'title', 'slug', 'employer__user_id') + FACET_FIELDS
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(expired.select_for_update(of=('self',)).values(*fields)[:batch_size])
+            if not rows:
+                break
+            job_ids = [row['id'] for row in rows]
+            Job.objects.filter(pk__in=job_ids).update(
+                is_active=False, published_at=None, updated_at=timezone.now()
+            )
+            drop_trending_scores(job_ids)
+            release_facet_cells(
+                facet_key(Job(**{field: row[field] for field in FACET_FIELDS})) for row in rows
+            )
+            Notification.objects.bulk_create([
+                Notification(
+                    recipient_id=row['employer__user_id'],
+                    notification_type=NOTIFICATION_TYPE,
+                    title=f"Job expired: {row['title']}",
+                    message=f"The application deadline for '{row['title']}' has passed and the job is no longer listed.",
+                    link=f"/jobs/{row['slug']}",
+                )
+                for row in rows
+            ])
+        total += len(rows)
+
+    if total:
+        # Bulk updates bypass the Job signals, so refresh the derived state here
+        invalidate_search_cache()
+        autocomplete.bump_version()
+    return total
@@ -0,0 +1,206 @@
+from collections import Counter, defaultdict
+from itertools import chain
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Sum, Value, When
+from django.utils import timezone
+
+from locations.models import place_label
+
+# Job attributes stored on each facet cell, plus is_active which decides
+# whether the job is counted at all. The location text is only kept for
+# jobs without a place, which are bucketed by it.
+CELL_DIMENSIONS = ('category_id', 'job_type', 'experience_level', 'place_id', 'location', 'is_remote', 'is_featured')
+FACET_FIELDS = CELL_DIMENSIONS + ('is_active',)
+# Names a partial save may list in update_fields for the facet fields
+FACET_UPDATE_FIELDS = frozenset(FACET_FIELDS) | {field.removesuffix('_id') for field in FACET_FIELDS}
+
+# Columns the aggregations group by
+GROUP_FIELDS = ('category__name', 'category__slug', 'job_type',
+                'place_id', 'place__name', 'place__admin1', 'place__country_code', 'location')
+
+CATEGORY_FACET_SIZE = 10
+LOCATION_FACET_SIZE = 10
+
+def facet_key(job):
+    """
+    Facet cell a job is counted in, or None when it is not counted
+    """
+    if not job.is_active:
+        return None
+    cell = {field: getattr(job, field) for field in CELL_DIMENSIONS}
+    if job.place_id is not None:
+        cell['location'] = ''
+    return tuple(cell[field] for field in CELL_DIMENSIONS)
+
+def adjust_facet_cells(old_key, new_key):
+    """
+    Move one job between facet cells after a save or delete
+    """
+    from .models import JobFacetCell
+
+    if old_key == new_key:
+        return
+
+    with transaction.atomic():
+        if old_key is not None:
+            JobFacetCell.objects.filter(**dict(zip(CELL_DIMENSIONS, old_key))).update(count=F('count') - 1)
+        if new_key is not None:
+            cell, _ = JobFacetCell.objects.get_or_create(**dict(zip(CELL_DIMENSIONS, new_key)))
+            JobFacetCell.objects.filter(pk=cell.pk).update(count=F('count') + 1)
+
+def count_facet_cells(keys):
+    """
+    Count a batch of jobs inserted by bulk_create, one UPDATE per cell
+    """
+    from .models import JobFacetCell
+
+    with transaction.atomic():
+        for key, count in Counter(key for key in keys if key is not None).items():
+            cell, _ = JobFacetCell.objects.get_or_create(**dict(zip(CELL_DIMENSIONS, key)))
+            JobFacetCell.objects.filter(pk=cell.pk).update(count=F('count') + count)
+
+def release_facet_cells(keys):
+    """
+    Uncount a batch of jobs deactivated by a bulk update, one UPDATE per cell
+    """
+    from .models import JobFacetCell
+
+    with transaction.atomic():
+        for key, count in Counter(key for key in keys if key is not None).items():
+            JobFacetCell.objects.filter(**dict(zip(CELL_DIMENSIONS, key))).update(count=F('count') - count)
+
+def rebuild_facet_cells():
+    """
+    Recompute every facet cell from the jobs table in one grouped query
+    """
+    from .models import Job, JobFacetCell
+
+    dimensions = [field for field in CELL_DIMENSIONS if field != 'location']
+    rows = (Job.objects.filter(is_active=True).order_by()
+            .annotate(cell_location=Case(When(place__isnull=True, then=F('location')), default=Value('')))
+            .values(*dimensions, 'cell_location').annotate(count=Count('id')))
+    cells = [JobFacetCell(location=row.pop('cell_location'), **row) for row in rows]
+
+    with transaction.atomic():
+        JobFacetCell.objects.all().delete()
+        JobFacetCell.objects.bulk_create(cells, batch_size=1000)
+
+    return len(cells)
+
+def filter_dimensions(queryset, categories=None, job_types=None, experience_levels=None, location_query=None,
+                      remote_only=False, featured_only=False):
+    """
+    Apply the filters that map directly onto cell dimensions to facet
+    cells or jobs, which share the field names. location_query is a
+    location_filter() Q for locations that resolved to places.
+    """
+    if categories:
+        queryset = queryset.filter(category__slug__in=categories)
+    if job_types:
+        queryset = queryset.filter(job_type__in=job_types)
+    if experience_levels:
+        queryset = queryset.filter(experience_level__in=experience_levels)
+    if location_query is not None:
+        queryset = queryset.filter(location_query)
+    if remote_only:
+        queryset = queryset.filter(is_remote=True)
+    if featured_only:
+        queryset = queryset.filter(is_featured=True)
+    return queryset
+
+def cell_queryset(**filters):
+    """
+    Facet cells matching the filters that map directly onto cell dimensions
+    """
+    from .models import JobFacetCell
+
+    return filter_dimensions(JobFacetCell.objects.filter(count__gt=0), **filters)
+
+def lapsed_queryset(today=None, **filters):
+    """
+    Jobs still counted in the facet cells whose deadline passed since the
+    last expiry sweep, read through the (is_active, application_deadline) index
+    """
+    from .models import Job
+
+    today = today or timezone.now().date()
+    return filter_dimensions(Job.objects.filter(is_active=True, application_deadline__lt=today), **filters)
+
+def precomputed_facets(today=None, **filters):
+    """
+    Aggregations for unfiltered or lightly filtered searches, read from the
+    facet table instead of the jobs table. Jobs past their deadline but not
+    yet deactivated are subtracted so the counts match open_jobs_filter().
+    """
+    rows = (cell_queryset(**filters).order_by()
+            .values(*GROUP_FIELDS)
+            .annotate(count=Sum('count')))
+    lapsed = (lapsed_queryset(today, **filters).order_by()
+              .values(*GROUP_FIELDS)
+              .annotate(count=Count('id')))
+    return fold_facets(chain(rows, ({**row, 'count': -row['count']} for row in lapsed)))
+
+def compute_facets(queryset):
+    """
+    Aggregations for an arbitrary Job queryset in a single grouped query
+    """
+    rows = (queryset.order_by()
+            .values(*GROUP_FIELDS)
+            .annotate(count=Count('id')))
+    return fold_facets(rows)
+
+def fold_facets(rows):
+    """
+    Split (category, job type, location) groups into the per-facet buckets
+    and the total. Locations are bucketed by place, labelled with the place
+    name (qualified when two places share it), and jobs without a place by
+    their location text.
+    """
+    total = 0
+    categories = defaultdict(int)
+    job_types = defaultdict(int)
+    locations = defaultdict(int)
+    places = {}
+
+    for row in rows:
+        count = row['count']
+        total += count
+        categories[(row['category__name'], row['category__slug'])] += count
+        job_types[row['job_type']] += count
+        if row['place_id'] is not None:
+            places[row['place_id']] = (
+                row['place__name'], place_label(row['place__name'], row['place__admin1'], row['place__country_code'])
+            )
+            locations[(row['place_id'], '')] += count
+        elif row['location']:
+            locations[(None, row['location'])] += count
+
+    names = Counter(name for name, _ in places.values())
+
+    def location_label(place_id, text):
+        if place_id is None:
+            return text
+        name, label = places[place_id]
+        return name if names[name] == 1 else label
+
+    return {
+        'total_results': total,
+        'categories': [
+            {'category__name': name, 'category__slug': slug, 'count': count}
+            for (name, slug), count in top_buckets(categories, CATEGORY_FACET_SIZE)
+        ],
+        'job_types': [
+            {'job_type': job_type, 'count': count}
+            for job_type, count in top_buckets(job_types)
+        ],
+        'locations': [
+            {'location': location_label(place_id, text), 'count': count}
+            for (place_id, text), count in top_buckets(locations, LOCATION_FACET_SIZE)
+        ],
+    }
+
+def top_buckets(counts, size=None):
+    buckets = sorted((item for item in counts.items() if item[1] > 0),
+                     key=lambda item: (-item[1], str(item[0])))
+    return buckets[:size] if size else buckets
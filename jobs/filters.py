@@ -1,18 +1,92 @@
 import django_filters
+from django.db.models import Q
+from rest_framework import filters
+from locations.gazetteer import normalize_name
+from locations.spatial import matching_place_ids, parse_radius
 from .models import Job
+from .pagination import sort_column
+from .salaries import base_salary_bound
+from .search_backends import get_search_backend
+
+# Separator between the words of a location in a whole-word pattern
+NON_WORD = '[^a-z0-9]'
+
+def whole_words_pattern(text):
+    """
+    Case-insensitive regex matching the words of text as whole words, in the
+    portable subset SQLite, PostgreSQL and MySQL share; None without words
+    """
+    words = normalize_name(text).split()
+    if not words:
+        return None
+    return f"(^|{NON_WORD})" + f"{NON_WORD}+".join(words) + f"({NON_WORD}|$)"
+
+def location_filter(location, radius_km=None):
+    """
+    Q matching jobs at the place a location resolves to (or within radius_km
+    of it), and the matched place ids. Jobs whose own location text did not
+    resolve ('Greater New York Area') still match on the whole words of the
+    query. Unresolvable text such as 'Remote' falls back to a substring
+    match and returns None for the ids.
+    """
+    place_ids = matching_place_ids(location, radius_km)
+    if place_ids is None:
+        return Q(location__icontains=location), None
+    query = Q(place_id__in=place_ids)
+    pattern = whole_words_pattern(location)
+    if pattern is not None:
+        query |= Q(place__isnull=True, location__iregex=pattern)
+    return query, place_ids
 
 class JobFilter(django_filters.FilterSet):
     title = django_filters.CharFilter(lookup_expr='icontains')
-    location = django_filters.CharFilter(lookup_expr='icontains')
+    location = django_filters.CharFilter(method='filter_location')
+    # Applied together with location and the salary bounds
+    radius_km = django_filters.NumberFilter(method='skip_filter')
+    currency = django_filters.CharFilter(method='skip_filter')
     job_type = django_filters.ChoiceFilter(choices=Job.JOB_TYPE_CHOICES)
     experience_level = django_filters.ChoiceFilter(choices=Job.EXPERIENCE_LEVEL_CHOICES)
-    salary_min = django_filters.NumberFilter(field_name='salary_min', lookup_expr='gte')
-    salary_max = django_filters.NumberFilter(field_name='salary_max', lookup_expr='lte')
+    salary_min = django_filters.NumberFilter(method='filter_salary_min')
+    salary_max = django_filters.NumberFilter(method='filter_salary_max')
     is_remote = django_filters.BooleanFilter()
     category = django_filters.CharFilter(field_name='category__slug')
     employer = django_filters.NumberFilter(field_name='employer__id')
+    min_applications = django_filters.NumberFilter(field_name='applications_count', lookup_expr='gte')
+    max_applications = django_filters.NumberFilter(field_name='applications_count', lookup_expr='lte')
 
     class Meta:
         model = Job
         fields = ['title', 'location', 'job_type', 'experience_level', 
-            'salary_min', 'salary_max', 'is_remote', 'category', 'employer']
\ No newline at end of file
+            'salary_min', 'salary_max', 'is_remote', 'category', 'employer',
+            'min_applications', 'max_applications']
+    
+    def filter_location(self, queryset, name, value):
+        radius_km = parse_radius(self.data.get('radius_km'))
+        return queryset.filter(location_filter(value, radius_km)[0])
+    
+    def filter_salary_min(self, queryset, name, value):
+        return queryset.filter(salary_min_base__gte=base_salary_bound(value, self.data.get('currency')))
+    
+    def filter_salary_max(self, queryset, name, value):
+        return queryset.filter(salary_max_base__lte=base_salary_bound(value, self.data.get('currency')))
+    
+    def skip_filter(self, queryset, name, value):
+        return queryset
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    DRF search filter backed by the configured job search backend
+    """
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        return get_search_backend().filter_queryset(queryset, ' '.join(search_terms))
+
+class JobOrderingFilter(filters.OrderingFilter):
+    """
+    Ordering filter that sorts aliased keys (salaries) on their indexed columns
+    """
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        return [sort_column(key) if isinstance(key, str) else key for key in ordering] if ordering else ordering
@@ -0,0 +1,185 @@
+import codecs
+import csv
+import json
+import os
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework import serializers
+
+from locations.gazetteer import resolve_place
+from .autocomplete import autocomplete
+from .facets import count_facet_cells, facet_key
+from .salaries import get_rate, to_base
+from .search_backends import reindex_jobs
+from .search_cache import invalidate_search_cache
+
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+EXTENSION_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+def import_format(filename):
+    """
+    Import format implied by a file name, or None
+    """
+    return EXTENSION_FORMATS.get(os.path.splitext(filename or '')[1].lower())
+
+def read_rows(stream, file_format):
+    """
+    Yield (line number, row) from a binary stream, one line at a time. Rows
+    that cannot be parsed are yielded as (line number, error message).
+    """
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    if file_format == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # Blank cells mean "not given" so optional fields fall back to their defaults
+            yield reader.line_num, {
+                key.strip(): value for key, value in row.items()
+                if key and value is not None and value.strip() != ''
+            }
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, "Each line must be a JSON object."
+            continue
+        yield line_number, row
+
+class JobBuilder:
+    """
+    Turns validated rows into unsaved Job instances, doing the work of
+    Job.save() that bulk_create skips. Places and exchange rates are
+    resolved once per distinct location and currency.
+    """
+    def __init__(self, employer):
+        self.employer = employer
+        self.places = {}
+        self.rates = {}
+        self.now = timezone.now()
+
+    def slug(self, title):
+        return f"{slugify(title)}-{uuid.uuid4().hex[:8]}"
+
+    def build(self, data):
+        from .models import Job
+
+        job = Job(employer=self.employer, **data)
+        job.slug = self.slug(job.title)
+        job.published_at = self.now if job.is_active else None
+
+        if job.location not in self.places:
+            self.places[job.location] = resolve_place(job.location)
+        job.place = self.places[job.location]
+        job._resolved_location = job.location
+
+        currency = (job.salary_currency or '').upper()
+        if currency not in self.rates:
+            self.rates[currency] = get_rate(currency)
+        job.salary_min_base = to_base(job.salary_min, self.rates[currency])
+        job.salary_max_base = to_base(job.salary_max, self.rates[currency])
+        return job
+
+def insert_jobs(jobs):
+    """
+    bulk_create a chunk of built jobs and bring the search index and facet
+    table up to date, which the skipped Job signals would otherwise do
+    """
+    from .models import Job
+
+    created = Job.objects.bulk_create(jobs)
+    reindex_jobs(Job.objects.filter(pk__in=[job.pk for job in created]))
+    count_facet_cells(facet_key(job) for job in created)
+    return created
+
+def import_jobs(employer, stream, file_format, chunk_size=CHUNK_SIZE):
+    """
+    Validate every row with the job creation rules and insert the valid
+    ones in chunks, all in one transaction. Returns (created job ids,
+    total rows, errors) where errors lists {'row', 'errors'} per bad row.
+    """
+    from .models import JobCategory
+    from .serializers import JobImportRowSerializer
+
+    categories = {}
+    for category in JobCategory.objects.all():
+        categories[category.slug] = category
+        categories[str(category.pk)] = category
+    # One serializer validates every row, as ListSerializer does with its child
+    row_serializer = JobImportRowSerializer(context={'categories': categories})
+    builder = JobBuilder(employer)
+
+    created_ids, errors, chunk = [], [], []
+    total = 0
+    with transaction.atomic():
+        for line_number, row in read_rows(stream, file_format):
+            total += 1
+            if isinstance(row, str):
+                errors.append({'row': line_number, 'errors': {'non_field_errors': [row]}})
+                continue
+            try:
+                data = row_serializer.run_validation(row)
+            except serializers.ValidationError as exc:
+                errors.append({'row': line_number, 'errors': exc.detail})
+                continue
+            chunk.append(builder.build(data))
+            if len(chunk) >= chunk_size:
+                created_ids.extend(job.pk for job in insert_jobs(chunk))
+                chunk = []
+        if chunk:
+            created_ids.extend(job.pk for job in insert_jobs(chunk))
+
+        if created_ids:
+            invalidate_search_cache()
+            transaction.on_commit(invalidate_search_cache)
+            transaction.on_commit(autocomplete.bump_version)
+            transaction.on_commit(lambda: queue_job_alerts(created_ids))
+    return created_ids, total, errors
+
+def queue_job_alerts(job_ids):
+    from .tasks import match_job_alerts
+
+    for job_id in job_ids:
+        match_job_alerts.delay(job_id)
+
+def run_import(job_import, stream):
+    """
+    Process an import and store its report. A row error skips the row; any
+    other failure rolls the whole import back and marks it failed. Errors
+    other than an unreadable file are re-raised once recorded.
+    """
+    job_import.status = 'processing'
+    job_import.save(update_fields=['status'])
+    try:
+        created_ids, total, errors = import_jobs(job_import.employer, stream, job_import.format)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        job_import.status = 'failed'
+        job_import.errors = [{'row': None, 'errors': {'file': [str(exc)]}}]
+    except Exception as exc:
+        job_import.status = 'failed'
+        job_import.errors = [{'row': None, 'errors': {'import': [str(exc) or exc.__class__.__name__]}}]
+        job_import.completed_at = timezone.now()
+        job_import.save()
+        raise
+    else:
+        job_import.status = 'completed'
+        job_import.total_rows = total
+        job_import.created_count = len(created_ids)
+        job_import.error_count = len(errors)
+        job_import.errors = json.loads(json.dumps(errors[:MAX_REPORTED_ERRORS]))
+    job_import.completed_at = timezone.now()
+    job_import.save()
+    return job_import
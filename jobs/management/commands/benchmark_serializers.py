@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from applications.models import Application
+from applications.serializers import ApplicationListSerializer, CompiledApplicationListSerializer
+from candidates.models import Candidate
+from candidates.serializers import CandidateListSerializer, CompiledCandidateListSerializer
+from employers.models import Employer
+from employers.serializers import CompiledEmployerListSerializer, EmployerListSerializer
+from jobs.models import Job
+from jobs.serializers import CompiledJobListSerializer, JobListSerializer
+
+# (label, queryset as the list views build it, DRF serializer, compiled serializer)
+BENCHMARKS = (
+    ('jobs', lambda: Job.objects.select_related('employer', 'category').order_by('-created_at'),
+     JobListSerializer, CompiledJobListSerializer),
+    ('applications', lambda: Application.objects.select_related('candidate__user', 'job__employer').order_by('-applied_at'),
+     ApplicationListSerializer, CompiledApplicationListSerializer),
+    ('candidates', lambda: Candidate.objects.order_by('-created_at'),
+     CandidateListSerializer, CompiledCandidateListSerializer),
+    ('employers', lambda: Employer.objects.order_by('-created_at'),
+     EmployerListSerializer, CompiledEmployerListSerializer),
+)
+
+class Command(BaseCommand):
+    help = 'Time the compiled list serializers against the DRF ones and check their JSON is identical'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Rows per page (default 100)')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per serializer; the best is reported')
+
+    def best_time(self, function, repeat):
+        best, result = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], max(1, options['repeat'])
+        context = {'request': RequestFactory().get('/')}
+        renderer = JSONRenderer()
+        mismatches = 0
+
+        for label, queryset, serializer_class, compiled_class in BENCHMARKS:
+            def drf():
+                page = list(queryset()[:rows])
+                return renderer.render(serializer_class(page, many=True, context=context).data)
+
+            def compiled():
+                serializer = compiled_class(context=context)
+                page = list(serializer.queryset(queryset())[:rows])
+                return renderer.render(serializer.serialize(page))
+
+            drf_time, drf_json = self.best_time(drf, repeat)
+            compiled_time, compiled_json = self.best_time(compiled, repeat)
+            identical = drf_json == compiled_json
+            mismatches += not identical
+            count = len(queryset()[:rows])
+            self.stdout.write(
+                f"{label}: {count} rows, DRF {drf_time * 1000:.2f} ms, compiled {compiled_time * 1000:.2f} ms "
+                f"({drf_time / compiled_time:.1f}x), output {'identical' if identical else 'DIFFERS'}"
+            )
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"{mismatches} compiled serializers differ from DRF"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All compiled serializers match DRF output"))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from jobs.facets import rebuild_facet_cells
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed job facet counts'
+    
+    def handle(self, *args, **options):
+        cells = rebuild_facet_cells()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {cells} facet cells"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from jobs.similarity import build_similarity_index
+
+class Command(BaseCommand):
+    help = 'Update the TF-IDF matrix behind the similar jobs endpoint'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rebuild from scratch instead of folding in changed jobs')
+    
+    def handle(self, *args, **options):
+        index = build_similarity_index(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index.job_ids)} jobs over {len(index.terms)} terms"
+        ))
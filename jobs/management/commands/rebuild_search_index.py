@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from jobs.search_backends import get_indexing_backends
+
+class Command(BaseCommand):
+    help = 'Rebuild the index of the configured job search backend and the postings table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        for backend in get_indexing_backends():
+            indexed = backend.rebuild(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Indexed {indexed} jobs with {backend.__class__.__name__}"
+            ))
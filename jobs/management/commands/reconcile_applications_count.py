@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from applications.models import Application
+from jobs.models import Job
+
+class Command(BaseCommand):
+    help = 'Rebuild Job.applications_count from the applications table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report jobs whose stored count has drifted without fixing them')
+    
+    def handle(self, *args, **options):
+        actual = Subquery(
+            Application.objects.filter(job=OuterRef('pk'))
+            .exclude(status__in=Application.UNCOUNTED_STATUSES)
+            .order_by()
+            .values('job')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        drifted = Job.objects.annotate(
+            actual_count=Coalesce(actual, Value(0))
+        ).exclude(applications_count=F('actual_count'))
+        
+        drifted_ids = list(drifted.values_list('id', flat=True))
+        if options['dry_run']:
+            self.stdout.write(f"{len(drifted_ids)} jobs have a drifted applications_count")
+            return
+        
+        updated = Job.objects.filter(id__in=drifted_ids).update(
+            applications_count=Coalesce(actual, Value(0))
+        )
+        self.stdout.write(self.style.SUCCESS(f"Corrected applications_count on {updated} jobs"))
@@ -0,0 +1,39 @@
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from jobs.models import ExchangeRate
+from jobs.salaries import refresh_base_salaries
+
+class Command(BaseCommand):
+    help = 'Store exchange rates (CUR=RATE pairs or a currency,rate CSV) and re-convert salaries in bulk'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('rates', nargs='*', help='Rates as CUR=RATE, e.g. EUR=1.08')
+        parser.add_argument('--file', help='CSV file with currency,rate columns')
+    
+    def handle(self, *args, **options):
+        pairs = [pair.split('=', 1) for pair in options['rates']]
+        if options['file']:
+            with open(options['file'], newline='') as handle:
+                pairs += [(row['currency'], row['rate']) for row in csv.DictReader(handle)]
+        if not pairs:
+            raise CommandError('No rates given.')
+        
+        try:
+            rates = {currency.strip().upper(): Decimal(rate) for currency, rate in pairs}
+        except (ValueError, InvalidOperation):
+            raise CommandError('Rates must be given as CUR=RATE with a numeric rate.')
+        
+        # bulk_create skips the per-rate signal, so salaries are refreshed once below
+        with transaction.atomic():
+            ExchangeRate.objects.bulk_create(
+                [ExchangeRate(currency=currency, rate=rate) for currency, rate in rates.items()],
+                update_conflicts=True,
+                unique_fields=['currency'],
+                update_fields=['rate', 'updated_at'],
+            )
+            updated = refresh_base_salaries(list(rates))
+        
+        self.stdout.write(self.style.SUCCESS(f"Stored {len(rates)} rates and re-converted {updated} jobs"))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('field', models.CharField(choices=[('title', 'Title'), ('description', 'Description'), ('requirements', 'Requirements'), ('company', 'Company'), ('category', 'Category')], max_length=20)),
+                ('frequency', models.PositiveIntegerField(default=1)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='jobs.job')),
+            ],
+            options={
+                'db_table': 'job_search_terms',
+                'indexes': [models.Index(fields=['term', 'job'], name='job_search__term_066bb6_idx')],
+                'unique_together': {('job', 'field', 'term')},
+            },
+        ),
+    ]
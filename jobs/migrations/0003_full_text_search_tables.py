@@ -0,0 +1,38 @@
+from django.db import migrations
+
+SQLITE_FORWARD = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, requirements, description, company, category, "
+    "tokenize = 'unicode61 remove_diacritics 2')",
+)
+SQLITE_REVERSE = ("DROP TABLE IF EXISTS jobs_fts",)
+
+POSTGRES_FORWARD = (
+    "CREATE TABLE IF NOT EXISTS job_search_vectors ("
+    "job_id bigint PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS job_search_vectors_document_idx "
+    "ON job_search_vectors USING GIN (document)",
+)
+POSTGRES_REVERSE = ("DROP TABLE IF EXISTS job_search_vectors",)
+
+def run_statements(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+def create_search_tables(apps, schema_editor):
+    run_statements(schema_editor, {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD})
+
+def drop_search_tables(apps, schema_editor):
+    run_statements(schema_editor, {'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_search_terms'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_tables, drop_search_tables),
+    ]
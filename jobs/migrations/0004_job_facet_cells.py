@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:22
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+CELL_DIMENSIONS = ('category_id', 'job_type', 'experience_level', 'location', 'is_remote', 'is_featured')
+
+
+def populate_facet_cells(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobFacetCell = apps.get_model('jobs', 'JobFacetCell')
+    rows = (Job.objects.filter(is_active=True).order_by()
+            .values(*CELL_DIMENSIONS).annotate(count=Count('id')))
+    JobFacetCell.objects.bulk_create([JobFacetCell(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_full_text_search_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFacetCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=20)),
+                ('experience_level', models.CharField(max_length=20)),
+                ('location', models.CharField(max_length=255)),
+                ('is_remote', models.BooleanField()),
+                ('is_featured', models.BooleanField()),
+                ('count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='facet_cells', to='jobs.jobcategory')),
+            ],
+            options={
+                'db_table': 'job_facet_cells',
+                'unique_together': {('category', 'job_type', 'experience_level', 'location', 'is_remote', 'is_featured')},
+            },
+        ),
+        migrations.RunPython(populate_facet_cells, migrations.RunPython.noop),
+    ]
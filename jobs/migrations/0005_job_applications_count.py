@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_applications_count(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('applications', 'Application')
+    counts = (Application.objects.filter(job=OuterRef('pk')).exclude(status='withdrawn')
+              .order_by().values('job').annotate(count=Count('id')).values('count'))
+    Job.objects.update(applications_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_facet_cells'),
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', '-applications_count'], name='jobs_is_acti_5e625e_idx'),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
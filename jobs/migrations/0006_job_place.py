@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:33
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+CELL_DIMENSIONS = ('category_id', 'job_type', 'experience_level', 'place_id', 'is_remote', 'is_featured')
+
+
+def clear_facet_cells(apps, schema_editor):
+    apps.get_model('jobs', 'JobFacetCell').objects.all().delete()
+
+
+def resolve_job_places(apps, schema_editor):
+    from locations.gazetteer import resolve_place
+    Job = apps.get_model('jobs', 'Job')
+    PlaceName = apps.get_model('locations', 'PlaceName')
+    for location in Job.objects.order_by().values_list('location', flat=True).distinct():
+        place = resolve_place(location, PlaceName.objects)
+        if place is not None:
+            Job.objects.filter(location=location).update(place=place.pk)
+
+
+def populate_facet_cells(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobFacetCell = apps.get_model('jobs', 'JobFacetCell')
+    rows = (Job.objects.filter(is_active=True).order_by()
+            .values(*CELL_DIMENSIONS).annotate(count=Count('id')))
+    JobFacetCell.objects.bulk_create([JobFacetCell(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_places'),
+        ('jobs', '0005_job_applications_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_facet_cells, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='jobfacetcell',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='place',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='locations.place'),
+        ),
+        migrations.RunPython(resolve_job_places, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='jobfacetcell',
+            name='place',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='facet_cells', to='locations.place'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobfacetcell',
+            unique_together={('category', 'job_type', 'experience_level', 'place', 'is_remote', 'is_featured')},
+        ),
+        migrations.RemoveField(
+            model_name='jobfacetcell',
+            name='location',
+        ),
+        migrations.RunPython(populate_facet_cells, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:35
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_base_salaries(apps, schema_editor):
+    # No rates exist yet, so only jobs posted in the base currency convert
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.filter(salary_currency__iexact=getattr(settings, 'BASE_SALARY_CURRENCY', 'USD')).update(
+        salary_min_base=F('salary_min'),
+        salary_max_base=F('salary_max'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_place'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, unique=True)),
+                ('rate', models.DecimalField(decimal_places=8, help_text='Base currency units per one unit of this currency', max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'exchange_rates',
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max_base',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min_base',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'salary_min_base'], name='jobs_is_acti_e86634_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'salary_max_base'], name='jobs_is_acti_21553c_idx'),
+        ),
+        migrations.RunPython(backfill_base_salaries, migrations.RunPython.noop),
+    ]
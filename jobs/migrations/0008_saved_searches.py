@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('locations', '0001_places'),
+        ('jobs', '0007_job_base_salaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('keyword', models.CharField(blank=True, max_length=255)),
+                ('categories', models.JSONField(blank=True, default=list, help_text='Category slugs, any of')),
+                ('job_types', models.JSONField(blank=True, default=list)),
+                ('experience_levels', models.JSONField(blank=True, default=list)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('radius_km', models.FloatField(blank=True, null=True)),
+                ('remote_only', models.BooleanField(default=False)),
+                ('featured_only', models.BooleanField(default=False)),
+                ('min_salary', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('max_salary', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('group_count', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('last_matched_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('place', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='saved_searches', to='locations.place')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'saved_searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.CharField(max_length=30)),
+                ('term', models.CharField(max_length=100)),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='jobs.savedsearch')),
+            ],
+            options={
+                'db_table': 'saved_search_terms',
+                'indexes': [models.Index(fields=['term', 'saved_search'], name='saved_searc_term_178f89_idx')],
+                'unique_together': {('saved_search', 'group', 'term')},
+            },
+        ),
+    ]
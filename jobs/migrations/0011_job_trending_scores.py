@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+import time
+
+
+def create_epoch(apps, schema_editor):
+    TrendingEpoch = apps.get_model('jobs', 'TrendingEpoch')
+    if not TrendingEpoch.objects.exists():
+        TrendingEpoch.objects.create(epoch=time.time())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_imports'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTrendingScore',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='jobs.job')),
+                ('score', models.FloatField(db_index=True, default=0.0)),
+            ],
+            options={
+                'db_table': 'job_trending_scores',
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epoch', models.FloatField()),
+            ],
+            options={
+                'db_table': 'job_trending_epoch',
+            },
+        ),
+        migrations.RunPython(create_epoch, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:37
+
+from django.db import migrations, models
+from django.db.models import Case, Count, F, Value, When
+
+CELL_DIMENSIONS = ('category_id', 'job_type', 'experience_level', 'place_id', 'is_remote', 'is_featured')
+
+
+def clear_facet_cells(apps, schema_editor):
+    apps.get_model('jobs', 'JobFacetCell').objects.all().delete()
+
+
+def populate_facet_cells(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobFacetCell = apps.get_model('jobs', 'JobFacetCell')
+    rows = (Job.objects.filter(is_active=True).order_by()
+            .annotate(cell_location=Case(When(place__isnull=True, then=F('location')), default=Value('')))
+            .values(*CELL_DIMENSIONS, 'cell_location').annotate(count=Count('id')))
+    JobFacetCell.objects.bulk_create([
+        JobFacetCell(location=row.pop('cell_location'), **row) for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_places'),
+        ('jobs', '0011_job_trending_scores'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_facet_cells, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='jobfacetcell',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='jobfacetcell',
+            name='location',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobfacetcell',
+            unique_together={('category', 'job_type', 'experience_level', 'place', 'location', 'is_remote', 'is_featured')},
+        ),
+        migrations.RunPython(populate_facet_cells, migrations.RunPython.noop),
+    ]
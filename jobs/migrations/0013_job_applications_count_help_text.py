@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_facet_cell_location'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, help_text='Applications to this job, not counting withdrawn ones'),
+        ),
+    ]
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from employers.models import Employer
+from locations.gazetteer import sync_place
+from locations.models import Place
+from .salaries import sync_base_salary
 
 class JobCategory(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -49,8 +53,14 @@ class Job(models.Model):
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_currency = models.CharField(max_length=3, default='USD')
+    # Salaries converted to BASE_SALARY_CURRENCY, kept in sync on save and
+    # refreshed in bulk when exchange rates change
+    salary_min_base = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    salary_max_base = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
     
     location = models.CharField(max_length=255)
+    # Gazetteer place resolved from location on save
+    place = models.ForeignKey(Place, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
     is_remote = models.BooleanField(default=False)
     
     application_deadline = models.DateField(null=True, blank=True)
@@ -59,6 +69,10 @@ class Job(models.Model):
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
     views_count = models.IntegerField(default=0)
+    # Non-withdrawn applications, maintained by Application save/delete
+    applications_count = models.PositiveIntegerField(
+        default=0, help_text='Applications to this job, not counting withdrawn ones'
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -71,11 +85,26 @@ class Job(models.Model):
             models.Index(fields=['slug']),
             models.Index(fields=['is_active', '-created_at']),
             models.Index(fields=['category', 'is_active']),
+            models.Index(fields=['is_active', '-applications_count']),
+            models.Index(fields=['is_active', 'salary_min_base']),
+            models.Index(fields=['is_active', 'salary_max_base']),
+            models.Index(fields=['is_active', 'application_deadline']),
         ]
     
     def __str__(self):
         return f"{self.title} at {self.employer.company_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'location' in field_names:
+            instance._resolved_location = instance.location
+        # Remember the stored facet dimensions so saves can adjust the facet table
+        from .facets import FACET_FIELDS, facet_key
+        if set(FACET_FIELDS) <= set(field_names):
+            instance._facet_key = facet_key(instance)
+        return instance
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             from django.utils.text import slugify
@@ -84,9 +113,13 @@ class Job(models.Model):
         
         if self.is_active and not self.published_at:
             self.published_at = timezone.now()
+            # Picked up after the save to match saved search alerts
+            self._newly_published = True
         elif not self.is_active:
             self.published_at = None
-            
+        
+        kwargs['update_fields'] = sync_place(self, kwargs.get('update_fields'))
+        kwargs['update_fields'] = sync_base_salary(self, kwargs.get('update_fields'))
         super().save(*args, **kwargs)
     
     @property
@@ -95,14 +128,202 @@ class Job(models.Model):
             return timezone.now().date() > self.application_deadline
         return False
     
-    # @property
-    # def applications_count(self):
-    #     return self.applications.count()
-    
     @property
     def salary_range(self):
         if self.salary_min and self.salary_max:
             return f"{self.salary_currency} {self.salary_min:,.2f} - {self.salary_max:,.2f}"
         elif self.salary_min:
             return f"From {self.salary_currency} {self.salary_min:,.2f}"
-        return "Not specified"
\ No newline at end of file
+        return "Not specified"
+
+class ExchangeRate(models.Model):
+    """
+    Conversion rate from a currency to BASE_SALARY_CURRENCY
+    """
+    currency = models.CharField(max_length=3, unique=True)
+    rate = models.DecimalField(max_digits=18, decimal_places=8,
+                               help_text="Base currency units per one unit of this currency")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'exchange_rates'
+        ordering = ['currency']
+    
+    def __str__(self):
+        return f"{self.currency}: {self.rate}"
+    
+    def save(self, *args, **kwargs):
+        self.currency = self.currency.upper()
+        super().save(*args, **kwargs)
+
+class JobSearchTerm(models.Model):
+    """
+    Inverted index posting: one row per (job, field, term)
+    """
+    FIELD_CHOICES = (
+        ('title', 'Title'),
+        ('description', 'Description'),
+        ('requirements', 'Requirements'),
+        ('company', 'Company'),
+        ('category', 'Category'),
+    )
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=64)
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    frequency = models.PositiveIntegerField(default=1)
+    
+    class Meta:
+        db_table = 'job_search_terms'
+        unique_together = ('job', 'field', 'term')
+        indexes = [
+            models.Index(fields=['term', 'job']),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} ({self.field}) -> {self.job_id}"
+
+
+class JobFacetCell(models.Model):
+    """
+    Precomputed count of active jobs per combination of facet dimensions
+    """
+    category = models.ForeignKey(JobCategory, on_delete=models.CASCADE, null=True, related_name='facet_cells')
+    job_type = models.CharField(max_length=20)
+    experience_level = models.CharField(max_length=20)
+    place = models.ForeignKey(Place, on_delete=models.CASCADE, null=True, related_name='facet_cells')
+    # Raw location text of jobs without a place, empty for resolved ones
+    location = models.CharField(max_length=255, blank=True, default='')
+    is_remote = models.BooleanField()
+    is_featured = models.BooleanField()
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'job_facet_cells'
+        unique_together = ('category', 'job_type', 'experience_level', 'place', 'location', 'is_remote', 'is_featured')
+    
+    def __str__(self):
+        return f"{self.category_id}/{self.job_type}/{self.place_id}: {self.count}"
+
+
+class JobTrendingScore(models.Model):
+    """
+    Exponentially decayed activity score of a job, stored relative to the
+    TrendingEpoch so events only ever add to it
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='trending_score')
+    score = models.FloatField(default=0.0, db_index=True)
+    
+    class Meta:
+        db_table = 'job_trending_scores'
+    
+    def __str__(self):
+        return f"{self.job_id}: {self.score}"
+
+class TrendingEpoch(models.Model):
+    """
+    Single row holding the unix time trending scores are expressed at
+    """
+    epoch = models.FloatField()
+    
+    class Meta:
+        db_table = 'job_trending_epoch'
+    
+    def __str__(self):
+        return str(self.epoch)
+
+def job_import_path(instance, filename):
+    return f'job_imports/{instance.employer.user.id}/{filename}'
+
+class JobImport(models.Model):
+    """
+    A bulk upload of jobs from a CSV or JSON Lines file with its per-row report
+    """
+    FORMAT_CHOICES = (
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    )
+    
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+    
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='job_imports')
+    file = models.FileField(upload_to=job_import_path, blank=True)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    # [{'row': line number, 'errors': {field: [messages]}}], capped at MAX_REPORTED_ERRORS
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'job_imports'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.employer.company_name} import {self.pk} ({self.status})"
+
+
+class SavedSearch(models.Model):
+    """
+    Job search criteria a user is alerted about when matching jobs are
+    published. Criteria are indexed as SavedSearchTerm rows.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    keyword = models.CharField(max_length=255, blank=True)
+    categories = models.JSONField(default=list, blank=True, help_text="Category slugs, any of")
+    job_types = models.JSONField(default=list, blank=True)
+    experience_levels = models.JSONField(default=list, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    place = models.ForeignKey(Place, on_delete=models.SET_NULL, null=True, blank=True, related_name='saved_searches')
+    radius_km = models.FloatField(null=True, blank=True)
+    remote_only = models.BooleanField(default=False)
+    featured_only = models.BooleanField(default=False)
+    # Salary bounds in BASE_SALARY_CURRENCY
+    min_salary = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    max_salary = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    # Number of criteria groups a job must satisfy, maintained by the indexer
+    group_count = models.PositiveSmallIntegerField(default=0, editable=False)
+    last_matched_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'saved_searches'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.user} - {self.name or self.keyword or self.pk}"
+    
+    def save(self, *args, **kwargs):
+        from .alerts import index_saved_search
+        super().save(*args, **kwargs)
+        index_saved_search(self)
+
+class SavedSearchTerm(models.Model):
+    """
+    Reverse index entry: a saved search is satisfied when, for each of its
+    groups, a published job has at least one of the group's terms
+    """
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='terms')
+    group = models.CharField(max_length=30)
+    term = models.CharField(max_length=100)
+    
+    class Meta:
+        db_table = 'saved_search_terms'
+        unique_together = ('saved_search', 'group', 'term')
+        indexes = [
+            models.Index(fields=['term', 'saved_search']),
+        ]
+    
+    def __str__(self):
+        return f"{self.group}:{self.term} -> {self.saved_search_id}"
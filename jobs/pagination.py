@@ -0,0 +1,241 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Sort keys supported by the job listing and search endpoints
+SORT_FIELDS = (
+    'created_at', 'published_at', 'salary_min', 'salary_max', 'title',
+    'application_deadline', 'views_count', 'applications_count',
+)
+
+# Sort keys backed by a different column: salaries sort in the base currency
+SORT_ALIASES = {
+    'salary_min': 'salary_min_base',
+    'salary_max': 'salary_max_base',
+}
+
+def sort_column(key):
+    """
+    Map a public sort key such as '-salary_min' to the column it orders by
+    """
+    prefix = '-' if key.startswith('-') else ''
+    field = key.lstrip('-')
+    return prefix + SORT_ALIASES.get(field, field)
+
+def include_count(request, default):
+    value = request.query_params.get('include_count')
+    if value is None:
+        return default
+    return value.lower() == 'true'
+
+class KnownCountPaginator(DjangoPaginator):
+    """
+    Django paginator that skips COUNT(*) when the total is already known
+    """
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+class JobPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination that can reuse a total computed elsewhere,
+    e.g. from the search aggregations
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    known_count = None
+
+    def django_paginator_class(self, object_list, per_page):
+        return KnownCountPaginator(object_list, per_page, count=self.known_count)
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        self.known_count = count
+        return super().paginate_queryset(queryset, request, view)
+
+class JobKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over any supported sort key with an id
+    tiebreak. Pages are fetched with an indexed range predicate instead of
+    OFFSET, and no COUNT(*) is issued unless include_count=true.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def __init__(self):
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 20)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_sort(self, queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if not ordering:
+            return 'created_at', True
+        if not isinstance(ordering[0], str):
+            raise ValidationError({'ordering': 'Cursor pagination does not support this ordering.'})
+        field = ordering[0]
+        descending = field.startswith('-')
+        field = field.lstrip('-')
+        if field not in SORT_FIELDS and field not in SORT_ALIASES.values():
+            raise ValidationError({'ordering': f"Cursor pagination does not support sorting by '{field}'."})
+        return field, descending
+
+    def is_nullable(self, queryset, field):
+        try:
+            return queryset.model._meta.get_field(field).null
+        except FieldDoesNotExist:
+            return False
+
+    def sort_key(self):
+        return f"{'-' if self.descending else ''}{self.field}"
+
+    def encode_cursor(self, value, pk, reverse):
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        payload = json.dumps({'s': self.sort_key(), 'v': value, 'id': pk, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """
+        (value, id, reverse) of the request's cursor, which must have been
+        issued for the current sort key
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            cursor = payload['v'], int(payload['id']), bool(payload.get('r'))
+            sort_key = payload['s']
+        except (ValueError, KeyError, TypeError):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        if sort_key != self.sort_key():
+            raise ValidationError({'cursor': 'Cursor was issued for a different ordering.'})
+        return cursor
+
+    def seek_filter(self, field, value, pk, ascending, nullable):
+        """
+        Rows strictly after (value, pk) when scanning in the given direction
+        with NULL sort values last
+        """
+        after = 'gt' if ascending else 'lt'
+        if value is None:
+            return Q(**{f'{field}__isnull': True, f'id__{after}': pk})
+        condition = Q(**{f'{field}__{after}': value}) | Q(**{field: value, f'id__{after}': pk})
+        if nullable:
+            condition |= Q(**{f'{field}__isnull': True})
+        return condition
+
+    def seek_filter_reverse(self, field, value, pk, ascending, nullable):
+        """
+        Rows strictly before (value, pk), used to build the previous page
+        """
+        before = 'lt' if ascending else 'gt'
+        if value is None:
+            return Q(**{f'{field}__isnull': False}) | Q(**{f'{field}__isnull': True, f'id__{before}': pk})
+        return Q(**{f'{field}__{before}': value}) | Q(**{field: value, f'id__{before}': pk})
+
+    def key_columns(self, queryset):
+        """
+        Columns position() reads, for querysets of values rows
+        """
+        return (self.get_sort(queryset)[0],)
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_sort(queryset)
+        ascending = not self.descending
+        nullable = self.is_nullable(queryset, self.field)
+        self.count = None
+        if include_count(request, default=False):
+            self.count = count if count is not None else queryset.count()
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+        if cursor:
+            value, pk, _ = cursor
+            seek = self.seek_filter_reverse if reverse else self.seek_filter
+            queryset = queryset.filter(seek(self.field, value, pk, ascending, nullable))
+
+        # Scanning backwards flips both the direction and the NULL placement
+        scan_ascending = ascending != reverse
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        sort = F(self.field).asc(**nulls) if scan_ascending else F(self.field).desc(**nulls)
+        queryset = queryset.order_by(sort, 'id' if scan_ascending else '-id')
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = bool(cursor) and (has_more if reverse else True)
+        self.results = results
+        return results
+
+    def position(self, obj):
+        return getattr(obj, self.field), obj.pk
+
+    def get_next_link(self):
+        if not self.has_next or not self.results:
+            return None
+        value, pk = self.position(self.results[-1])
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(value, pk, False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.results:
+            return None
+        value, pk = self.position(self.results[0])
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(value, pk, True))
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            response = {'count': self.count, **response}
+        return Response(response)
+
+def get_job_paginator(request):
+    """
+    Keyset pagination when the client asks for it (pagination=cursor or an
+    existing cursor), page numbers otherwise
+    """
+    if request.query_params.get('pagination') == 'cursor' or JobKeysetPagination.cursor_query_param in request.query_params:
+        return JobKeysetPagination()
+    return JobPageNumberPagination()
+
+class JobPaginationMixin:
+    """
+    Lets generic list views switch between page number and keyset pagination
+    """
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = get_job_paginator(self.request)
+        return self._paginator
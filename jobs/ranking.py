@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Value, When
+from django.utils import timezone
+
+from .search_backends import get_search_backend
+
+RELEVANCE_SORT = 'relevance'
+# Upper bounds (in days) of the published_at age buckets the recency boost
+# is evaluated on; older jobs get no boost
+RECENCY_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+def featured_boost():
+    """
+    Multiplier for featured jobs
+    """
+    boost = getattr(settings, 'JOB_SEARCH_FEATURED_BOOST', 0.5)
+    return Case(When(is_featured=True, then=Value(1.0 + boost)), default=Value(1.0), output_field=FloatField())
+
+def recency_boost(now=None):
+    """
+    Multiplier decaying with published_at age: 1 + boost * 0.5 ** (age / half_life),
+    stepped over age buckets so it stays a plain range comparison in SQL
+    """
+    boost = getattr(settings, 'JOB_SEARCH_RECENCY_BOOST', 0.5)
+    half_life = getattr(settings, 'JOB_SEARCH_RECENCY_HALF_LIFE_DAYS', 14)
+    now = now or timezone.now()
+    steps = []
+    lower = 0
+    for upper in RECENCY_BUCKETS:
+        age = (lower + upper) / 2
+        steps.append(When(published_at__gte=now - timedelta(days=upper),
+                          then=Value(1.0 + boost * 0.5 ** (age / half_life))))
+        lower = upper
+    return Case(*steps, default=Value(1.0), output_field=FloatField())
+
+def rank_by_relevance(queryset, query):
+    """
+    Order a queryset already narrowed to the query's matches by text score
+    times the featured and recency boosts. Ordering and LIMIT run in the
+    database, so only the requested page of rows is fetched.
+    """
+    queryset = get_search_backend().score_queryset(queryset, query)
+    return queryset.annotate(
+        relevance=F('text_score') * featured_boost() * recency_boost()
+    ).order_by('-relevance', '-id')
@@ -0,0 +1,88 @@
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Round
+from rest_framework.exceptions import ValidationError
+
+CENT = Decimal('0.01')
+# Job attributes the base-currency salary columns are derived from
+SALARY_FIELDS = ('salary_min', 'salary_max', 'salary_currency')
+BASE_SALARY_FIELDS = ('salary_min_base', 'salary_max_base')
+
+def base_currency():
+    return getattr(settings, 'BASE_SALARY_CURRENCY', 'USD')
+
+def get_rate(currency):
+    """
+    Base currency units per unit of currency, or None without a stored rate
+    """
+    currency = (currency or '').upper()
+    if currency == base_currency():
+        return Decimal(1)
+    from .models import ExchangeRate
+    return ExchangeRate.objects.filter(currency=currency).values_list('rate', flat=True).first()
+
+def to_base(amount, rate):
+    if amount is None or rate is None:
+        return None
+    return (Decimal(amount) * rate).quantize(CENT)
+
+def sync_base_salary(job, update_fields=None):
+    """
+    Recompute a job's base-currency salaries before it is saved. Returns
+    update_fields, extended with the base columns for partial saves.
+    """
+    if update_fields is not None and not set(update_fields) & set(SALARY_FIELDS):
+        return update_fields
+    rate = get_rate(job.salary_currency)
+    job.salary_min_base = to_base(job.salary_min, rate)
+    job.salary_max_base = to_base(job.salary_max, rate)
+    if update_fields is not None:
+        update_fields = {*update_fields, *BASE_SALARY_FIELDS}
+    return update_fields
+
+def refresh_base_salaries(currencies=None):
+    """
+    Recompute the base salaries of every job in the given currencies (all
+    when None) with one UPDATE per currency. Jobs in a currency without a
+    rate get NULL base salaries. Returns the number of jobs updated.
+    """
+    from .models import ExchangeRate, Job
+    from .search_cache import invalidate_search_cache
+
+    rates = dict(ExchangeRate.objects.values_list('currency', 'rate'))
+    rates[base_currency()] = Decimal(1)
+    if currencies is None:
+        currencies = Job.objects.order_by().values_list('salary_currency', flat=True).distinct()
+
+    updated = 0
+    for currency in {currency.upper() for currency in currencies}:
+        jobs = Job.objects.filter(salary_currency__iexact=currency)
+        rate = rates.get(currency)
+        if rate is None:
+            updated += jobs.update(salary_min_base=None, salary_max_base=None)
+        else:
+            updated += jobs.update(
+                salary_min_base=Round(F('salary_min') * Value(rate), 2),
+                salary_max_base=Round(F('salary_max') * Value(rate), 2),
+            )
+    if updated:
+        invalidate_search_cache()
+    return updated
+
+def base_salary_bound(value, currency=None):
+    """
+    Convert a salary filter bound given in currency (default: the base
+    currency) to the base currency
+    """
+    try:
+        amount = Decimal(value)
+    except (InvalidOperation, TypeError):
+        raise ValidationError({'salary': f"'{value}' is not a valid amount."})
+    if not currency:
+        return amount
+    rate = get_rate(currency)
+    if rate is None:
+        raise ValidationError({'currency': f"No exchange rate for '{currency}'."})
+    return to_base(amount, rate)
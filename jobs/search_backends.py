@@ -0,0 +1,296 @@
+import math
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils.module_loading import import_string
+
+from . import search_index
+from .search_index import MAX_QUERY_TERMS, get_job_documents, term_filter, tokenize
+
+# BM25 term frequency saturation used when scoring the postings table
+BM25_K1 = 1.2
+
+# Relevance weight of a match in each field (override with JOB_SEARCH_FIELD_WEIGHTS)
+DEFAULT_FIELD_WEIGHTS = {
+    'title': 4.0,
+    'requirements': 2.0,
+    'company': 2.0,
+    'description': 1.0,
+    'category': 0.5,
+}
+
+def query_terms(query):
+    """
+    Distinct query terms in order, capped at MAX_QUERY_TERMS
+    """
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+def field_weights():
+    return {**DEFAULT_FIELD_WEIGHTS, **getattr(settings, 'JOB_SEARCH_FIELD_WEIGHTS', {})}
+
+def job_id_column():
+    from .models import Job
+    return f"{connection.ops.quote_name(Job._meta.db_table)}.{connection.ops.quote_name('id')}"
+
+class BaseSearchBackend:
+    """
+    Interface shared by the job search implementations. A backend keeps its
+    own index in sync with Job rows and narrows Job querysets to matches.
+    """
+    def index_job(self, job):
+        raise NotImplementedError
+
+    def remove_job(self, job_id):
+        raise NotImplementedError
+
+    def rebuild(self, queryset=None, batch_size=500):
+        from .models import Job
+
+        if queryset is None:
+            queryset = Job.objects.all()
+        queryset = queryset.select_related('employer', 'category').order_by('pk')
+
+        indexed = 0
+        for job in queryset.iterator(chunk_size=batch_size):
+            self.index_job(job)
+            indexed += 1
+        return indexed
+
+    def filter_queryset(self, queryset, query):
+        raise NotImplementedError
+
+    def score_queryset(self, queryset, query):
+        """
+        Annotate text_score, a field-weighted relevance score, on a queryset
+        already narrowed with filter_queryset
+        """
+        raise NotImplementedError
+
+class InvertedIndexBackend(BaseSearchBackend):
+    """
+    Portable backend using the job_search_terms postings table
+    """
+    def index_job(self, job):
+        search_index.index_job(job)
+
+    def remove_job(self, job_id):
+        from .models import JobSearchTerm
+        JobSearchTerm.objects.filter(job_id=job_id).delete()
+
+    def rebuild(self, queryset=None, batch_size=500):
+        return search_index.rebuild_index(queryset, batch_size=batch_size)
+
+    def filter_queryset(self, queryset, query):
+        return search_index.search_jobs(queryset, query)
+
+    def score_queryset(self, queryset, query):
+        """
+        BM25 over the postings with per-field weights. Field lengths are not
+        stored, so term frequencies saturate without length normalization.
+        """
+        from .models import Job, JobSearchTerm
+
+        terms = query_terms(query)
+        if not terms:
+            return queryset.annotate(text_score=Value(0.0))
+
+        weighted_frequency = Sum(Case(
+            *[When(field=field, then=F('frequency') * Value(weight)) for field, weight in field_weights().items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        ))
+        total_jobs = Job.objects.count()
+        score = Value(0.0)
+        for position, term in enumerate(terms):
+            lookup = term_filter(term, prefix=position == len(terms) - 1)
+            matching_jobs = JobSearchTerm.objects.filter(**lookup).values('job_id').distinct().count()
+            idf = math.log(1 + (total_jobs - matching_jobs + 0.5) / (matching_jobs + 0.5))
+            frequency = Subquery(
+                JobSearchTerm.objects.filter(job_id=OuterRef('pk'), **lookup)
+                .order_by().values('job_id').annotate(tf=weighted_frequency).values('tf'),
+                output_field=FloatField(),
+            )
+            alias = f'_tf{position}'
+            queryset = queryset.alias(**{alias: Coalesce(frequency, Value(0.0))})
+            score = score + Value(idf * (BM25_K1 + 1)) * F(alias) / (F(alias) + Value(BM25_K1))
+        return queryset.annotate(text_score=score)
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    SQLite backend using the jobs_fts FTS5 virtual table (rowid = job id)
+    """
+    table = 'jobs_fts'
+    columns = ('title', 'requirements', 'description', 'company', 'category')
+
+    def index_job(self, job):
+        documents = get_job_documents(job)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [job.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, {', '.join(self.columns)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(self.columns))})",
+                [job.pk] + [documents[column] for column in self.columns]
+            )
+
+    def remove_job(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [job_id])
+
+    def match_expression(self, query):
+        terms = query_terms(query)
+        if not terms:
+            return ''
+        # Quote every term so FTS5 operators in user input are inert
+        phrases = ['"%s"' % term.replace('"', '') for term in terms]
+        phrases[-1] += '*'
+        return ' AND '.join(phrases)
+
+    def filter_queryset(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [expression]
+        ))
+
+    def score_queryset(self, queryset, query):
+        """
+        FTS5's built-in bm25() with a weight per column (it returns lower
+        values for better matches, hence the negation)
+        """
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset.annotate(text_score=Value(0.0))
+        weights = field_weights()
+        column_weights = ', '.join(repr(float(weights[column])) for column in self.columns)
+        return queryset.annotate(text_score=RawSQL(
+            f"SELECT -bm25({self.table}, {column_weights}) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s AND rowid = {job_id_column()}",
+            [expression], output_field=FloatField()
+        ))
+
+class PostgresFullTextBackend(BaseSearchBackend):
+    """
+    PostgreSQL backend using a weighted tsvector per job with a GIN index
+    """
+    table = 'job_search_vectors'
+    weights = (('title', 'A'), ('requirements', 'B'), ('description', 'C'),
+               ('company', 'B'), ('category', 'D'))
+
+    @property
+    def config(self):
+        return getattr(settings, 'JOB_SEARCH_PG_CONFIG', 'english')
+
+    def index_job(self, job):
+        documents = get_job_documents(job)
+        vector = ' || '.join(
+            f"setweight(to_tsvector(%s::regconfig, %s), '{weight}')" for _, weight in self.weights
+        )
+        params = []
+        for field, _ in self.weights:
+            params.extend([self.config, documents[field]])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table} (job_id, document) VALUES (%s, {vector}) "
+                f"ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document",
+                [job.pk] + params
+            )
+
+    def remove_job(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE job_id = %s", [job_id])
+
+    def tsquery(self, query):
+        terms = query_terms(query)
+        if not terms:
+            return ''
+        lexemes = ["'%s'" % term.replace("'", '') for term in terms]
+        lexemes[-1] += ':*'
+        return ' & '.join(lexemes)
+
+    def filter_queryset(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return queryset
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT job_id FROM {self.table} WHERE document @@ to_tsquery(%s::regconfig, %s)",
+            [self.config, tsquery]
+        ))
+
+    def rank_weights(self):
+        """
+        ts_rank weights array ({D, C, B, A}) from the per-field weights,
+        scaled so the heaviest label is 1
+        """
+        weights = field_weights()
+        labels = {}
+        for field, label in self.weights:
+            labels[label] = max(labels.get(label, 0.0), weights[field])
+        top = max(labels.values()) or 1.0
+        return [labels.get(label, 0.0) / top for label in 'DCBA']
+
+    def score_queryset(self, queryset, query):
+        """
+        PostgreSQL has no built-in BM25; ts_rank_cd with the label weights and
+        length normalization (flag 1) is the closest native equivalent
+        """
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return queryset.annotate(text_score=Value(0.0))
+        return queryset.annotate(text_score=RawSQL(
+            f"SELECT ts_rank_cd(%s::float4[], document, to_tsquery(%s::regconfig, %s), 1) "
+            f"FROM {self.table} WHERE job_id = {job_id_column()}",
+            [self.rank_weights(), self.config, tsquery], output_field=FloatField()
+        ))
+
+BACKENDS = {
+    'inverted': InvertedIndexBackend,
+    'sqlite_fts5': SQLiteFTS5Backend,
+    'postgres': PostgresFullTextBackend,
+}
+
+VENDOR_BACKENDS = {
+    'sqlite': 'sqlite_fts5',
+    'postgresql': 'postgres',
+}
+
+_backends = {}
+
+def get_search_backend():
+    """
+    Return the configured search backend. 'auto' picks the native full-text
+    implementation for the database vendor and falls back to the inverted index.
+    """
+    name = getattr(settings, 'JOB_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        name = VENDOR_BACKENDS.get(connection.vendor, 'inverted')
+
+    if name not in _backends:
+        backend_class = BACKENDS[name] if name in BACKENDS else import_string(name)
+        _backends[name] = backend_class()
+    return _backends[name]
+
+def get_indexing_backends():
+    """
+    Backends whose indexes follow Job rows: the configured one, plus the
+    job_search_terms postings when it is a native backend, so falling back
+    to or switching to the inverted index needs no rebuild
+    """
+    backend = get_search_backend()
+    if isinstance(backend, InvertedIndexBackend):
+        return [backend]
+    if 'inverted' not in _backends:
+        _backends['inverted'] = InvertedIndexBackend()
+    return [backend, _backends['inverted']]
+
+def reindex_jobs(queryset):
+    """
+    Index the jobs of a queryset in every indexing backend; returns the count
+    """
+    indexed = 0
+    for backend in get_indexing_backends():
+        indexed = backend.rebuild(queryset)
+    return indexed
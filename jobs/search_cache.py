@@ -0,0 +1,89 @@
+import copy
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'job_search:version'
+LOCK_TIMEOUT = 30
+WAIT_INTERVAL = 0.05
+WAIT_ATTEMPTS = 20
+
+def get_version():
+    cache.add(VERSION_KEY, 1, None)
+    return cache.get(VERSION_KEY) or 1
+
+def invalidate_search_cache():
+    """
+    Orphan every cached search by bumping the version baked into the keys
+    """
+    cache.add(VERSION_KEY, 1, None)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+def normalized_params(request):
+    """
+    Query parameters with blank values dropped and keys/values sorted, so
+    equivalent searches share a cache entry
+    """
+    params = []
+    for key, values in request.query_params.lists():
+        values = sorted(value.strip() for value in values if value.strip())
+        if values:
+            params.append((key, values))
+    return sorted(params)
+
+def cache_key(request):
+    # The absolute path is included because pagination links embed it
+    raw = repr((request.build_absolute_uri(request.path), normalized_params(request)))
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f'job_search:{get_version()}:{digest}'
+
+def load_jobs(ids):
+    from .models import Job
+
+    jobs = Job.objects.select_related('employer', 'category').in_bulk(ids)
+    return [jobs[job_id] for job_id in ids if job_id in jobs]
+
+def cached_search(request, compute):
+    """
+    Run compute() -> (jobs, data) through the result cache. Only the page's
+    job ids and the response metadata are cached; rows are reloaded by id.
+    Entries go stale after JOB_SEARCH_CACHE_TIMEOUT seconds: one request
+    rebuilds them while the others keep serving the stale copy.
+    """
+    timeout = getattr(settings, 'JOB_SEARCH_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return compute()
+
+    key = cache_key(request)
+    entry = cache.get(key)
+    if entry and entry['fresh_until'] > time.time():
+        return load_jobs(entry['ids']), copy.deepcopy(entry['data'])
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            jobs, data = compute()
+            cache.set(key, {
+                'ids': [job.pk for job in jobs],
+                'data': data,
+                'fresh_until': time.time() + timeout,
+            }, timeout + getattr(settings, 'JOB_SEARCH_CACHE_GRACE', 60))
+            return jobs, copy.deepcopy(data)
+        finally:
+            cache.delete(lock_key)
+
+    if entry:
+        return load_jobs(entry['ids']), copy.deepcopy(entry['data'])
+
+    # Another request is computing this search; wait briefly for its result
+    for _ in range(WAIT_ATTEMPTS):
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry:
+            return load_jobs(entry['ids']), copy.deepcopy(entry['data'])
+    return compute()
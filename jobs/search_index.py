@@ -0,0 +1,127 @@
+import re
+import unicodedata
+from collections import Counter
+
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 8
+
+# Job attributes whose changes require the postings to be rebuilt
+INDEXED_FIELDS = ('title', 'description', 'requirements', 'employer', 'category')
+
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'we', 'will',
+    'with', 'you', 'your',
+))
+
+TOKEN_RE = re.compile(r'[a-z0-9]+[+#]*')
+
+def normalize(text):
+    """
+    Lowercase and strip accents so 'Café' and 'cafe' share a term
+    """
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+def tokenize(text):
+    """
+    Split text into index terms, dropping stop words
+    """
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall(normalize(text))
+        if token not in STOP_WORDS
+    ]
+
+def get_job_documents(job):
+    """
+    Map each posting field to the text indexed for it
+    """
+    return {
+        'title': job.title,
+        'description': job.description,
+        'requirements': job.requirements,
+        'company': job.employer.company_name if job.employer_id else '',
+        'category': job.category.name if job.category_id else '',
+    }
+
+def build_postings(job):
+    """
+    Build unsaved JobSearchTerm rows for a job
+    """
+    from .models import JobSearchTerm
+
+    postings = []
+    for field, text in get_job_documents(job).items():
+        for term, frequency in Counter(tokenize(text)).items():
+            postings.append(JobSearchTerm(job_id=job.pk, field=field, term=term, frequency=frequency))
+    return postings
+
+def index_job(job):
+    """
+    Replace the postings of a single job
+    """
+    from .models import JobSearchTerm
+
+    JobSearchTerm.objects.filter(job_id=job.pk).delete()
+    JobSearchTerm.objects.bulk_create(build_postings(job), batch_size=500)
+
+def rebuild_index(queryset=None, batch_size=500):
+    """
+    Rebuild the postings for every job in the queryset
+    """
+    from .models import Job
+
+    if queryset is None:
+        queryset = Job.objects.all()
+    queryset = queryset.select_related('employer', 'category').order_by('pk')
+
+    indexed = 0
+    batch = []
+    for job in queryset.iterator(chunk_size=batch_size):
+        batch.append(job)
+        if len(batch) >= batch_size:
+            _reindex_batch(batch)
+            indexed += len(batch)
+            batch = []
+    if batch:
+        _reindex_batch(batch)
+        indexed += len(batch)
+
+    return indexed
+
+def _reindex_batch(jobs):
+    from .models import JobSearchTerm
+
+    JobSearchTerm.objects.filter(job_id__in=[job.pk for job in jobs]).delete()
+    postings = []
+    for job in jobs:
+        postings.extend(build_postings(job))
+    JobSearchTerm.objects.bulk_create(postings, batch_size=1000)
+
+def term_filter(term, prefix=False):
+    """
+    Lookup kwargs for a term. Prefix matches use a range so they stay
+    on the (term, job) index instead of a LIKE scan.
+    """
+    if prefix:
+        return {'term__gte': term, 'term__lt': term + '\uffff'}
+    return {'term': term}
+
+def search_jobs(queryset, query):
+    """
+    Restrict a Job queryset to jobs containing every term of the query.
+    The last term is matched as a prefix to support search-as-you-type.
+    """
+    from .models import JobSearchTerm
+
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return queryset
+
+    for position, term in enumerate(terms):
+        prefix = position == len(terms) - 1
+        matching = JobSearchTerm.objects.filter(**term_filter(term, prefix)).values('job_id')
+        queryset = queryset.filter(id__in=matching)
+
+    return queryset
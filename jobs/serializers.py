@@ -1,24 +1,33 @@
 from rest_framework import serializers
-from .models import Job, JobCategory
+from jobboard.compiled_serializers import CompiledListSerializer
+from jobboard.sparse_fields import SparseFieldsMixin
+from .models import Job, JobCategory, JobImport, SavedSearch
+from .salaries import base_salary_bound
 from employers.serializers import EmployerListSerializer
+from locations.gazetteer import resolve_place
+from locations.spatial import MAX_RADIUS_KM
 
 class JobCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = JobCategory
         fields = '__all__'
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     employer = EmployerListSerializer(read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     is_expired = serializers.BooleanField(read_only=True)
     applications_count = serializers.IntegerField(read_only=True)
     salary_range = serializers.CharField(read_only=True)
+    source_columns = {
+        'is_expired': ('application_deadline',),
+        'salary_range': ('salary_min', 'salary_max', 'salary_currency'),
+    }
     
     class Meta:
         model = Job
         fields = '__all__'
-        read_only_fields = ('employer', 'slug', 'views_count', 'published_at', 
-                            'created_at', 'updated_at')
+        read_only_fields = ('employer', 'slug', 'place', 'salary_min_base', 'salary_max_base',
+                            'views_count', 'applications_count', 'published_at', 'created_at', 'updated_at')
     
     def validate(self, attrs):
         if attrs.get('salary_min') and attrs.get('salary_max'):
@@ -40,9 +49,39 @@ class JobSerializer(serializers.ModelSerializer):
 class JobCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        exclude = ('employer', 'slug', 'views_count', 'published_at', 'created_at', 'updated_at')
+        exclude = ('employer', 'slug', 'place', 'salary_min_base', 'salary_max_base',
+                   'views_count', 'applications_count', 'published_at', 'created_at', 'updated_at')
 
-class JobListSerializer(serializers.ModelSerializer):
+class ImportCategoryField(serializers.Field):
+    """
+    Category given by slug or id, looked up in the 'categories' map of the
+    serializer context so rows do not query one by one
+    """
+    default_error_messages = {
+        'does_not_exist': 'Unknown category "{value}".',
+    }
+    
+    def to_internal_value(self, data):
+        category = self.context['categories'].get(str(data).strip())
+        if category is None:
+            self.fail('does_not_exist', value=data)
+        return category
+    
+    def to_representation(self, value):
+        return value.slug
+
+class JobImportRowSerializer(JobCreateUpdateSerializer):
+    category = ImportCategoryField(required=False, allow_null=True)
+    
+    class Meta(JobCreateUpdateSerializer.Meta):
+        pass
+
+class JobImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobImport
+        exclude = ('employer', 'file')
+
+class JobListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     employer_name = serializers.CharField(source='employer.company_name', read_only=True)
     employer_logo = serializers.ImageField(source='employer.logo', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -53,4 +92,59 @@ class JobListSerializer(serializers.ModelSerializer):
         fields = ('id', 'title', 'slug', 'employer_name', 'employer_logo', 'category_name',
                 'job_type', 'location', 'is_remote', 'salary_min', 'salary_max', 
                 'salary_currency', 'is_active', 'is_featured', 'applications_count',
-                'created_at', 'application_deadline')
\ No newline at end of file
+                'created_at', 'application_deadline')
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    job_types = serializers.ListField(
+        child=serializers.ChoiceField(choices=Job.JOB_TYPE_CHOICES), required=False
+    )
+    experience_levels = serializers.ListField(
+        child=serializers.ChoiceField(choices=Job.EXPERIENCE_LEVEL_CHOICES), required=False
+    )
+    categories = serializers.ListField(child=serializers.SlugField(), required=False)
+    radius_km = serializers.FloatField(required=False, allow_null=True, min_value=0, max_value=MAX_RADIUS_KM)
+    currency = serializers.CharField(write_only=True, required=False, allow_blank=True, max_length=3,
+                                     help_text="Currency of min_salary/max_salary (default: base currency)")
+    
+    class Meta:
+        model = SavedSearch
+        exclude = ('user', 'place')
+        read_only_fields = ('group_count', 'last_matched_at', 'created_at', 'updated_at')
+    
+    def validate(self, attrs):
+        currency = attrs.pop('currency', '').upper()
+        for field in ('min_salary', 'max_salary'):
+            if attrs.get(field) is not None and currency:
+                attrs[field] = base_salary_bound(attrs[field], currency)
+        if attrs.get('min_salary') and attrs.get('max_salary'):
+            if attrs['min_salary'] > attrs['max_salary']:
+                raise serializers.ValidationError({
+                    "salary": "Minimum salary cannot be greater than maximum salary."
+                })
+        
+        if 'location' in attrs:
+            # Locations outside the gazetteer match the job's location text
+            attrs['place'] = resolve_place(attrs['location']) if attrs['location'] else None
+        
+        criteria = {**self._current_criteria(), **attrs}
+        if not any(criteria.get(field) for field in (
+            'keyword', 'categories', 'job_types', 'experience_levels', 'location', 'remote_only', 'featured_only'
+        )):
+            raise serializers.ValidationError("A saved search needs at least one search criterion.")
+        return attrs
+    
+    def _current_criteria(self):
+        if self.instance is None:
+            return {}
+        return {
+            'keyword': self.instance.keyword,
+            'categories': self.instance.categories,
+            'job_types': self.instance.job_types,
+            'experience_levels': self.instance.experience_levels,
+            'location': self.instance.location,
+            'remote_only': self.instance.remote_only,
+            'featured_only': self.instance.featured_only,
+        }
+
+class CompiledJobListSerializer(CompiledListSerializer):
+    serializer_class = JobListSerializer
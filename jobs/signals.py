@@ -0,0 +1,129 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .autocomplete import autocomplete
+from .facets import FACET_FIELDS, FACET_UPDATE_FIELDS, adjust_facet_cells, facet_key
+from employers.models import Employer
+from .models import ExchangeRate, Job, JobCategory
+from .salaries import refresh_base_salaries
+from .search_backends import get_indexing_backends
+from .search_cache import invalidate_search_cache
+from .search_index import INDEXED_FIELDS
+from .trending import drop_trending_scores
+
+@receiver(post_save, sender=Job)
+def index_saved_job(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the search index in sync when indexed text changes
+    """
+    if update_fields is None or set(update_fields) & set(INDEXED_FIELDS):
+        for backend in get_indexing_backends():
+            backend.index_job(instance)
+
+@receiver(post_delete, sender=Job)
+def remove_deleted_job(sender, instance, **kwargs):
+    """
+    Drop deleted jobs (including cascaded deletes) from the search index
+    """
+    for backend in get_indexing_backends():
+        backend.remove_job(instance.pk)
+
+# Job search documents include these names (see search_index.get_job_documents)
+INDEXED_NAMES = {Employer: ('company_name', 'employer_id'), JobCategory: ('name', 'category_id')}
+
+@receiver(pre_save, sender=Employer)
+@receiver(pre_save, sender=JobCategory)
+def load_stored_indexed_name(sender, instance, **kwargs):
+    field = INDEXED_NAMES[sender][0]
+    instance._stored_indexed_name = (
+        None if instance._state.adding
+        else sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+    )
+
+@receiver(post_save, sender=Employer)
+@receiver(post_save, sender=JobCategory)
+def reindex_renamed_jobs(sender, instance, created=False, **kwargs):
+    """
+    Reindex the jobs of a renamed employer or category once it is committed
+    """
+    field, job_field = INDEXED_NAMES[sender]
+    stored = getattr(instance, '_stored_indexed_name', None)
+    if created or stored is None or stored == getattr(instance, field):
+        return
+    from .tasks import reindex_jobs
+    filters = {job_field: instance.pk}
+    transaction.on_commit(lambda: reindex_jobs.delay(**filters))
+
+@receiver(pre_save, sender=Job)
+def load_stored_facet_key(sender, instance, update_fields=None, **kwargs):
+    """
+    Fetch the stored facet dimensions for instances not loaded through from_db
+    """
+    if instance._state.adding or hasattr(instance, '_facet_key'):
+        return
+    stored = Job.objects.filter(pk=instance.pk).values(*FACET_FIELDS).first()
+    instance._facet_key = facet_key(Job(**stored)) if stored else None
+
+@receiver(post_save, sender=Job)
+def update_facet_cells(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Move the job between precomputed facet cells when its dimensions change
+    """
+    if update_fields is not None and not set(update_fields) & FACET_UPDATE_FIELDS:
+        return
+    old_key = None if created else instance._facet_key
+    new_key = facet_key(instance)
+    adjust_facet_cells(old_key, new_key)
+    instance._facet_key = new_key
+
+@receiver(post_delete, sender=Job)
+def remove_from_facet_cells(sender, instance, **kwargs):
+    adjust_facet_cells(getattr(instance, '_facet_key', facet_key(instance)), None)
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_cached_searches(sender, instance, **kwargs):
+    """
+    Bump the search cache version now and again on commit, so a search that
+    ran against the uncommitted state cannot stay cached
+    """
+    invalidate_search_cache()
+    transaction.on_commit(invalidate_search_cache)
+
+@receiver(post_save, sender=Job)
+def update_autocomplete(sender, instance, **kwargs):
+    autocomplete.job_changed(instance)
+
+@receiver(post_delete, sender=Job)
+def remove_from_autocomplete(sender, instance, **kwargs):
+    autocomplete.job_deleted(instance.pk)
+
+@receiver(post_save, sender=Job)
+def remove_from_trending(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Take deactivated jobs off the trending leaderboard
+    """
+    if created or instance.is_active or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    drop_trending_scores([instance.pk])
+
+@receiver(post_save, sender=Job)
+def queue_job_alerts(sender, instance, **kwargs):
+    """
+    Match saved searches against a newly published job once it is committed
+    """
+    if not getattr(instance, '_newly_published', False):
+        return
+    instance._newly_published = False
+    from .tasks import match_job_alerts
+    job_id = instance.pk
+    transaction.on_commit(lambda: match_job_alerts.delay(job_id))
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def refresh_salaries_for_rate(sender, instance, **kwargs):
+    """
+    Re-convert salaries posted in a currency whose rate changed
+    """
+    refresh_base_salaries([instance.currency])
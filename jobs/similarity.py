@@ -0,0 +1,291 @@
+import posixpath
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .search_index import tokenize
+
+# Title terms count this many times, so shared titles weigh more than shared boilerplate
+TITLE_WEIGHT = 3
+# Re-read jobs updated slightly before the watermark to absorb commit delays
+REFRESH_OVERLAP = timedelta(seconds=5)
+LOCK_KEY = 'job_similarity:lock'
+LOCK_TIMEOUT = 600
+# Snapshots kept in storage, so a process loading the previous one never
+# finds it deleted underneath
+KEPT_SNAPSHOTS = 2
+
+def index_name():
+    return getattr(settings, 'JOB_SIMILARITY_INDEX_NAME', 'indexes/job_similarity.npz')
+
+def snapshot_names(name=None):
+    """
+    Stored snapshots of the index, oldest first. Each build writes a new
+    file named after its time, as storages cannot replace a file atomically.
+    """
+    directory, filename = posixpath.split(name or index_name())
+    stem, suffix = posixpath.splitext(filename)
+    try:
+        files = default_storage.listdir(directory)[1]
+    except FileNotFoundError:
+        return []
+    return sorted(posixpath.join(directory, file) for file in files
+                  if file.startswith(f'{stem}-') and file.endswith(suffix))
+
+def job_term_counts(title, description, requirements):
+    counts = Counter(tokenize(description))
+    counts.update(tokenize(requirements))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+class SimilarityIndex:
+    """
+    Term counts of every active job as a CSR matrix (one row per job). The
+    stored counts are turned into L2-normalized TF-IDF weights on load, so
+    incremental updates never leave stale IDF values behind. Queries walk a
+    column-major copy of the weights: only jobs sharing a term with the
+    source job are touched.
+    """
+    def __init__(self, job_ids, terms, indptr, indices, counts, watermark=None):
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+        self.terms = list(terms)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.float32)
+        self.watermark = watermark
+        self._weights = None
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [0], [], [])
+
+    @classmethod
+    def from_rows(cls, rows, terms, watermark=None):
+        """
+        Build from (job_id, {term_index: count}) pairs
+        """
+        job_ids, indptr, indices, counts = [], [0], [], []
+        for job_id, row in rows:
+            if not row:
+                continue
+            job_ids.append(job_id)
+            columns = sorted(row)
+            indices.extend(columns)
+            counts.extend(row[column] for column in columns)
+            indptr.append(len(indices))
+        return cls(job_ids, terms, indptr, indices, counts, watermark)
+
+    @classmethod
+    def load(cls, name=None):
+        """
+        Read a stored snapshot, by default the latest one
+        """
+        if name is None:
+            names = snapshot_names()
+            if not names:
+                raise FileNotFoundError(index_name())
+            name = names[-1]
+        with default_storage.open(name, 'rb') as handle:
+            content = BytesIO(handle.read())
+        with np.load(content, allow_pickle=False) as data:
+            watermark = str(data['watermark'][0]) if len(data['watermark']) else None
+            return cls(data['job_ids'], data['terms'].tolist(), data['indptr'],
+                       data['indices'], data['counts'],
+                       datetime.fromisoformat(watermark) if watermark else None)
+
+    def save(self, name=None):
+        """
+        Store the matrix as a new snapshot in the default storage, shared by
+        the web processes and the Celery worker, and prune older ones
+        """
+        name = name or index_name()
+        content = BytesIO()
+        np.savez_compressed(
+            content,
+            job_ids=self.job_ids,
+            terms=np.array(self.terms, dtype=str),
+            indptr=self.indptr,
+            indices=self.indices,
+            counts=self.counts,
+            watermark=np.array([self.watermark.isoformat()] if self.watermark else [], dtype=str),
+        )
+        stem, suffix = posixpath.splitext(name)
+        saved = default_storage.save(f'{stem}-{timezone.now():%Y%m%d%H%M%S%f}{suffix}', ContentFile(content.getvalue()))
+        for old in snapshot_names(name)[:-KEPT_SNAPSHOTS]:
+            default_storage.delete(old)
+        return saved
+
+    def without_jobs(self, job_ids):
+        """
+        Copy of the index without the rows of job_ids, sliced at the CSR level
+        """
+        keep = ~np.isin(self.job_ids, np.fromiter(job_ids, dtype=np.int64))
+        lengths = np.diff(self.indptr)
+        kept_values = np.repeat(keep, lengths)
+        return SimilarityIndex(
+            self.job_ids[keep], self.terms,
+            np.concatenate(([0], np.cumsum(lengths[keep]))),
+            self.indices[kept_values], self.counts[kept_values], self.watermark,
+        )
+
+    def extended(self, other, terms, watermark=None):
+        """
+        Index with the rows of other, built over terms (a superset of this
+        index's terms), appended after this one's
+        """
+        return SimilarityIndex(
+            np.concatenate((self.job_ids, other.job_ids)), terms,
+            np.concatenate((self.indptr, other.indptr[1:] + self.indptr[-1])),
+            np.concatenate((self.indices, other.indices)),
+            np.concatenate((self.counts, other.counts)), watermark,
+        )
+
+    def rows(self):
+        """
+        Yield (job_id, {term_index: count}) for every row
+        """
+        for position, job_id in enumerate(self.job_ids.tolist()):
+            start, end = self.indptr[position], self.indptr[position + 1]
+            yield job_id, dict(zip(self.indices[start:end].tolist(), self.counts[start:end].tolist()))
+
+    def _build_weights(self):
+        rows = len(self.job_ids)
+        if not rows:
+            return None
+        row_of = np.repeat(np.arange(rows), np.diff(self.indptr))
+        document_frequency = np.bincount(self.indices, minlength=len(self.terms))
+        idf = np.log((1 + rows) / (1 + document_frequency)) + 1
+        weights = (1 + np.log(self.counts)) * idf[self.indices]
+        norms = np.sqrt(np.bincount(row_of, weights=weights ** 2, minlength=rows))
+        weights = (weights / norms[row_of]).astype(np.float32)
+
+        order = np.argsort(self.indices, kind='stable')
+        column_ptr = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(document_frequency, out=column_ptr[1:])
+        return {
+            'weights': weights,
+            'column_ptr': column_ptr,
+            'column_rows': row_of[order],
+            'column_weights': weights[order],
+            'positions': {job_id: position for position, job_id in enumerate(self.job_ids.tolist())},
+        }
+
+    @property
+    def weights(self):
+        if self._weights is None:
+            self._weights = self._build_weights()
+        return self._weights
+
+    def similar(self, job_id, limit=10):
+        """
+        (job_id, cosine similarity) of the jobs closest to job_id, best first
+        """
+        weights = self.weights
+        if weights is None or job_id not in weights['positions']:
+            return []
+        position = weights['positions'][job_id]
+        start, end = self.indptr[position], self.indptr[position + 1]
+
+        matched_rows, matched_weights = [], []
+        for column, weight in zip(self.indices[start:end], weights['weights'][start:end]):
+            column_start, column_end = weights['column_ptr'][column], weights['column_ptr'][column + 1]
+            matched_rows.append(weights['column_rows'][column_start:column_end])
+            matched_weights.append(weights['column_weights'][column_start:column_end] * weight)
+        scores = np.bincount(np.concatenate(matched_rows), weights=np.concatenate(matched_weights),
+                             minlength=len(self.job_ids))
+        scores[position] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(self.job_ids[row]), float(scores[row])) for row in candidates]
+
+def build_similarity_index(full=False, name=None):
+    """
+    Update the stored matrix from jobs changed since its watermark (or from
+    scratch when full or missing) and return the index. Rows of unchanged
+    jobs are carried over as arrays, so an update costs the changed jobs
+    plus one pass over the stored arrays. Inactive and deleted jobs are
+    dropped; a full build also prunes unused terms.
+    """
+    from .models import Job
+
+    index = None
+    if not full:
+        try:
+            index = SimilarityIndex.load()
+        except (OSError, KeyError, ValueError):
+            index = None
+
+    started_at = timezone.now()
+    fields = ('id', 'title', 'description', 'requirements')
+    active = Job.objects.filter(is_active=True)
+    if index is None or index.watermark is None:
+        index = SimilarityIndex.empty()
+        changed = active
+    else:
+        changed = active.filter(updated_at__gte=index.watermark - REFRESH_OVERLAP)
+
+    terms = list(index.terms)
+    term_index = {term: column for column, term in enumerate(terms)}
+    rows = []
+    for job_id, title, description, requirements in changed.values_list(*fields).iterator():
+        row = {}
+        for term, count in job_term_counts(title, description, requirements).items():
+            if term not in term_index:
+                term_index[term] = len(terms)
+                terms.append(term)
+            row[term_index[term]] = count
+        rows.append((job_id, row))
+
+    if len(index.job_ids):
+        active_ids = set(active.values_list('id', flat=True))
+        stale = {job_id for job_id in index.job_ids.tolist() if job_id not in active_ids}
+        index = index.without_jobs(stale | {job_id for job_id, _ in rows})
+    index = index.extended(SimilarityIndex.from_rows(sorted(rows), terms), terms, watermark=started_at)
+    index.save(name)
+    return index
+
+def refresh_similarity_index(full=False):
+    """
+    Build the index unless another worker is already doing it
+    """
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        return None
+    try:
+        return len(build_similarity_index(full=full).job_ids)
+    finally:
+        cache.delete(LOCK_KEY)
+
+_loaded = {'name': None, 'index': None, 'checked_at': None}
+_load_lock = threading.Lock()
+
+def get_similarity_index():
+    """
+    Process-wide copy of the latest stored snapshot, checked for a newer
+    one at most every JOB_SIMILARITY_RELOAD_INTERVAL seconds
+    """
+    interval = getattr(settings, 'JOB_SIMILARITY_RELOAD_INTERVAL', 60)
+    with _load_lock:
+        now = time.monotonic()
+        if _loaded['checked_at'] is None or now - _loaded['checked_at'] >= interval:
+            _loaded['checked_at'] = now
+            names = snapshot_names()
+            if names and names[-1] != _loaded['name']:
+                try:
+                    _loaded['index'] = SimilarityIndex.load(names[-1])
+                    _loaded['name'] = names[-1]
+                except (OSError, KeyError, ValueError):
+                    pass
+        return _loaded['index'] or SimilarityIndex.empty()
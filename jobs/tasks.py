@@ -0,0 +1,89 @@
+from celery import shared_task
+from .alerts import notify_saved_searches
+from .expiry import expire_jobs as expire_past_deadline
+from .facets import rebuild_facet_cells
+from .search_backends import reindex_jobs as reindex_job_queryset
+from .search_cache import invalidate_search_cache
+from .similarity import refresh_similarity_index
+from .trending import rebase_trending_scores
+from .view_counter import flush_job_views as flush_buffered_views
+
+@shared_task
+def rebuild_job_facets():
+    """
+    Recompute the facet table to correct drift from bulk updates and
+    category deletions, which bypass the per-job adjustments
+    """
+    return rebuild_facet_cells()
+
+@shared_task
+def reindex_jobs(**filters):
+    """
+    Reindex the jobs matching filters after text they index from another
+    row, such as the company or category name, changed
+    """
+    from .models import Job
+
+    indexed = reindex_job_queryset(Job.objects.filter(**filters))
+    invalidate_search_cache()
+    return indexed
+
+@shared_task
+def flush_job_views():
+    """
+    Write buffered job view counts to the database in batches
+    """
+    return flush_buffered_views()
+
+
+@shared_task
+def rebuild_job_similarity(full=False):
+    """
+    Fold jobs changed since the last run into the similar-jobs matrix
+    """
+    return refresh_similarity_index(full=full)
+
+
+@shared_task
+def match_job_alerts(job_id):
+    """
+    Notify users whose saved searches match a newly published job
+    """
+    from .models import Job
+
+    job = Job.objects.select_related('employer', 'category', 'place').filter(pk=job_id, is_active=True).first()
+    if job is None:
+        return 0
+    return notify_saved_searches(job)
+
+
+@shared_task
+def expire_jobs():
+    """
+    Deactivate jobs past their application deadline and notify employers
+    """
+    return expire_past_deadline()
+
+
+@shared_task
+def process_job_import(import_id):
+    """
+    Run a bulk job import uploaded for background processing
+    """
+    from .imports import run_import
+    from .models import JobImport
+
+    job_import = JobImport.objects.select_related('employer').filter(pk=import_id, status='pending').first()
+    if job_import is None:
+        return None
+    with job_import.file.open('rb') as stream:
+        run_import(job_import, stream)
+    return job_import.created_count
+
+
+@shared_task
+def rebase_trending_jobs():
+    """
+    Rescale trending scores to the current time and prune stale entries
+    """
+    return rebase_trending_scores()
@@ -1,15 +1,56 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import Length
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APIClient
 from rest_framework import status
 from employers.models import Employer
-from .models import Job, JobCategory
+from notifications.models import Notification
+from .alerts import matching_saved_searches, notify_saved_searches
+from .autocomplete import PrefixIndex, autocomplete, title_weight
+from .expiry import expire_jobs, open_jobs_filter
+from .facets import compute_facets, rebuild_facet_cells
+from .filters import location_filter
+from .models import ExchangeRate, Job, JobCategory, JobFacetCell, JobImport, JobTrendingScore, SavedSearch
+from .search_backends import get_indexing_backends
+from .pagination import JobKeysetPagination
+from .similarity import build_similarity_index, snapshot_names
+from .tasks import reindex_jobs
+from .trending import rebase_trending_scores, record_trending_events
+from .view_counter import dirty_jobs, flush_job_views
 
 User = get_user_model()
 
+def create_job(employer, category, title, **fields):
+    """
+    Active full-time job with placeholder text for the fields not given
+    """
+    fields = {
+        'description': 'Description',
+        'requirements': '',
+        'job_type': 'full-time',
+        'location': 'Berlin',
+        'is_active': True,
+        **fields,
+    }
+    return Job.objects.create(employer=employer, category=category, title=title, **fields)
+
 class JobTestCase(TestCase):
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
         
         # Create employer user
         self.employer_user = User.objects.create_user(
@@ -90,4 +131,791 @@ class JobTestCase(TestCase):
         )
         
         response = self.client.get('/api/jobs/search/?keyword=Python')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_advanced_search_uses_index(self):
+        """Test advanced search resolves keywords through the search index"""
+        Job.objects.create(
+            employer=self.employer,
+            title='Backend Engineer',
+            description='Build APIs',
+            requirements='Django and PostgreSQL',
+            category=self.category,
+            job_type='full-time',
+            location='Berlin',
+            is_active=True
+        )
+        Job.objects.create(
+            employer=self.employer,
+            title='Designer',
+            description='Design interfaces',
+            requirements='Figma',
+            category=self.category,
+            job_type='full-time',
+            location='Berlin',
+            is_active=True
+        )
+        
+        response = self.client.get('/api/jobs/advanced-search/?q=djang')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['title'] for job in response.data['results']], ['Backend Engineer'])
+        
+        response = self.client.get('/api/jobs/advanced-search/?q=test company design')
+        self.assertEqual([job['title'] for job in response.data['results']], ['Designer'])
+    
+    def test_search_backends(self):
+        """Test every SQLite-capable backend finds jobs by keyword and prefix"""
+        for backend_name in ('inverted', 'sqlite_fts5'):
+            with self.subTest(backend=backend_name), override_settings(JOB_SEARCH_BACKEND=backend_name):
+                job = Job.objects.create(
+                    employer=self.employer,
+                    title='Data Scientist',
+                    description='Machine learning models',
+                    requirements='Pandas',
+                    category=self.category,
+                    job_type='full-time',
+                    location='Paris',
+                    is_active=True
+                )
+                
+                response = self.client.get('/api/jobs/?search=machine learn')
+                self.assertEqual([j['id'] for j in response.data['results']], [job.id])
+                
+                response = self.client.get('/api/jobs/search/?keyword=pandas')
+                self.assertEqual([j['id'] for j in response.data['results']], [job.id])
+                
+                # Renaming the employer or category reindexes their jobs
+                self.employer.company_name = f'Quantum Widgets {backend_name}'
+                self.category.name = f'Analytics {backend_name}'
+                with mock.patch('jobs.tasks.reindex_jobs.delay', side_effect=reindex_jobs) as delay, \
+                        self.captureOnCommitCallbacks(execute=True):
+                    self.employer.save()
+                    self.category.save()
+                self.assertEqual(delay.call_count, 2)
+                for backend in get_indexing_backends():
+                    for keyword in ('quantum', 'analytics'):
+                        queryset = backend.filter_queryset(Job.objects.all(), keyword)
+                        self.assertEqual(list(queryset.values_list('id', flat=True)), [job.id])
+                
+                job.delete()
+                for backend in get_indexing_backends():
+                    self.assertFalse(backend.filter_queryset(Job.objects.all(), 'pandas').exists())
+    
+    def test_relevance_ranking(self):
+        """Test relevance sort ranks title matches first and applies featured and recency boosts"""
+        for backend_name in ('inverted', 'sqlite_fts5'):
+            with self.subTest(backend=backend_name), override_settings(JOB_SEARCH_BACKEND=backend_name):
+                jobs = [
+                    create_job(self.employer, self.category, title, description=description,
+                               requirements=requirements, is_featured=featured)
+                    for title, description, requirements, featured in (
+                        ('Office Manager', 'Occasional scripting in python for reports', 'Communication', False),
+                        ('Python Developer', 'Build web services', 'Communication', False),
+                        ('Data Analyst', 'Dashboards', 'Python and SQL', False),
+                        ('Support Engineer', 'Some python tooling', 'Communication', True),
+                        ('Backend Engineer', 'Services', 'Python', False),
+                    )
+                ]
+                Job.objects.filter(pk=jobs[4].pk).update(published_at=timezone.now() - timedelta(days=365))
+                
+                response = self.client.get('/api/jobs/search/?keyword=python&order_by=relevance')
+                ranked = [j['title'] for j in response.data['results']]
+                self.assertEqual(ranked[0], 'Python Developer')
+                # Featured beats an otherwise equal description match, fresh beats stale
+                self.assertLess(ranked.index('Support Engineer'), ranked.index('Office Manager'))
+                self.assertLess(ranked.index('Data Analyst'), ranked.index('Backend Engineer'))
+                
+                response = self.client.get('/api/jobs/advanced-search/?q=python&sort_by=relevance&page_size=2')
+                self.assertEqual([j['title'] for j in response.data['results']], ranked[:2])
+                self.assertEqual(response.data['count'], 5)
+                
+                response = self.client.get('/api/jobs/search/?keyword=python&order_by=relevance&pagination=cursor')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                
+                Job.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+    
+    def test_advanced_search_facets(self):
+        """Test facet table stays in sync and matches a direct aggregation"""
+        jobs = [
+            Job.objects.create(
+                employer=self.employer,
+                title=f'Job {i}',
+                description='Description',
+                requirements='Requirements',
+                category=self.category,
+                job_type='full-time' if i % 2 else 'contract',
+                location='London' if i < 3 else 'Leeds',
+                is_active=True
+            )
+            for i in range(5)
+        ]
+        jobs[0].location = 'Leeds'
+        jobs[0].save()
+        jobs[1].is_active = False
+        jobs[1].save()
+        jobs[2].delete()
+        
+        expected = compute_facets(Job.objects.filter(is_active=True))
+        self.assertEqual(expected['total_results'], 3)
+        
+        response = self.client.get('/api/jobs/advanced-search/')
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['aggregations'], expected)
+        
+        response = self.client.get('/api/jobs/advanced-search/?job_types[]=contract')
+        self.assertEqual(response.data['aggregations']['total_results'], 2)
+        self.assertEqual(response.data['aggregations']['locations'],
+                         [{'location': 'Leeds', 'count': 2}])
+        
+        cells = sorted(JobFacetCell.objects.filter(count__gt=0).values_list('place', 'job_type', 'count'))
+        rebuild_facet_cells()
+        self.assertEqual(sorted(JobFacetCell.objects.values_list('place', 'job_type', 'count')), cells)
+    
+    def test_location_radius_search(self):
+        """Test locations resolve to places and radius searches use them"""
+        for title, location in [('Paris Job', 'Paris, France'), ('Lyon Job', 'Lyon'),
+                                ('Parish Job', 'Parish'), ('Texas Job', 'Paris, TX')]:
+            Job.objects.create(
+                employer=self.employer,
+                title=title,
+                description='Description',
+                requirements='Requirements',
+                category=self.category,
+                job_type='full-time',
+                location=location,
+                is_active=True
+            )
+        self.assertIsNone(Job.objects.get(title='Parish Job').place)
+        self.assertEqual(Job.objects.get(title='Texas Job').place.admin1, 'TX')
+        
+        def titles(url):
+            return sorted(job['title'] for job in self.client.get(url).data['results'])
+        
+        self.assertEqual(titles('/api/jobs/?location=Paris'), ['Paris Job'])
+        self.assertEqual(titles('/api/jobs/search/?location=paris&radius_km=100'), ['Paris Job'])
+        self.assertEqual(titles('/api/jobs/search/?location=Paris&radius_km=450'), ['Lyon Job', 'Paris Job'])
+        self.assertEqual(titles('/api/jobs/?location=Parish'), ['Parish Job'])
+        
+        # Jobs whose location did not resolve still match the whole words of a known place
+        for title, location in [('NYC Job', 'New York, NY'), ('Area Job', 'Greater New York Area'),
+                                ('Metro Job', 'New York Metro'), ('Newark Job', 'Newyorker Plaza')]:
+            Job.objects.create(
+                employer=self.employer,
+                title=title,
+                description='Description',
+                requirements='Requirements',
+                category=self.category,
+                job_type='full-time',
+                location=location,
+                is_active=True
+            )
+        self.assertIsNone(Job.objects.get(title='Area Job').place)
+        self.assertEqual(titles('/api/jobs/?location=New York'), ['Area Job', 'Metro Job', 'NYC Job'])
+        response = self.client.get('/api/jobs/advanced-search/?locations[]=new york')
+        self.assertEqual(response.data['count'], 3)
+        # Unresolved jobs keep a bucket under their own text, counted from the facet cells
+        self.assertEqual(sorted((b['location'], b['count']) for b in response.data['aggregations']['locations']),
+                         [('Greater New York Area', 1), ('New York', 1), ('New York Metro', 1)])
+        self.assertEqual(response.data['aggregations'],
+                         compute_facets(Job.objects.filter(location_filter('new york')[0], is_active=True)))
+        response = self.client.get('/api/jobs/advanced-search/')
+        self.assertIn({'location': 'Parish', 'count': 1}, response.data['aggregations']['locations'])
+        
+        response = self.client.get('/api/jobs/advanced-search/?locations[]=Paris&locations[]=Texas&radius_km=450')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(sorted(bucket['location'] for bucket in response.data['aggregations']['locations']),
+                         ['Lyon', 'Paris'])
+    
+    def test_cursor_pagination(self):
+        """Test keyset pagination walks every sort key forwards and backwards without counts"""
+        salaries = [50000, None, 70000, 50000, None, 90000, 60000]
+        for i, salary in enumerate(salaries):
+            Job.objects.create(
+                employer=self.employer,
+                title=f'Job {i}',
+                description='Description',
+                requirements='Requirements',
+                category=self.category,
+                job_type='full-time',
+                location='Remote',
+                salary_min=salary,
+                is_active=True
+            )
+        
+        for url, expected in (
+            ('/api/jobs/?pagination=cursor&page_size=3&ordering=-salary_min',
+             Job.objects.order_by(F('salary_min').desc(nulls_last=True), '-id')),
+            ('/api/jobs/search/?pagination=cursor&page_size=3&order_by=salary_min',
+             Job.objects.order_by(F('salary_min').asc(nulls_last=True), 'id')),
+            ('/api/jobs/advanced-search/?pagination=cursor&page_size=3',
+             Job.objects.order_by('-created_at', '-id')),
+        ):
+            with self.subTest(url=url):
+                pages = []
+                response = self.client.get(url)
+                self.assertNotIn('count', response.data)
+                self.assertNotIn('aggregations', response.data)
+                while True:
+                    pages.append([job['id'] for job in response.data['results']])
+                    if not response.data['next']:
+                        break
+                    response = self.client.get(response.data['next'])
+                self.assertEqual(sum(pages, []), [job.id for job in expected])
+                
+                response = self.client.get(response.data['previous'])
+                self.assertEqual([job['id'] for job in response.data['results']], pages[-2])
+        
+        # A cursor only continues the ordering it was issued for
+        response = self.client.get('/api/jobs/?pagination=cursor&page_size=3&ordering=-salary_min')
+        cursor = response.data['next'].split('cursor=')[1].split('&')[0]
+        response = self.client.get(f'/api/jobs/?page_size=3&ordering=salary_min&cursor={cursor}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('cursor', response.data)
+        
+        # Orderings other than a supported sort key are rejected
+        paginator = JobKeysetPagination()
+        with self.assertRaises(ValidationError):
+            paginator.get_sort(Job.objects.order_by(Length('title').desc()))
+    
+    def test_job_views_write_behind(self):
+        """Test buffered job views cost no writes per request and converge on flush"""
+        job = Job.objects.create(
+            employer=self.employer,
+            title='Popular Job',
+            description='Description',
+            requirements='Requirements',
+            category=self.category,
+            job_type='full-time',
+            location='Remote',
+            is_active=True
+        )
+        
+        with override_settings(JOB_VIEWS_WRITE_BEHIND=True):
+            for expected in (1, 2, 3):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(f'/api/jobs/{job.slug}/')
+                self.assertFalse([q for q in queries if q['sql'].startswith('UPDATE')])
+                self.assertEqual(response.data['views_count'], expected)
+            
+            job.refresh_from_db()
+            self.assertEqual(job.views_count, 0)
+            self.assertEqual(flush_job_views(), 3)
+            job.refresh_from_db()
+            self.assertEqual(job.views_count, 3)
+            self.assertEqual(flush_job_views(), 0)
+        
+        # With Redis the dirty ids live in a set popped in batches
+        client = mock.Mock()
+        client.spop.side_effect = [[b'1', b'2'], [b'3'], []]
+        with mock.patch.object(dirty_jobs, 'client', return_value=client), mock.patch('jobs.view_counter.POP_BATCH', 2):
+            dirty_jobs.add([4])
+            self.assertEqual(dirty_jobs.pop_all(), {1, 2, 3})
+        client.sadd.assert_called_once_with(cache.make_key('job_views:dirty'), 4)
+        
+        self.client.get(f'/api/jobs/{job.slug}/')
+        job.refresh_from_db()
+        self.assertEqual(job.views_count, 4)
+
+    
+    @override_settings(JOB_SEARCH_CACHE_TIMEOUT=120)
+    def test_search_result_cache(self):
+        """Test identical searches are served from cache until a job changes"""
+        job = Job.objects.create(
+            employer=self.employer,
+            title='Remote Python Developer',
+            description='Description',
+            requirements='Python',
+            category=self.category,
+            job_type='full-time',
+            location='Remote',
+            is_active=True
+        )
+        
+        first = self.client.get('/api/jobs/advanced-search/?q=python&job_types[]=full-time')
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get('/api/jobs/advanced-search/?job_types[]=full-time&q=python&featured_only=')
+        self.assertEqual(first.data, second.data)
+        self.assertFalse([q for q in queries if 'job_facet_cells' in q['sql'] or 'COUNT' in q['sql']])
+        
+        response = self.client.post(f'/api/jobs/{job.slug}/toggle-active/')
+        self.assertFalse(response.data['is_active'])
+        response = self.client.get('/api/jobs/advanced-search/?q=python&job_types[]=full-time')
+        self.assertEqual(response.data['results'], [])
+    
+    def test_autocomplete(self):
+        """Test typeahead suggestions are ranked and follow job changes without queries"""
+        autocomplete.index = None
+        popular = Job.objects.create(
+            employer=self.employer,
+            title='Python Developer',
+            description='Description',
+            requirements='Requirements',
+            category=self.category,
+            job_type='full-time',
+            location='Paris',
+            views_count=500,
+            is_active=True
+        )
+        Job.objects.create(
+            employer=self.employer,
+            title='Pythonista Intern',
+            description='Description',
+            requirements='Requirements',
+            category=self.category,
+            job_type='internship',
+            location='Paris',
+            is_active=True
+        )
+        
+        # Requests never build the index themselves; a background rebuild is started
+        with mock.patch.object(autocomplete, 'start_rebuild') as start_rebuild:
+            self.assertEqual(autocomplete.suggest('pyth'), [])
+        start_rebuild.assert_called_once_with()
+        autocomplete.rebuild()
+        
+        response = self.client.get('/api/jobs/autocomplete/?q=pyth')
+        self.assertEqual([s['text'] for s in response.data['suggestions']],
+                         ['Python Developer', 'Pythonista Intern'])
+        
+        with self.assertNumQueries(0):
+            suggestions = autocomplete.suggest('dev')
+        self.assertEqual(suggestions[0]['text'], 'Python Developer')
+        
+        response = self.client.get('/api/jobs/autocomplete/?q=par&types=location')
+        self.assertEqual(response.data['suggestions'], [{'text': 'Paris', 'type': 'location', 'score': 2.0}])
+        
+        # Saves apply here at once; the version bump only schedules a background refresh
+        with mock.patch.object(autocomplete, 'start_refresh') as start_refresh:
+            popular.is_active = False
+            popular.save()
+            with self.assertNumQueries(0):
+                self.assertEqual([s['text'] for s in autocomplete.suggest('pyth')], ['Pythonista Intern'])
+        start_refresh.assert_called_once_with()
+        
+        # The refresh picks up count updates and deletions made by other processes
+        Job.objects.filter(title='Pythonista Intern').update(applications_count=3)
+        autocomplete.index.update_job(popular.pk + 1000, [('title', 'Ghost Job', 1.0)])
+        autocomplete.refresh()
+        self.assertEqual(autocomplete.index.suggest('pyth'),
+                         [{'text': 'Pythonista Intern', 'type': 'title', 'score': round(title_weight(0, 3), 3)}])
+        self.assertEqual(autocomplete.index.suggest('ghost'), [])
+    
+    def test_prefix_index_precomputes_wide_prefixes(self):
+        """Test precomputed wide prefixes stay consistent with a fresh build as jobs change"""
+        jobs = {job_id: [('title', f'Engineer {job_id}', 1.0 + job_id), ('location', 'Berlin', 1.0)]
+                for job_id in range(300)}
+        index = PrefixIndex.build(jobs.items())
+        self.assertIn('eng', index.top)
+        self.assertNotIn('engineer 1', index.top)
+        self.assertEqual(index.suggest('eng', limit=1)[0]['text'], 'Engineer 299')
+        
+        jobs[299] = []
+        jobs[5] = [('title', 'Engineer 5', 1000.0)]
+        jobs[300] = [('title', 'Engineering Lead', 500.0), ('location', 'Engels', 1.0)]
+        for job_id in (299, 5, 300):
+            index.update_job(job_id, jobs[job_id])
+        self.assertEqual([s['text'] for s in index.suggest('eng', limit=3)],
+                         ['Engineer 5', 'Engineering Lead', 'Engineer 298'])
+        self.assertEqual(index.suggest('299'), [])
+        
+        rebuilt = PrefixIndex.build(jobs.items())
+        for prefix in ('e', 'eng', 'engineer', 'engineer 2', 'ber'):
+            for kinds in (None, {'location'}):
+                self.assertEqual(index.suggest(prefix, limit=20, kinds=kinds),
+                                 rebuilt.suggest(prefix, limit=20, kinds=kinds))
+        self.assertEqual(index.suggest('e', limit=30), rebuilt.suggest('e', limit=30))
+    
+    def test_salary_filters_use_base_currency(self):
+        """Test salary filters and sorts compare salaries converted to the base currency"""
+        ExchangeRate.objects.create(currency='EUR', rate='1.10')
+        for title, salary_min, currency in [('Dollars', 60000, 'USD'), ('Euros', 58000, 'EUR'),
+                                            ('Pounds', 50000, 'GBP')]:
+            Job.objects.create(
+                employer=self.employer,
+                title=title,
+                description='Description',
+                requirements='Requirements',
+                category=self.category,
+                job_type='full-time',
+                location='London',
+                salary_min=salary_min,
+                salary_currency=currency,
+                is_active=True
+            )
+        
+        def titles(url):
+            return [job['title'] for job in self.client.get(url).data['results']]
+        
+        self.assertEqual(titles('/api/jobs/?ordering=-salary_min'), ['Euros', 'Dollars', 'Pounds'])
+        self.assertEqual(titles('/api/jobs/?salary_min=62000'), ['Euros'])
+        self.assertEqual(titles('/api/jobs/search/?min_salary=58000&currency=EUR'), ['Euros'])
+        response = self.client.get('/api/jobs/search/?min_salary=58000&currency=XXX')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        # Pounds convert once a rate exists; changed rates re-convert in bulk
+        ExchangeRate.objects.create(currency='GBP', rate='1.30')
+        rate = ExchangeRate.objects.get(currency='EUR')
+        rate.rate = '1.00'
+        rate.save()
+        self.assertEqual(titles('/api/jobs/search/?order_by=-salary_min'), ['Pounds', 'Dollars', 'Euros'])
+        self.assertEqual(Job.objects.get(title='Pounds').salary_min_base, 65000)
+        
+        call_command('update_exchange_rates', 'eur=1.2', 'GBP=1.25', stdout=StringIO())
+        self.assertEqual(Job.objects.get(title='Euros').salary_min_base, Decimal('69600'))
+        self.assertEqual(Job.objects.get(title='Pounds').salary_min_base, Decimal('62500'))
+    
+    def test_similar_jobs(self):
+        """Test similar jobs come from the stored TF-IDF matrix and follow incremental rebuilds"""
+        source, close, related, unrelated = (
+            create_job(self.employer, self.category, title, description=description)
+            for title, description in (
+                ('Python Developer', 'Build Django REST APIs'),
+                ('Senior Python Developer', 'Maintain Django services'),
+                ('Python Engineer', 'Data pipelines'),
+                ('Pastry Chef', 'Bake bread and croissants'),
+            )
+        )
+        
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(MEDIA_ROOT=directory, JOB_SIMILARITY_RELOAD_INTERVAL=0):
+            build_similarity_index()
+            response = self.client.get(f'/api/jobs/{source.slug}/similar/')
+            self.assertEqual([j['id'] for j in response.data['results']], [close.id, related.id])
+            self.assertGreater(response.data['results'][0]['similarity'], response.data['results'][1]['similarity'])
+            
+            related.is_active = False
+            related.save()
+            unrelated.description = 'Python scripting for Django kitchen inventory'
+            unrelated.save()
+            index = build_similarity_index()
+            self.assertNotIn(related.id, index.job_ids)
+            rebuilt = build_similarity_index(full=True)
+            def rows(index):
+                return sorted((job_id, {index.terms[column]: count for column, count in row.items()})
+                              for job_id, row in index.rows())
+            self.assertEqual(rows(index), rows(rebuilt))
+            self.assertEqual(len(snapshot_names()), 2)
+            
+            response = self.client.get(f'/api/jobs/{source.slug}/similar/?limit=5')
+            self.assertEqual([j['id'] for j in response.data['results']], [close.id, unrelated.id])
+    
+    def test_saved_search_alerts(self):
+        """Test publishing a job notifies users whose saved searches match it"""
+        candidate = User.objects.create_user(
+            email='candidate@test.com',
+            username='candidate',
+            password='testpass123',
+            user_type='candidate'
+        )
+        client = APIClient()
+        client.force_authenticate(candidate)
+        response = client.post('/api/jobs/saved-searches/', {
+            'name': 'Python near Berlin',
+            'keyword': 'python developer',
+            'job_types': ['full-time', 'contract'],
+            'location': 'Berlin',
+            'radius_km': 300,
+            'min_salary': 50000,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['group_count'], 4)
+        other = User.objects.create_user(email='other@test.com', username='other',
+                                         password='testpass123', user_type='candidate')
+        SavedSearch.objects.create(user=other, keyword='pastry chef')
+        
+        # Locations outside the gazetteer match the job's location words; the
+        # last keyword term matches as a prefix
+        diver = User.objects.create_user(email='diver@test.com', username='diver',
+                                         password='testpass123', user_type='candidate')
+        diver_client = APIClient()
+        diver_client.force_authenticate(diver)
+        response = diver_client.post('/api/jobs/saved-searches/', {'keyword': 'senior pyth', 'location': 'Atlantis'},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['group_count'], 3)
+        response = client.post('/api/jobs/saved-searches/', {'name': 'Everything'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        with mock.patch('jobs.tasks.match_job_alerts.delay') as delay, \
+                self.captureOnCommitCallbacks(execute=True):
+            job = Job.objects.create(
+                employer=self.employer,
+                title='Senior Python Developer',
+                description='Django services',
+                requirements='',
+                category=self.category,
+                job_type='full-time',
+                location='Hamburg, Germany',
+                salary_min=60000,
+                salary_max=80000,
+                salary_currency='USD',
+                is_active=True
+            )
+            job.save()
+        delay.assert_called_once_with(job.pk)
+        
+        self.assertEqual(notify_saved_searches(job), 1)
+        notification = Notification.objects.get(notification_type='job_alert')
+        self.assertEqual(notification.recipient, candidate)
+        station = Job.objects.create(employer=self.employer, title='Senior Python Engineer', description='Subsea',
+                                     requirements='', category=self.category, job_type='full-time',
+                                     location='Atlantis Station', is_active=True)
+        self.assertEqual(list(matching_saved_searches(station).values_list('user', flat=True)), [diver.pk])
+        self.assertEqual(notification.link, f'/jobs/{job.slug}')
+        # Re-matching the same job does not alert twice
+        self.assertEqual(notify_saved_searches(job), 0)
+        
+        job.salary_min = 40000
+        job.save()
+        self.assertEqual(notify_saved_searches(job), 0)
+        self.assertEqual(client.get('/api/jobs/saved-searches/').data['count'], 1)
+    
+    def test_expire_jobs(self):
+        """Test expired jobs drop out of listings and are deactivated in chunks with notifications"""
+        today = timezone.now().date()
+        create_job(self.employer, self.category, 'Open Role', description='Python job', application_deadline=today)
+        create_job(self.employer, self.category, 'Rolling Role', description='Python job')
+        expired = [
+            create_job(self.employer, self.category, f'Expired Role {i}', description='Python job',
+                       application_deadline=today - timedelta(days=i))
+            for i in range(1, 4)
+        ]
+        
+        response = self.client.get('/api/jobs/')
+        self.assertEqual({j['title'] for j in response.data['results']}, {'Open Role', 'Rolling Role'})
+        response = self.client.get('/api/jobs/search/?keyword=python')
+        self.assertEqual(response.data['count'], 2)
+        # Facet counts leave out lapsed jobs before the sweep deactivates them
+        response = self.client.get('/api/jobs/advanced-search/?job_types[]=full-time')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['aggregations'], compute_facets(Job.objects.filter(open_jobs_filter())))
+        self.assertEqual(self.client.get(f'/api/jobs/{expired[0].slug}/').status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f'/api/jobs/batch/?ids={expired[0].pk}')
+        self.assertEqual(response.data['not_found'], [expired[0].pk])
+        
+        self.assertEqual(expire_jobs(batch_size=2), 3)
+        self.assertFalse(Job.objects.filter(pk__in=[job.pk for job in expired], is_active=True).exists())
+        self.assertEqual(Notification.objects.filter(notification_type='job_expired',
+                                                     recipient=self.employer_user).count(), 3)
+        self.assertEqual(compute_facets(Job.objects.filter(is_active=True)),
+                         self.client.get('/api/jobs/advanced-search/').data['aggregations'])
+        self.assertEqual(expire_jobs(), 0)
+    
+    def test_bulk_import(self):
+        """Test bulk imports insert valid rows in bulk and report invalid ones per row"""
+        csv_file = SimpleUploadedFile('jobs.csv', (
+            'title,description,requirements,category,job_type,location,salary_min,salary_currency,is_remote\n'
+            'Python Developer,Build APIs,Django,software-development,full-time,Berlin,50000,USD,true\n'
+            'Data Engineer,Pipelines,SQL,software-development,contract,"Paris, France",,,\n'
+            'Broken Row,Missing type,,software-development,,Berlin,,,\n'
+            'Chef,Cook,Knives,unknown-category,full-time,Berlin,abc,,\n'
+        ).encode())
+        with mock.patch('jobs.tasks.match_job_alerts.delay') as delay, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/jobs/import/', {'file': csv_file}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['total_rows'], response.data['created_count'], response.data['error_count']),
+                         (4, 2, 2))
+        self.assertEqual([error['row'] for error in response.data['errors']], [4, 5])
+        self.assertIn('job_type', response.data['errors'][0]['errors'])
+        self.assertEqual(set(response.data['errors'][1]['errors']), {'category', 'salary_min'})
+        self.assertEqual(delay.call_count, 2)
+        
+        job = Job.objects.get(title='Python Developer')
+        self.assertEqual(job.employer, self.employer)
+        self.assertTrue(job.slug.startswith('python-developer-'))
+        self.assertEqual(job.place.name, 'Berlin')
+        self.assertEqual(job.salary_min_base, Decimal('50000'))
+        self.assertIsNotNone(job.published_at)
+        self.assertEqual(Job.objects.get(title='Data Engineer').place.country_code, 'FR')
+        response = self.client.get('/api/jobs/search/?keyword=pipelines')
+        self.assertEqual([j['title'] for j in response.data['results']], ['Data Engineer'])
+        self.assertEqual(compute_facets(Job.objects.filter(is_active=True)),
+                         self.client.get('/api/jobs/advanced-search/').data['aggregations'])
+        
+        jsonl_file = SimpleUploadedFile('jobs.jsonl', (
+            '{"title": "QA Engineer", "description": "Testing", "requirements": "Pytest", '
+            '"category": %d, "job_type": "part-time", "location": "Remote"}\n'
+            '\n'
+            'not json\n' % self.category.pk
+        ).encode())
+        from .tasks import process_job_import
+        with tempfile.TemporaryDirectory() as directory, override_settings(MEDIA_ROOT=directory):
+            with mock.patch('jobs.tasks.process_job_import.delay') as delay, \
+                    self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/api/jobs/import/', {'file': jsonl_file, 'async': 'true'},
+                                            format='multipart')
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            delay.assert_called_once_with(response.data['id'])
+            
+            with mock.patch('jobs.tasks.match_job_alerts.delay'):
+                self.assertEqual(process_job_import(response.data['id']), 1)
+        response = self.client.get(f"/api/jobs/import/{response.data['id']}/")
+        self.assertEqual((response.data['status'], response.data['error_count']), ('completed', 1))
+        self.assertEqual(response.data['errors'][0]['row'], 3)
+        
+        from django.db import OperationalError
+        from .imports import run_import
+        job_import = JobImport.objects.create(employer=self.employer, format='csv')
+        with mock.patch('jobs.imports.import_jobs', side_effect=OperationalError('database is locked')):
+            with self.assertRaises(OperationalError):
+                run_import(job_import, BytesIO(b''))
+        job_import.refresh_from_db()
+        self.assertEqual(job_import.status, 'failed')
+        self.assertEqual(job_import.errors[0]['errors'], {'import': ['database is locked']})
+
+    
+    @override_settings(JOB_TRENDING_HALF_LIFE_HOURS=24)
+    def test_trending_jobs(self):
+        """Test the trending leaderboard decays older activity and survives epoch rebases"""
+        old_hit, fresh, closed = (
+            create_job(self.employer, self.category, title) for title in ('Old Hit', 'Fresh', 'Closed')
+        )
+        now = timezone.now().timestamp()
+        # Two half-lives ago: 12 applications' worth of activity decays to 3
+        record_trending_events({old_hit.pk: 12.0}, at=now - 48 * 3600)
+        record_trending_events({fresh.pk: 2.0, closed.pk: 50.0})
+        # Unbuffered views count straight away, buffered ones when flushed
+        self.client.get(f'/api/jobs/{fresh.slug}/')
+        with override_settings(JOB_VIEWS_WRITE_BEHIND=True):
+            self.client.get(f'/api/jobs/{fresh.slug}/')
+            self.assertEqual(flush_job_views(), 1)
+        closed.is_active = False
+        closed.save()
+        self.assertFalse(JobTrendingScore.objects.filter(job=closed).exists())
+        # A lapsed job still scored is skipped without shortening the leaderboard
+        lapsed = create_job(self.employer, self.category, 'Lapsed',
+                            application_deadline=timezone.now().date() - timedelta(days=1))
+        record_trending_events({lapsed.pk: 100.0})
+        
+        response = self.client.get('/api/jobs/trending/?limit=2')
+        self.assertEqual([j['title'] for j in response.data['results']], ['Fresh', 'Old Hit'])
+        self.assertAlmostEqual(response.data['results'][0]['trending_score'], 4.0, places=2)
+        self.assertAlmostEqual(response.data['results'][1]['trending_score'], 3.0, places=2)
+        
+        expire_jobs()
+        self.assertFalse(JobTrendingScore.objects.filter(job=lapsed).exists())
+        self.assertEqual(rebase_trending_scores(now=now + 24 * 3600), 2)
+        record_trending_events({old_hit.pk: 0.25}, at=now + 24 * 3600)
+        response = self.client.get('/api/jobs/trending/?limit=1')
+        self.assertEqual([j['title'] for j in response.data['results']], ['Fresh'])
+    
+    def test_compiled_list_serializers(self):
+        """Test the compiled list serializers render the same JSON as the DRF ones"""
+        from applications.models import Application
+        from candidates.models import Candidate
+        
+        Employer.objects.filter(pk=self.employer.pk).update(logo='company_logos/1/logo.png')
+        candidate_user = User.objects.create_user(email='candidate@test.com', username='candidate',
+                                                  password='testpass123', user_type='candidate')
+        candidate = Candidate.objects.create(user=candidate_user, first_name='Ada', last_name='Lovelace')
+        for title, category in (('Python Developer', self.category), ('Uncategorized Role', None)):
+            job = Job.objects.create(
+                employer=self.employer,
+                title=title,
+                description='Description',
+                requirements='Requirements',
+                category=category,
+                job_type='full-time',
+                location='Berlin',
+                salary_min=Decimal('50000.5'),
+                is_active=True
+            )
+        Application.objects.create(job=job, candidate=candidate)
+        
+        out = StringIO()
+        call_command('benchmark_serializers', rows=10, repeat=1, stdout=out)
+        self.assertIn('All compiled serializers match DRF output', out.getvalue())
+        self.assertNotIn('DIFFERS', out.getvalue())
+        
+        response = self.client.get('/api/jobs/?pagination=cursor&page_size=1&ordering=salary_min')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertTrue(response.data['results'][0]['employer_logo'].endswith('/media/company_logos/1/logo.png'))
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertNotIn('category_name', response.data['results'][0])
+    
+    def test_sparse_fieldsets(self):
+        """Test ?fields= and ?exclude= narrow both the response and the SELECT"""
+        job = Job.objects.create(
+            employer=self.employer,
+            title='Python Developer',
+            description='A very long description',
+            requirements='Requirements',
+            category=self.category,
+            job_type='full-time',
+            location='Berlin',
+            is_active=True
+        )
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/?fields=id,title')
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title'])
+        listing = [query['sql'] for query in queries if query['sql'].startswith('SELECT "jobs"."id"')]
+        self.assertEqual(len(listing), 1)
+        self.assertNotIn('"description"', listing[0])
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/jobs/{job.slug}/?exclude=description,requirements')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('description', response.data)
+        self.assertIn('salary_range', response.data)
+        self.assertEqual(response.data['views_count'], 1)
+        self.assertFalse(any('"jobs"."description"' in query['sql'] for query in queries))
+        
+        response = self.client.get(f'/api/jobs/{job.slug}/?fields=title,unknown')
+        self.assertEqual(response.data, {'title': 'Python Developer'})
+        
+        response = self.client.get('/api/jobs/search/?keyword=python&fields=slug')
+        self.assertEqual(response.data['results'], [{'slug': job.slug}])
+    
+    def test_job_batch(self):
+        """Test the batch endpoint returns jobs in request order and reports misses"""
+        jobs = [
+            Job.objects.create(
+                employer=self.employer,
+                title=f'Developer {number}',
+                description='Description',
+                requirements='Requirements',
+                category=self.category,
+                job_type='full-time',
+                location='Remote',
+                is_active=number != 1
+            )
+            for number in range(3)
+        ]
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f'/api/jobs/batch/?ids={jobs[2].id},{jobs[1].id},999,{jobs[2].id}&slugs={jobs[0].slug},missing-job'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['id'] for job in response.data['results']], [jobs[2].id, jobs[0].id])
+        self.assertEqual(response.data['not_found'], [jobs[1].id, 999, 'missing-job'])
+        # The jobs themselves plus one grouped count for their employers
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(response.data['results'][0]['employer']['total_jobs'], 3)
+        self.assertEqual(response.data['results'][0]['employer']['active_jobs'], 2)
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/jobs/batch/?ids={jobs[0].id},{jobs[2].id}&fields=title')
+        self.assertEqual(response.data['results'], [{'title': 'Developer 0'}, {'title': 'Developer 2'}])
+        # No per-row slug fetches, and no employer counts when employer is not selected
+        self.assertEqual(len(queries), 2)
+        
+        response = self.client.get('/api/jobs/batch/?ids=1,abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_shared_cache_checks(self):
+        """Test the system checks flag cache features that need a shared backend"""
+        from .checks import check_shared_cache
+        self.assertEqual(check_shared_cache(None), [])
+        with override_settings(JOB_SEARCH_CACHE_TIMEOUT=120, JOB_VIEWS_WRITE_BEHIND=True):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['jobs.W001', 'jobs.W002'])
+        with override_settings(JOB_SEARCH_CACHE_TIMEOUT=120, JOB_VIEWS_WRITE_BEHIND=True, CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:6379/1'}}):
+            self.assertEqual(check_shared_cache(None), [])
+        # Write-behind needs Redis sets, not just any shared cache
+        with override_settings(JOB_VIEWS_WRITE_BEHIND=True, CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache', 'LOCATION': 'localhost:11211'}}):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['jobs.W002'])
@@ -0,0 +1,113 @@
+import math
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Subquery, Value, When
+from django.db.models.functions import Exp
+
+# Activity weights: an application signals far more interest than a view
+VIEW_WEIGHT = 1.0
+APPLICATION_WEIGHT = 10.0
+# Scores decayed below this are dropped when the epoch is rebased
+MIN_SCORE = 0.01
+# Leaderboard entries read per query, as a multiple of the requested limit
+WINDOW_FACTOR = 2
+
+def decay_rate():
+    """
+    Decay per second for JOB_TRENDING_HALF_LIFE_HOURS
+    """
+    half_life_hours = getattr(settings, 'JOB_TRENDING_HALF_LIFE_HOURS', 24)
+    return math.log(2) / (half_life_hours * 3600)
+
+def current_epoch():
+    from .models import TrendingEpoch
+    return TrendingEpoch.objects.values_list('epoch', flat=True).first()
+
+def record_trending_events(weights, at=None):
+    """
+    Add {job_id: weight} of activity at time `at` (default now). Forward
+    decay: instead of shrinking every score as time passes, a new event is
+    worth weight * e^(rate * (at - epoch)), so older events weigh
+    relatively less without any row being rewritten.
+    """
+    from .models import JobTrendingScore, TrendingEpoch
+
+    weights = {job_id: weight for job_id, weight in weights.items() if weight}
+    if not weights:
+        return
+    at = time.time() if at is None else at
+    # Read the epoch in the UPDATE itself so a concurrent rebase cannot mix scales
+    epoch = Subquery(TrendingEpoch.objects.values('epoch')[:1], output_field=FloatField())
+    growth = Exp(Value(decay_rate()) * (Value(float(at)) - epoch))
+    if len(weights) == 1:
+        delta = Value(float(next(iter(weights.values()))))
+    else:
+        delta = Case(
+            *[When(job_id=job_id, then=Value(float(weight))) for job_id, weight in weights.items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    with transaction.atomic():
+        JobTrendingScore.objects.bulk_create(
+            [JobTrendingScore(job_id=job_id) for job_id in weights], ignore_conflicts=True
+        )
+        JobTrendingScore.objects.filter(job_id__in=list(weights)).update(score=F('score') + delta * growth)
+
+def drop_trending_scores(job_ids):
+    """
+    Remove closed jobs from the leaderboard so reading it never has to skip them
+    """
+    from .models import JobTrendingScore
+    JobTrendingScore.objects.filter(job_id__in=list(job_ids)).delete()
+
+def rebase_trending_scores(now=None):
+    """
+    Move the epoch to now, scaling every score down to match, before the
+    growth factor gets large enough to lose precision. Jobs that are no
+    longer active or whose score has decayed away are dropped.
+    """
+    from .models import JobTrendingScore, TrendingEpoch
+
+    now = time.time() if now is None else now
+    with transaction.atomic():
+        clock = TrendingEpoch.objects.select_for_update().first()
+        if clock is None:
+            TrendingEpoch.objects.create(epoch=now)
+            return 0
+        factor = math.exp(-decay_rate() * (now - clock.epoch))
+        JobTrendingScore.objects.update(score=F('score') * Value(factor))
+        JobTrendingScore.objects.filter(score__lt=MIN_SCORE).delete()
+        JobTrendingScore.objects.filter(job__is_active=False).delete()
+        clock.epoch = now
+        clock.save(update_fields=['epoch'])
+    return JobTrendingScore.objects.count()
+
+def trending_jobs(queryset, limit=10, now=None):
+    """
+    (job, score decayed to now) for the top jobs of a Job queryset. The
+    leaderboard is walked down its score index in windows, and jobs of each
+    window outside the queryset are skipped. Deactivated and expired jobs
+    are dropped from it, so the cost depends on the limit rather than on
+    the number of scored jobs.
+    """
+    from .models import JobTrendingScore
+
+    epoch = current_epoch()
+    if epoch is None:
+        return []
+    now = time.time() if now is None else now
+    scale = math.exp(-decay_rate() * (now - epoch))
+    leaderboard = JobTrendingScore.objects.filter(score__gt=0).order_by('-score').values_list('job_id', 'score')
+    queryset = queryset.select_related('employer', 'category')
+    size = limit * WINDOW_FACTOR
+    top, offset = [], 0
+    while len(top) < limit:
+        window = list(leaderboard[offset:offset + size])
+        jobs = queryset.in_bulk([job_id for job_id, _ in window])
+        top.extend((jobs[job_id], score * scale) for job_id, score in window if job_id in jobs)
+        if len(window) < size:
+            break
+        offset += size
+    return top[:limit]
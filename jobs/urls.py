@@ -4,21 +4,37 @@ from .views import (
     JobCategoryListView,
     JobListView,
     JobDetailView,
+    JobBatchView,
     JobCreateView,
     JobUpdateView,
     JobDeleteView,
     JobToggleActiveView,
-    JobSearchView
+    JobSearchView,
+    JobAutocompleteView,
+    SimilarJobsView,
+    SavedSearchListCreateView,
+    SavedSearchDetailView,
+    JobImportView,
+    JobImportDetailView,
+    TrendingJobsView
 )
 
 urlpatterns = [
     path('', JobListView.as_view(), name='job-list'),
     path('categories/', JobCategoryListView.as_view(), name='job-categories'),
     path('search/', JobSearchView.as_view(), name='job-search'),
+    path('batch/', JobBatchView.as_view(), name='job-batch'),
+    path('trending/', TrendingJobsView.as_view(), name='job-trending'),
+    path('autocomplete/', JobAutocompleteView.as_view(), name='job-autocomplete'),
     path('create/', JobCreateView.as_view(), name='job-create'),
+    path('import/', JobImportView.as_view(), name='job-import'),
+    path('import/<int:pk>/', JobImportDetailView.as_view(), name='job-import-detail'),
+    path('advanced-search/', AdvancedJobSearchView.as_view(), name='advanced-job-search'),
+    path('saved-searches/', SavedSearchListCreateView.as_view(), name='saved-search-list'),
+    path('saved-searches/<int:pk>/', SavedSearchDetailView.as_view(), name='saved-search-detail'),
     path('<slug:slug>/', JobDetailView.as_view(), name='job-detail'),
+    path('<slug:slug>/similar/', SimilarJobsView.as_view(), name='job-similar'),
     path('<slug:slug>/update/', JobUpdateView.as_view(), name='job-update'),
     path('<slug:slug>/delete/', JobDeleteView.as_view(), name='job-delete'),
     path('<slug:slug>/toggle-active/', JobToggleActiveView.as_view(), name='job-toggle-active'),
-    path('advanced-search/', AdvancedJobSearchView.as_view(), name='advanced-job-search'),
 ]
\ No newline at end of file
@@ -0,0 +1,134 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, Value, When
+
+COUNTER_KEY = 'job_views:{}'
+DIRTY_KEY = 'job_views:dirty'
+REDIS_CACHE_BACKEND = 'django.core.cache.backends.redis.RedisCache'
+# Dirty job ids popped from the set per round trip
+POP_BATCH = 1000
+
+def write_behind_enabled():
+    return getattr(settings, 'JOB_VIEWS_WRITE_BEHIND', False)
+
+class DirtySet:
+    """
+    Ids of jobs with buffered views. With the Redis cache backend this is a
+    Redis set, so every process adds and pops atomically without locking;
+    other backends get a set local to the process, which is only shared
+    when the cache is too (LocMemCache).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = set()
+
+    def client(self):
+        if settings.CACHES['default']['BACKEND'] != REDIS_CACHE_BACKEND:
+            return None
+        return cache._cache.get_client(DIRTY_KEY, write=True)
+
+    def add(self, job_ids):
+        client = self.client()
+        if client is not None:
+            client.sadd(cache.make_key(DIRTY_KEY), *job_ids)
+            return
+        with self.lock:
+            self.local.update(job_ids)
+
+    def pop_all(self):
+        client = self.client()
+        if client is None:
+            with self.lock:
+                job_ids, self.local = self.local, set()
+            return job_ids
+        job_ids, key = set(), cache.make_key(DIRTY_KEY)
+        while True:
+            popped = client.spop(key, POP_BATCH)
+            job_ids.update(int(job_id) for job_id in popped or ())
+            if not popped or len(popped) < POP_BATCH:
+                return job_ids
+
+dirty_jobs = DirtySet()
+
+def increment_views(job_id, count=1):
+    """
+    Apply view increments and their trending activity directly, for when
+    views are not buffered
+    """
+    write_increments({job_id: count})
+
+def record_job_view(job_id):
+    """
+    Count one view of a job. Returns how many views are not yet reflected
+    in the caller's copy of the row, so the response can include them.
+    """
+    if not write_behind_enabled():
+        increment_views(job_id)
+        return 1
+
+    key = COUNTER_KEY.format(job_id)
+    cache.add(key, 0, None)
+    pending = cache.incr(key)
+    if pending == 1:
+        dirty_jobs.add([job_id])
+    return pending
+
+def pending_views(job_id):
+    if not write_behind_enabled():
+        return 0
+    return cache.get(COUNTER_KEY.format(job_id)) or 0
+
+def flush_job_views(batch_size=500):
+    """
+    Move buffered view counts into Job.views_count, one UPDATE per batch.
+    Returns the number of views written.
+    """
+    dirty = dirty_jobs.pop_all()
+    if not dirty:
+        return 0
+
+    keys = {COUNTER_KEY.format(job_id): job_id for job_id in dirty}
+    increments = {}
+    still_dirty = []
+    for key, count in cache.get_many(list(keys)).items():
+        if not count:
+            continue
+        # Subtract only what we read so views recorded meanwhile are kept
+        if cache.decr(key, count) > 0:
+            still_dirty.append(keys[key])
+        increments[keys[key]] = count
+    if still_dirty:
+        dirty_jobs.add(still_dirty)
+
+    job_ids = list(increments)
+    written = 0
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        try:
+            write_increments({job_id: increments[job_id] for job_id in batch})
+        except Exception:
+            # Put unwritten counts back so the next flush retries them
+            for job_id in job_ids[start:]:
+                cache.incr(COUNTER_KEY.format(job_id), increments[job_id])
+            dirty_jobs.add(job_ids[start:])
+            raise
+        written += sum(increments[job_id] for job_id in batch)
+
+    return written
+
+def write_increments(increments):
+    """
+    Write a batch of view counts and their trending activity
+    """
+    from .models import Job
+    from .trending import VIEW_WEIGHT, record_trending_events
+
+    delta = Case(
+        *[When(pk=job_id, then=Value(count)) for job_id, count in increments.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    Job.objects.filter(pk__in=list(increments)).update(views_count=F('views_count') + delta)
+    record_trending_events({job_id: VIEW_WEIGHT * count for job_id, count in increments.items()})
@@ -1,19 +1,38 @@
 from rest_framework import generics, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Job, JobCategory
+from .models import Job, JobCategory, JobImport, SavedSearch
 from .serializers import (
     JobSerializer, 
     JobListSerializer, 
     JobCreateUpdateSerializer,
-    JobCategorySerializer
+    JobCategorySerializer,
+    SavedSearchSerializer,
+    JobImportSerializer,
+    CompiledJobListSerializer
 )
-from .filters import JobFilter
+from .expiry import open_jobs_filter
+from .imports import import_format, run_import
+from .filters import JobFilter, JobOrderingFilter, JobSearchFilter, location_filter
+from .pagination import SORT_FIELDS, JobPaginationMixin, get_job_paginator, sort_column
+from .ranking import RELEVANCE_SORT, rank_by_relevance
+from .salaries import base_salary_bound
+from .search_backends import get_search_backend
+from .autocomplete import autocomplete
+from .search_cache import cached_search
+from .similarity import get_similarity_index
+from .trending import trending_jobs
+from .view_counter import record_job_view
 from employers.models import Employer
 from employers.permissions import IsEmployerOwner
+from jobboard.compiled_serializers import CompiledListMixin
+from jobboard.sparse_fields import SparseQuerysetMixin, parse_names, sparse_context, sparse_queryset
+from locations.spatial import parse_radius
 
 class JobCategoryListView(generics.ListAPIView):
     """
@@ -24,53 +43,92 @@ class JobCategoryListView(generics.ListAPIView):
     serializer_class = JobCategorySerializer
     permission_classes = (permissions.AllowAny,)
 
-class JobListView(generics.ListAPIView):
+class JobListView(CompiledListMixin, JobPaginationMixin, generics.ListAPIView):
     """
     List all active jobs with search and filters
     GET /api/jobs/
+    Pass pagination=cursor for keyset pagination without counts
     """
     serializer_class = JobListSerializer
+    compiled_serializer_class = CompiledJobListSerializer
     permission_classes = (permissions.AllowAny,)
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, JobSearchFilter, JobOrderingFilter]
     filterset_class = JobFilter
-    search_fields = ['title', 'description', 'requirements', 'employer__company_name']
-    ordering_fields = ['created_at', 'salary_min', 'application_deadline', 'title']
+    ordering_fields = ['created_at', 'salary_min', 'salary_max', 'application_deadline', 'title',
+                       'views_count', 'applications_count']
     ordering = ['-created_at']
     
     def get_queryset(self):
-        queryset = Job.objects.filter(is_active=True).select_related(
+        queryset = Job.objects.filter(open_jobs_filter()).select_related(
             'employer', 'category'
-        ).annotate(
-            applications_count=Count('applications')
         )
         return queryset
 
-class JobDetailView(generics.RetrieveAPIView):
+class JobDetailView(SparseQuerysetMixin, generics.RetrieveAPIView):
     """
     Get job details and increment view count
     GET /api/jobs/{slug}/
+    Pass fields=a,b or exclude=c to narrow the response and the query
     """
     serializer_class = JobSerializer
     permission_classes = (permissions.AllowAny,)
     lookup_field = 'slug'
+    sparse_columns = ('views_count',)
     
     
     def get_queryset(self):
-        return Job.objects.filter(is_active=True).select_related(
+        return Job.objects.filter(open_jobs_filter()).select_related(
             'employer', 'category'
-        ).annotate(
-            applications_count=Count('applications')  # Add annotation here
         )
         
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        # Increment view count
-        instance.views_count += 1
-        instance.save(update_fields=['views_count'])
+        # Increment view count (buffered and flushed in batches when write-behind is on)
+        instance.views_count += record_job_view(instance.pk)
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
+class JobBatchView(APIView):
+    """
+    Several open jobs in one request, in the order asked for
+    GET /api/jobs/batch/?ids=3,1&slugs=python-developer-1a2b3c4d
+    Keys with no open job (inactive or past its deadline) are listed under not_found
+    """
+    permission_classes = (permissions.AllowAny,)
+    max_size = 100
+    
+    def get(self, request):
+        ids = parse_names(request.query_params.get('ids'))
+        slugs = parse_names(request.query_params.get('slugs'))
+        if not all(job_id.isdigit() for job_id in ids):
+            return Response({'ids': ['Pass job ids as comma-separated integers.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        keys = list(dict.fromkeys([int(job_id) for job_id in ids] + slugs))
+        if len(keys) > self.max_size:
+            return Response({'detail': f'Request at most {self.max_size} jobs at a time.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        context = {'request': request}
+        queryset = Job.objects.filter(open_jobs_filter()).filter(
+            Q(id__in=[key for key in keys if isinstance(key, int)]) |
+            Q(slug__in=[key for key in keys if isinstance(key, str)])
+        ).select_related('employer', 'category')
+        jobs = {}
+        # Rows are keyed by slug as well as id, so slug is loaded whatever the selection
+        for job in sparse_queryset(queryset, JobSerializer, context=context, always=('slug',)):
+            jobs[job.pk] = jobs[job.slug] = job
+        
+        found = [jobs[key] for key in keys if key in jobs]
+        serializer = JobSerializer(found, many=True, context=context)
+        if 'employer' in serializer.child.fields:
+            # applications_count is kept on the job row; the employers' job counts take one grouped query
+            Employer.attach_job_counts([job.employer for job in found])
+        return Response({
+            'results': serializer.data,
+            'not_found': [key for key in keys if key not in jobs],
+        })
+
 class JobCreateView(generics.CreateAPIView):
     """
     Create a new job (employers only)
@@ -127,6 +185,46 @@ class JobToggleActiveView(APIView):
             'is_active': job.is_active
         })
 
+class JobImportView(APIView):
+    """
+    Bulk create jobs from a CSV or JSON Lines upload (employers only)
+    POST /api/jobs/import/ with multipart 'file' and optional 'format' (csv or jsonl)
+    Files above JOB_IMPORT_SYNC_MAX_BYTES, or with async=true, are queued and return 202
+    """
+    permission_classes = (permissions.IsAuthenticated, IsEmployerOwner)
+    
+    def post(self, request):
+        employer = get_object_or_404(Employer, user=request.user)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['No file was submitted.']}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = request.data.get('format') or import_format(upload.name)
+        if file_format not in dict(JobImport.FORMAT_CHOICES):
+            return Response({'format': ['Upload a .csv or .jsonl file, or pass format=csv|jsonl.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        run_async = str(request.data.get('async', '')).lower() == 'true'
+        if run_async or upload.size > getattr(settings, 'JOB_IMPORT_SYNC_MAX_BYTES', 1024 * 1024):
+            from .tasks import process_job_import
+            job_import = JobImport.objects.create(employer=employer, format=file_format, file=upload)
+            transaction.on_commit(lambda: process_job_import.delay(job_import.pk))
+            return Response(JobImportSerializer(job_import).data, status=status.HTTP_202_ACCEPTED)
+        
+        job_import = JobImport.objects.create(employer=employer, format=file_format)
+        run_import(job_import, upload)
+        return Response(JobImportSerializer(job_import).data, status=status.HTTP_201_CREATED)
+
+class JobImportDetailView(generics.RetrieveAPIView):
+    """
+    Status and per-row error report of a bulk import
+    GET /api/jobs/import/{id}/
+    """
+    serializer_class = JobImportSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    
+    def get_queryset(self):
+        return JobImport.objects.filter(employer__user=self.request.user)
+
 class JobSearchView(APIView):
     """
     Advanced job search
@@ -135,22 +233,24 @@ class JobSearchView(APIView):
     permission_classes = (permissions.AllowAny,)
     
     def get(self, request):
-        queryset = Job.objects.filter(is_active=True)
+        jobs, data = cached_search(request, lambda: self.search(request))
+        data['results'] = JobListSerializer(jobs, many=True, context=sparse_context(request)).data
+        return Response(data)
+    
+    def search(self, request):
+        """Return the page of jobs and the paginated response without results"""
+        queryset = Job.objects.filter(open_jobs_filter()).select_related('employer', 'category')
         
         # Keyword search
         keyword = request.query_params.get('keyword', '')
         if keyword:
-            queryset = queryset.filter(
-                Q(title__icontains=keyword) |
-                Q(description__icontains=keyword) |
-                Q(requirements__icontains=keyword) |
-                Q(employer__company_name__icontains=keyword)
-            )
+            queryset = get_search_backend().filter_queryset(queryset, keyword)
         
         # Location search
         location = request.query_params.get('location', '')
         if location:
-            queryset = queryset.filter(location__icontains=location)
+            radius_km = parse_radius(request.query_params.get('radius_km'))
+            queryset = queryset.filter(location_filter(location, radius_km)[0])
         
         # Category filter
         category = request.query_params.get('category', '')
@@ -162,33 +262,129 @@ class JobSearchView(APIView):
         if job_type:
             queryset = queryset.filter(job_type=job_type)
         
-        # Salary range filter
+        # Salary range filter, in the base currency unless currency is given
+        currency = request.query_params.get('currency')
         min_salary = request.query_params.get('min_salary', '')
         if min_salary:
-            queryset = queryset.filter(salary_min__gte=min_salary)
+            queryset = queryset.filter(salary_min_base__gte=base_salary_bound(min_salary, currency))
         
         max_salary = request.query_params.get('max_salary', '')
         if max_salary:
-            queryset = queryset.filter(salary_max__lte=max_salary)
+            queryset = queryset.filter(salary_max_base__lte=base_salary_bound(max_salary, currency))
         
         # Remote filter
         is_remote = request.query_params.get('is_remote', '')
         if is_remote:
             queryset = queryset.filter(is_remote=is_remote.lower() == 'true')
         
-        # Ordering
+        # Ordering (order_by=relevance ranks keyword matches)
         order_by = request.query_params.get('order_by', '-created_at')
-        queryset = queryset.order_by(order_by)
-        
+        if order_by == RELEVANCE_SORT and keyword:
+            queryset = rank_by_relevance(queryset, keyword)
+        else:
+            if order_by.lstrip('-') not in SORT_FIELDS:
+                order_by = '-created_at'
+            queryset = queryset.order_by(sort_column(order_by))
         
-        # Add annotation before serializing
-        queryset = queryset.annotate(applications_count=Count('applications'))
+        queryset = sparse_queryset(queryset, JobListSerializer, context=sparse_context(request))
         
-        # Pagination
-        from rest_framework.pagination import PageNumberPagination
-        paginator = PageNumberPagination()
-        paginator.page_size = 20
+        # Pagination (pass pagination=cursor for keyset pagination)
+        paginator = get_job_paginator(request)
         result_page = paginator.paginate_queryset(queryset, request)
+        return result_page, paginator.get_paginated_response(None).data
+
+class JobAutocompleteView(APIView):
+    """
+    Typeahead suggestions for job titles, companies, categories and locations
+    GET /api/jobs/autocomplete/?q=pyth&types=title,company&limit=10
+    """
+    permission_classes = (permissions.AllowAny,)
+    max_limit = 20
+    
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            limit = 10
+        types = request.query_params.get('types')
+        kinds = {kind.strip() for kind in types.split(',') if kind.strip()} if types else None
+        
+        return Response({
+            'query': query,
+            'suggestions': autocomplete.suggest(query, limit=limit, kinds=kinds),
+        })
+
+class SimilarJobsView(APIView):
+    """
+    Active jobs closest to a job by TF-IDF cosine similarity
+    GET /api/jobs/{slug}/similar/?limit=10
+    """
+    permission_classes = (permissions.AllowAny,)
+    max_limit = 50
+    
+    def get(self, request, slug):
+        job = get_object_or_404(Job.objects.filter(open_jobs_filter()), slug=slug)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), self.max_limit))
+        except ValueError:
+            limit = 10
+        
+        # Over-fetch since jobs deactivated after the last rebuild are skipped
+        scores = get_similarity_index().similar(job.pk, limit=limit * 2)
+        context = sparse_context(request)
+        queryset = Job.objects.filter(open_jobs_filter()).select_related('employer', 'category')
+        jobs = sparse_queryset(queryset, JobListSerializer, context=context).in_bulk(
+            [job_id for job_id, _ in scores]
+        )
+        similar = [(jobs[job_id], score) for job_id, score in scores if job_id in jobs][:limit]
+        
+        results = JobListSerializer([similar_job for similar_job, _ in similar], many=True, context=context).data
+        for result, (_, score) in zip(results, similar):
+            result['similarity'] = round(score, 4)
+        return Response({'job': job.slug, 'results': results})
+
+class TrendingJobsView(APIView):
+    """
+    Open jobs ranked by exponentially decayed recent views and applications
+    GET /api/jobs/trending/?limit=10
+    """
+    permission_classes = (permissions.AllowAny,)
+    max_limit = 50
+    
+    def get(self, request):
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), self.max_limit))
+        except ValueError:
+            limit = 10
         
-        serializer = JobListSerializer(result_page, many=True)
-        return paginator.get_paginated_response(serializer.data)
\ No newline at end of file
+        context = sparse_context(request)
+        trending = trending_jobs(Job.objects.filter(open_jobs_filter()), limit=limit)
+        results = JobListSerializer([job for job, _ in trending], many=True, context=context).data
+        for result, (_, score) in zip(results, trending):
+            result['trending_score'] = round(score, 3)
+        return Response({'results': results})
+
+class SavedSearchListCreateView(generics.ListCreateAPIView):
+    """
+    The current user's saved searches; new matching jobs raise job_alert notifications
+    GET/POST /api/jobs/saved-searches/
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """
+    GET/PUT/PATCH/DELETE /api/jobs/saved-searches/{id}/
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import Place, PlaceName
+
+class PlaceNameInline(admin.TabularInline):
+    model = PlaceName
+    extra = 0
+
+@admin.register(Place)
+class PlaceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'admin1', 'country_code', 'latitude', 'longitude', 'population')
+    list_filter = ('country_code',)
+    search_fields = ('name', 'names__name')
+    readonly_fields = ('grid_lat', 'grid_lon')
+    inlines = [PlaceNameInline]
@@ -0,0 +1,144 @@
+import csv
+import re
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+from .models import grid_cell
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+
+# Separators between the parts of a free-text location ("Paris, TX", "Hybrid - London")
+PART_SPLIT_RE = re.compile(r'[,;/|()\n]|\s-\s')
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+COUNTRY_ALIASES = {
+    'uk': 'GB', 'england': 'GB', 'scotland': 'GB', 'wales': 'GB', 'great britain': 'GB',
+    'usa': 'US', 'united states of america': 'US', 'america': 'US',
+    'uae': 'AE', 'holland': 'NL', 'deutschland': 'DE', 'espana': 'ES',
+}
+
+# Region names accepted as qualifiers alongside the admin1 codes in the gazetteer
+REGION_ALIASES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
+    'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE', 'district of columbia': 'DC',
+    'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL',
+    'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS', 'kentucky': 'KY', 'louisiana': 'LA',
+    'maine': 'ME', 'maryland': 'MD', 'massachusetts': 'MA', 'michigan': 'MI',
+    'minnesota': 'MN', 'mississippi': 'MS', 'missouri': 'MO', 'montana': 'MT',
+    'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH', 'new jersey': 'NJ',
+    'new mexico': 'NM', 'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH',
+    'oklahoma': 'OK', 'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI',
+    'south carolina': 'SC', 'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX',
+    'utah': 'UT', 'vermont': 'VT', 'virginia': 'VA', 'washington state': 'WA',
+    'west virginia': 'WV', 'wisconsin': 'WI', 'wyoming': 'WY',
+    'alberta': 'AB', 'british columbia': 'BC', 'ontario': 'ON', 'quebec': 'QC',
+}
+
+def normalize_name(text):
+    """
+    Lowercase, strip accents and collapse punctuation: 'St. Pétersburg' -> 'st petersburg'
+    """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return NON_ALNUM_RE.sub(' ', text.replace("'", '').replace('.', '')).strip()
+
+def location_parts(text):
+    return [part for part in (normalize_name(part) for part in PART_SPLIT_RE.split(text or '')) if part]
+
+def qualifier_score(place, qualifiers):
+    """
+    How many of the other location parts name this place's region or country
+    """
+    names = {
+        place.country_code.lower(),
+        normalize_name(place.country),
+        normalize_name(place.admin1),
+    }
+    score = 0
+    for qualifier in qualifiers:
+        if (qualifier in names
+                or COUNTRY_ALIASES.get(qualifier) == place.country_code
+                or REGION_ALIASES.get(qualifier) == place.admin1):
+            score += 1
+    return score
+
+def resolve_place(text, place_names=None):
+    """
+    Resolve a free-text location to a gazetteer Place, or None. The first
+    part naming a known place wins; remaining parts ("TX", "France")
+    disambiguate, then population breaks ties. Whole names are matched,
+    so 'Parish' never resolves to Paris.
+    """
+    parts = location_parts(text)
+    if not parts:
+        return None
+    if place_names is None:
+        from .models import PlaceName
+        place_names = PlaceName.objects
+
+    candidates = defaultdict(dict)
+    for place_name in place_names.filter(name__in=parts).select_related('place'):
+        candidates[place_name.name][place_name.place_id] = place_name.place
+
+    for part in parts:
+        places = candidates.get(part)
+        if places:
+            qualifiers = [other for other in parts if other != part]
+            return max(places.values(), key=lambda place: (qualifier_score(place, qualifiers), place.population))
+    return None
+
+def read_gazetteer(path=GAZETTEER_PATH):
+    with open(path, newline='', encoding='utf-8') as handle:
+        yield from csv.DictReader(handle)
+
+def load_gazetteer(place_model=None, place_name_model=None, path=GAZETTEER_PATH):
+    """
+    Create or update places and their lookup names from the bundled CSV.
+    Takes the models as arguments so data migrations can pass historical ones.
+    """
+    if place_model is None:
+        from .models import Place, PlaceName
+        place_model, place_name_model = Place, PlaceName
+
+    loaded = 0
+    for row in read_gazetteer(path):
+        latitude, longitude = float(row['latitude']), float(row['longitude'])
+        grid_lat, grid_lon = grid_cell(latitude, longitude)
+        place, _ = place_model.objects.update_or_create(
+            name=row['name'],
+            country_code=row['country_code'],
+            admin1=row['admin1'],
+            defaults={
+                'country': row['country'],
+                'latitude': latitude,
+                'longitude': longitude,
+                'population': int(row['population'] or 0),
+                'grid_lat': grid_lat,
+                'grid_lon': grid_lon,
+            },
+        )
+        names = {normalize_name(row['name'])}
+        names.update(normalize_name(alias) for alias in row['alternate_names'].split('|') if alias)
+        existing = set(place_name_model.objects.filter(place=place).values_list('name', flat=True))
+        place_name_model.objects.bulk_create([
+            place_name_model(place=place, name=name) for name in names - existing if name
+        ])
+        loaded += 1
+    return loaded
+
+def sync_place(instance, update_fields=None):
+    """
+    Re-resolve instance.place if its location text changed since it was
+    loaded or last resolved. Returns update_fields, with 'place' added when
+    a partial save needs to write it.
+    """
+    if update_fields is not None and 'location' not in update_fields:
+        return update_fields
+    if instance.location == getattr(instance, '_resolved_location', None):
+        return update_fields
+    instance.place = resolve_place(instance.location)
+    instance._resolved_location = instance.location
+    if update_fields is not None:
+        update_fields = {*update_fields, 'place'}
+    return update_fields
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from locations.gazetteer import GAZETTEER_PATH, load_gazetteer
+
+class Command(BaseCommand):
+    help = 'Load or refresh places from the bundled (or a given) gazetteer CSV'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=str(GAZETTEER_PATH))
+    
+    def handle(self, *args, **options):
+        loaded = load_gazetteer(path=options['path'])
+        self.stdout.write(self.style.SUCCESS(f"Loaded {loaded} places"))
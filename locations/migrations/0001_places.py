@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def load_places(apps, schema_editor):
+    from locations.gazetteer import load_gazetteer
+    load_gazetteer(apps.get_model('locations', 'Place'), apps.get_model('locations', 'PlaceName'))
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Place',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('country_code', models.CharField(max_length=2)),
+                ('country', models.CharField(max_length=100)),
+                ('admin1', models.CharField(blank=True, help_text='State or region code', max_length=100)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('population', models.PositiveIntegerField(default=0)),
+                ('grid_lat', models.SmallIntegerField(editable=False)),
+                ('grid_lon', models.SmallIntegerField(editable=False)),
+            ],
+            options={
+                'db_table': 'places',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlaceName',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=200)),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='names', to='locations.place')),
+            ],
+            options={
+                'db_table': 'place_names',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['grid_lat', 'grid_lon'], name='places_grid_la_19ed16_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='place',
+            unique_together={('name', 'country_code', 'admin1')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='placename',
+            unique_together={('place', 'name')},
+        ),
+        migrations.RunPython(load_places, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+import math
+
+from django.db import models
+
+# Size of the spatial grid cells places are bucketed into, in degrees
+GRID_DEGREES = 1.0
+
+def grid_cell(latitude, longitude):
+    return math.floor(latitude / GRID_DEGREES), math.floor(longitude / GRID_DEGREES)
+
+class Place(models.Model):
+    """
+    Gazetteer entry that free-text job and candidate locations resolve to
+    """
+    name = models.CharField(max_length=200)
+    country_code = models.CharField(max_length=2)
+    country = models.CharField(max_length=100)
+    admin1 = models.CharField(max_length=100, blank=True, help_text="State or region code")
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    population = models.PositiveIntegerField(default=0)
+    # Spatial grid cell, kept in sync with latitude/longitude on save
+    grid_lat = models.SmallIntegerField(editable=False)
+    grid_lon = models.SmallIntegerField(editable=False)
+    
+    class Meta:
+        db_table = 'places'
+        ordering = ['name']
+        unique_together = ('name', 'country_code', 'admin1')
+        indexes = [
+            models.Index(fields=['grid_lat', 'grid_lon']),
+        ]
+    
+    def __str__(self):
+        return self.display_name
+    
+    @property
+    def display_name(self):
+        return place_label(self.name, self.admin1, self.country_code)
+    
+    def save(self, *args, **kwargs):
+        self.grid_lat, self.grid_lon = grid_cell(self.latitude, self.longitude)
+        super().save(*args, **kwargs)
+
+def place_label(name, admin1, country_code):
+    if admin1:
+        return f"{name}, {admin1}, {country_code}"
+    return f"{name}, {country_code}"
+
+class PlaceName(models.Model):
+    """
+    Normalized name or alias a place can be looked up by
+    """
+    place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='names')
+    name = models.CharField(max_length=200, db_index=True)
+    
+    class Meta:
+        db_table = 'place_names'
+        unique_together = ('place', 'name')
+    
+    def __str__(self):
+        return f"{self.name} -> {self.place_id}"
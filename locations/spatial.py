@@ -0,0 +1,81 @@
+import math
+
+from django.db.models import Q
+
+from .gazetteer import resolve_place
+from .models import GRID_DEGREES, Place
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_RADIUS_KM = 2000
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def parse_radius(value):
+    """
+    Radius in km from a query parameter, capped at MAX_RADIUS_KM; None when absent or invalid
+    """
+    try:
+        radius = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not radius > 0:
+        return None
+    return min(radius, MAX_RADIUS_KM)
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Latitude range and longitude ranges (split at the antimeridian) enclosing
+    the circle
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    delta_lat = math.degrees(angular)
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), [(-180, 180)]
+
+    delta_lon = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(latitude))))
+    min_lon, max_lon = longitude - delta_lon, longitude + delta_lon
+    if min_lon < -180:
+        return min_lat, max_lat, [(min_lon + 360, 180), (-180, max_lon)]
+    if max_lon > 180:
+        return min_lat, max_lat, [(min_lon, 180), (-180, max_lon - 360)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
+
+def places_within(latitude, longitude, radius_km):
+    """
+    Map of place id -> distance in km for places within the radius. Candidates
+    come from the grid cells covering the bounding box (an indexed range
+    scan); exact distances are checked in Python.
+    """
+    min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+    cells = Q()
+    for min_lon, max_lon in lon_ranges:
+        cells |= Q(grid_lon__gte=math.floor(min_lon / GRID_DEGREES), grid_lon__lte=math.floor(max_lon / GRID_DEGREES))
+    candidates = Place.objects.filter(
+        cells,
+        grid_lat__gte=math.floor(min_lat / GRID_DEGREES),
+        grid_lat__lte=math.floor(max_lat / GRID_DEGREES),
+    ).values_list('id', 'latitude', 'longitude')
+
+    nearby = {}
+    for place_id, place_lat, place_lon in candidates:
+        distance = haversine_km(latitude, longitude, place_lat, place_lon)
+        if distance <= radius_km:
+            nearby[place_id] = distance
+    return nearby
+
+def matching_place_ids(text, radius_km=None):
+    """
+    Place ids a location filter matches: the resolved place, or every place
+    within radius_km of it. None when the text does not resolve.
+    """
+    place = resolve_place(text)
+    if place is None:
+        return None
+    if not radius_km:
+        return [place.pk]
+    return list(places_within(place.latitude, place.longitude, radius_km))
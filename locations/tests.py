@@ -0,0 +1,35 @@
+from django.test import TestCase
+from .gazetteer import load_gazetteer, resolve_place
+from .models import Place
+from .spatial import bounding_box, haversine_km, places_within
+
+class PlaceTestCase(TestCase):
+    def test_resolve_place(self):
+        """Test free-text locations resolve on whole names with qualifiers disambiguating"""
+        self.assertEqual(resolve_place('Paris').country_code, 'FR')
+        self.assertEqual(resolve_place('Paris, Texas').country_code, 'US')
+        self.assertEqual(resolve_place('Perth, Scotland').country_code, 'GB')
+        self.assertEqual(resolve_place('Hybrid - München, Germany').name, 'Munich')
+        self.assertEqual(resolve_place('NYC').name, 'New York')
+        self.assertIsNone(resolve_place('Parish'))
+        self.assertIsNone(resolve_place('Remote'))
+    
+    def test_places_within(self):
+        """Test radius lookups, including circles crossing the antimeridian"""
+        paris = Place.objects.get(name='Paris', country_code='FR')
+        nearby = places_within(paris.latitude, paris.longitude, 270)
+        names = set(Place.objects.filter(pk__in=nearby).values_list('name', flat=True))
+        self.assertEqual(names, {'Paris', 'Lille', 'Brussels'})
+        self.assertAlmostEqual(nearby[paris.pk], 0)
+        
+        _, _, lon_ranges = bounding_box(-40, 179, 500)
+        self.assertEqual(len(lon_ranges), 2)
+        auckland = Place.objects.get(name='Auckland')
+        self.assertIn(auckland.pk, places_within(-37, -179.5, 700))
+        self.assertAlmostEqual(haversine_km(0, 0, 0, 1), 111.195, places=2)
+    
+    def test_reload_gazetteer_is_idempotent(self):
+        """Test reloading the gazetteer updates places in place"""
+        count = Place.objects.count()
+        self.assertEqual(load_gazetteer(), count)
+        self.assertEqual(Place.objects.count(), count)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('application_received', 'Application Received'), ('application_status_changed', 'Application Status Changed'), ('job_posted', 'Job Posted'), ('job_expired', 'Job Expired'), ('job_alert', 'Job Alert'), ('new_message', 'New Message')], max_length=50),
+        ),
+    ]
@@ -7,6 +7,7 @@ class Notification(models.Model):
         ('application_status_changed', 'Application Status Changed'),
         ('job_posted', 'Job Posted'),
         ('job_expired', 'Job Expired'),
+        ('job_alert', 'Job Alert'),
         ('new_message', 'New Message'),
     )
     
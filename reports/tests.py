@@ -1,6 +1,12 @@
-from django.test import TestCase
+from django.http import HttpResponse
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth import get_user_model
+from jobboard.db_router import ReplicaReadMiddleware, ReplicaRouter
+from jobs.models import Job
 
 User = get_user_model()
 
@@ -29,4 +35,75 @@ class ReportsTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('users', response.data)
         self.assertIn('jobs', response.data)
-        self.assertIn('applications', response.data)
\ No newline at end of file
+        self.assertIn('applications', response.data)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_STICKY_SECONDS=30)
+class DatabaseRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        # The response body names the database a read would use
+        self.middleware = ReplicaReadMiddleware(lambda request: HttpResponse(self.router.db_for_read(Job)))
+        self.factory = RequestFactory()
+    
+    def read_alias(self, method, path, user_id=None):
+        headers = {}
+        if user_id is not None:
+            token = AccessToken()
+            token['user_id'] = user_id
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        response = self.middleware(getattr(self.factory, method)(path, **headers))
+        # Send cookies back like a client would
+        self.factory.cookies.update(response.cookies)
+        return response.content.decode()
+    
+    def test_replica_routing(self):
+        """Test safe requests read from replicas except right after the same user wrote"""
+        self.assertEqual(self.read_alias('get', '/api/jobs/', user_id=1), 'replica')
+        self.assertEqual(self.read_alias('post', '/api/jobs/create/', user_id=1), 'default')
+        self.assertEqual(self.read_alias('get', '/api/jobs/', user_id=1), 'default')
+        self.assertEqual(self.read_alias('get', '/api/reports/platform-stats/', user_id=1), 'replica')
+        self.assertEqual(self.read_alias('get', '/api/jobs/', user_id=2), 'replica')
+        self.assertEqual(self.read_alias('get', '/api/jobs/'), 'replica')
+        # The marker expires with DATABASE_STICKY_SECONDS
+        with override_settings(DATABASE_STICKY_SECONDS=-1):
+            self.assertEqual(self.read_alias('get', '/api/jobs/', user_id=1), 'replica')
+        self.assertEqual(self.router.db_for_write(Job), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'jobs'))
+    
+    def test_anonymous_writes_are_sticky(self):
+        """Test a write before the client is known (registration, login) keeps its next reads on the primary"""
+        self.assertEqual(self.read_alias('post', '/api/auth/register/'), 'default')
+        self.assertEqual(self.read_alias('get', '/api/auth/profile/', user_id=3), 'default')
+        self.assertEqual(self.read_alias('get', '/api/jobs/'), 'default')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_STICKY_SECONDS=30)
+class ReplicaQueriesTestCase(TransactionTestCase):
+    databases = {'default', 'replica'}
+    
+    def test_reads_use_replica_and_writes_use_primary(self):
+        """Test requests run their reads on the replica connection and their writes on the primary"""
+        client = APIClient()
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = client.get('/api/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('"jobs"' in query['sql'] for query in replica.captured_queries))
+        self.assertEqual(primary.captured_queries, [])
+        
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = client.post('/api/auth/register/', {
+                'email': 'new@test.com', 'username': 'new', 'password': 'Str0ng-pass-123',
+                'password2': 'Str0ng-pass-123', 'user_type': 'candidate',
+                'candidate_profile': {'first_name': 'New', 'last_name': 'User'},
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertTrue(any(query['sql'].startswith('INSERT') for query in primary.captured_queries))
+        self.assertEqual(replica.captured_queries, [])
+        
+        # The new account reads its own write from the primary right away
+        with CaptureQueriesContext(connections['replica']) as replica:
+            client.get('/api/jobs/')
+        self.assertEqual(replica.captured_queries, [])
@@ -64,10 +64,9 @@ class JobAnalyticsView(APIView):
     permission_classes = (permissions.IsAuthenticated, IsAdminUser)
     
     def get(self, request):
-        # Most applied jobs
-        most_applied_jobs = Job.objects.annotate(
-            app_count=Count('applications')
-        ).order_by('-app_count')[:10]
+        # Most applied jobs, by Job.applications_count, which leaves out withdrawn
+        # applications unlike the totals and averages counted from Application rows
+        most_applied_jobs = Job.objects.select_related('employer').order_by('-applications_count')[:10]
         
         # Jobs by category
         jobs_by_category = Job.objects.values('category__name').annotate(
@@ -99,7 +98,7 @@ class JobAnalyticsView(APIView):
                     'id': job.id,
                     'title': job.title,
                     'company': job.employer.company_name,
-                    'applications': job.app_count,
+                    'applications': job.applications_count,
                     'location': job.location
                 }
                 for job in most_applied_jobs
@@ -297,16 +296,14 @@ class ExportJobsView(APIView):
             'Is Remote',
             'Salary Min',
             'Salary Max',
-            'Applications', 
+            'Applications (excl. withdrawn)', 
             'Views', 
             'Status', 
             'Created Date',
             'Application Deadline'
         ])
         
-        jobs = Job.objects.select_related('employer', 'category').annotate(
-            app_count=Count('applications')
-        ).all()
+        jobs = Job.objects.select_related('employer', 'category').all()
         
         for job in jobs:
             writer.writerow([
@@ -320,7 +317,7 @@ class ExportJobsView(APIView):
                 'Yes' if job.is_remote else 'No',
                 job.salary_min or 'N/A',
                 job.salary_max or 'N/A',
-                job.app_count,
+                job.applications_count,
                 job.views_count,
                 'Active' if job.is_active else 'Inactive',
                 job.created_at.strftime('%Y-%m-%d %H:%M:%S'),